@@ -0,0 +1,3 @@
+# Плагины подключаются только из корневого conftest.py
+pytest_plugins = ["pytester", "src.plugins.timing_history", "src.plugins.sharding",
+                  "src.plugins.allure_recording", "src.plugins.cassettes"]
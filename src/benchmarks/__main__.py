@@ -0,0 +1,61 @@
+"""
+Запуск набора бенчмарков и сравнение с базовой линией
+
+    python -m src.benchmarks                       # прогон и сравнение с .benchmarks/baseline.json
+    python -m src.benchmarks --group models --quick
+    python -m src.benchmarks --update-baseline     # сделать этот прогон базовой линией
+    python -m src.benchmarks --fail-on-regression  # код выхода 1 при регрессии (для CI)
+
+Каждый прогон пишется в ``--output``; если базовой линии еще нет, она создается из прогона.
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from src.benchmarks.suite import DEFAULT_BASELINE, DEFAULT_OUTPUT, GROUPS, compare, load, run_suite, save
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.benchmarks", description="PetStore benchmark suite")
+    parser.add_argument("--group", action="append", choices=sorted(GROUPS), help="Run only this group (repeatable)")
+    parser.add_argument("-k", "--filter", default=None, help="Run only cases whose name contains this substring")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the results of this run")
+    parser.add_argument("--update-baseline", action="store_true", help="Save this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative slowdown of the median that counts as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with 1 if any case regressed")
+    parser.add_argument("--quick", action="store_true", help="Shorter, noisier measurements")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    min_time, repeat = (0.02, 3) if args.quick else (0.1, 5)
+
+    def progress(name, result):
+        print(f"{name:<44}{result['median_us']:>12.2f} us  (min {result['min_us']:.2f}, x{result['number']})",
+              file=sys.stderr)
+
+    run = run_suite(args.group, args.filter, min_time, repeat, progress)
+    save(run, args.output)
+    baseline = load(args.baseline)
+    if baseline is None or args.update_baseline:
+        save(run, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        if baseline is None:
+            return 0
+
+    partial = bool(args.group or args.filter)
+    rows = compare(run, baseline, args.threshold, include_missing=not partial)
+    print(f"{'case':<44}{'baseline':>12}{'current':>12}")
+    for row in rows:
+        print(row.format())
+    regressions = [row for row in rows if row.status == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) against {args.baseline} (created {baseline.get('created')})")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
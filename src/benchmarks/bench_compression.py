@@ -0,0 +1,45 @@
+"""
+Бенчмарк сжатия тел запросов: размер и время для типичных массовых запросов
+
+Запуск: python -m src.benchmarks.bench_compression
+"""
+import json
+import timeit
+
+from src.utils.compression import CompressionConfig, zstandard
+from src.utils.data_factory import DataFactory
+
+
+def payloads():
+    pets = [{"id": i, "name": f"pet{i}", "photoUrls": [f"https://example.com/{i}.jpg"],
+             "category": {"id": i % 10, "name": f"category{i % 10}"}, "status": "available"} for i in range(1000)]
+    return {
+        "createWithList, 500 users": json.dumps(list(DataFactory(seed=0).users(500))).encode(),
+        "findByStatus, 1000 pets": json.dumps(pets).encode(),
+    }
+
+
+def run():
+    encodings = ["gzip", "deflate"] + (["zstd"] if zstandard is not None else [])
+    results = {}
+    for name, body in payloads().items():
+        rows = {"identity": (len(body), 0.0)}
+        for encoding in encodings:
+            config = CompressionConfig(encoding, min_size=0, accept=())
+            size = len(config.compress(body))
+            seconds = min(timeit.repeat(lambda: config.compress(body), number=20, repeat=3)) / 20
+            rows[encoding] = (size, seconds * 1e3)
+        results[name] = rows
+    return results
+
+
+def main():
+    for name, rows in run().items():
+        print(name)
+        original = rows["identity"][0]
+        for encoding, (size, ms) in rows.items():
+            print(f"  {encoding:<10}{size:>10} B  {original / size:>6.1f}x  {ms:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
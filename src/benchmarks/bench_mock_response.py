@@ -0,0 +1,53 @@
+"""
+Микробенчмарк ответов мок-API: unittest.mock.Mock против MockResponse
+
+Запуск: python -m src.benchmarks.bench_mock_response
+"""
+import timeit
+from unittest.mock import Mock
+
+from src.utils.mock_api import MockPetStoreAPI, MockResponse
+
+PAYLOAD = {"id": 1, "name": "TestDog", "photoUrls": [], "status": "available"}
+
+
+def mock_response(status_code, json_data):
+    """Прежняя реализация MockPetStoreAPI._create_response"""
+    response = Mock()
+    response.status_code = status_code
+    response.json = Mock(return_value=json_data)
+    return response
+
+
+def use(response):
+    """Типичное использование ответа в тестах и ValidationSteps"""
+    assert response.status_code == 200
+    return response.json()["name"]
+
+
+def measure(stmt, number: int, repeat: int = 5) -> float:
+    """Лучшее время одного вызова в наносекундах"""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1e9
+
+
+def run(number: int = 20000):
+    api = MockPetStoreAPI()
+    api.add_pet(PAYLOAD)
+    results = {
+        "Mock: create + use": measure(lambda: use(mock_response(200, PAYLOAD)), number),
+        "MockResponse: create + use": measure(lambda: use(MockResponse(200, PAYLOAD)), number),
+        "MockPetStoreAPI.get_pet_by_id": measure(lambda: use(api.get_pet_by_id(1)), number),
+    }
+    return results
+
+
+def main():
+    results = run()
+    for name, ns in results.items():
+        print(f"{name:<30}{ns:>12.0f} ns/call")
+    speedup = results["Mock: create + use"] / results["MockResponse: create + use"]
+    print(f"{'speedup':<30}{speedup:>12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
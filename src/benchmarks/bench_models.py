@@ -0,0 +1,56 @@
+"""
+Бенчмарк разбора ответа find_pets_by_status: dict, валидированные модели, модели без валидации
+
+Запуск: python -m src.benchmarks.bench_models
+"""
+import json
+import timeit
+from typing import List
+
+from src.models.decoding import decode, loads
+from src.models.models import Pet
+
+SIZES = (100, 1000, 10000)
+
+
+def payload(count: int) -> bytes:
+    """Тело ответа findByStatus с ``count`` питомцами"""
+    pets = [{
+        "id": i,
+        "category": {"id": i % 10, "name": f"category{i % 10}"},
+        "name": f"pet{i}",
+        "photoUrls": [f"https://example.com/{i}.jpg"],
+        "tags": [{"id": i % 7, "name": f"tag{i % 7}"}],
+        "status": "available",
+    } for i in range(count)]
+    return json.dumps(pets).encode()
+
+
+def measure(stmt, number: int, repeat: int = 5) -> float:
+    """Лучшее время одного вызова в миллисекундах"""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1e3
+
+
+def run(sizes=SIZES):
+    results = {}
+    for size in sizes:
+        content = payload(size)
+        number = max(1, 20000 // size)
+        results[size] = {
+            "json.loads -> dict": measure(lambda: json.loads(content), number),
+            "fast loads -> dict": measure(lambda: loads(content), number),
+            "validated List[Pet]": measure(lambda: decode(content, List[Pet]), number),
+            "constructed List[Pet]": measure(lambda: decode(content, List[Pet], validate=False), number),
+        }
+    return results
+
+
+def main():
+    for size, results in run().items():
+        print(f"{size} pets")
+        for name, ms in results.items():
+            print(f"  {name:<28}{ms:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Бенчмарк сверки findByStatus с get_inventory: список словарей против PetBatch
+
+Запуск: python -m src.benchmarks.bench_pet_batch
+"""
+import timeit
+import tracemalloc
+from collections import Counter
+
+from src.models.pet_batch import PetBatch, STATUSES
+
+COUNT = 100_000
+
+
+def pets(count: int = COUNT):
+    return [{
+        "id": i,
+        "category": {"id": i % 10, "name": f"category{i % 10}"},
+        "name": f"pet{i}",
+        "photoUrls": [],
+        "tags": [{"id": i % 7, "name": f"tag{i % 7}"}],
+        "status": STATUSES[i % 3],
+    } for i in range(count)]
+
+
+def reconcile_dicts(current, previous, inventory):
+    """Прежний способ: циклы по словарям"""
+    counts = Counter(pet["status"] for pet in current)
+    mismatches = {status: (inventory.get(status, 0), counts.get(status, 0)) for status in STATUSES
+                  if inventory.get(status, 0) != counts.get(status, 0)}
+    previous_ids = {pet["id"] for pet in previous}
+    missing = sorted({pet["id"] for pet in current} - previous_ids)
+    return mismatches, missing
+
+
+def reconcile_batch(current: PetBatch, previous: PetBatch, inventory):
+    return current.inventory_mismatches(inventory), current.difference(previous)
+
+
+def measure(stmt, number: int = 20, repeat: int = 5) -> float:
+    """Лучшее время одного вызова в миллисекундах"""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1e3
+
+
+def allocated(build) -> int:
+    tracemalloc.start()
+    try:
+        value = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del value
+    return size
+
+
+def run(count: int = COUNT):
+    current, previous = pets(count), pets(count - 1000)
+    inventory = {status: count // 3 for status in STATUSES}
+    current_batch, previous_batch = PetBatch.from_pets(current), PetBatch.from_pets(previous)
+    return {
+        "dicts: reconcile, ms": measure(lambda: reconcile_dicts(current, previous, inventory)),
+        "PetBatch: reconcile, ms": measure(lambda: reconcile_batch(current_batch, previous_batch, inventory)),
+        "PetBatch: build, ms": measure(lambda: PetBatch.from_pets(current), number=3),
+        "dicts: memory, MB": allocated(lambda: pets(count)) / 2 ** 20,
+        "PetBatch: memory, MB": current_batch.nbytes / 2 ** 20,
+    }
+
+
+def main():
+    for name, value in run().items():
+        print(f"{name:<28}{value:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
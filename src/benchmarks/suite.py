@@ -0,0 +1,208 @@
+"""
+Набор бенчмарков горячих путей с базовой линией в JSON
+
+Группы:
+* ``client`` - ``PetStoreClient._request`` против локального MockPetStoreServer
+  и голого ``requests.Session`` на тех же запросах (разница - накладные расходы клиента);
+* ``models`` - разбор и сериализация Pet/Order/User при разных размерах тела;
+* ``mock_api`` - операции MockPetStoreAPI на заполненном хранилище.
+
+Каждый случай калибруется так, чтобы один повтор шел не меньше ``min_time``
+секунд; в результат идут медиана и минимум времени одной операции.
+Сравнение с базовой линией - по медиане.
+
+Запуск: python -m src.benchmarks
+"""
+import datetime
+import json
+import os
+import platform
+import statistics
+import timeit
+from typing import Callable, Dict, List, Optional
+
+import requests
+from pydantic import TypeAdapter
+
+from src.benchmarks.bench_models import payload as pets_payload
+from src.models.decoding import decode
+from src.models.models import Order, Pet, User
+from src.utils.api_client import PetStoreClient
+from src.utils.data_factory import DataFactory
+from src.utils.mock_api import MockPetStoreAPI
+from src.utils.mock_server import MockPetStoreServer
+from src.utils.request_log import RequestLog
+
+DEFAULT_BASELINE = os.path.join(".benchmarks", "baseline.json")
+DEFAULT_OUTPUT = os.path.join(".benchmarks", "latest.json")
+MODEL_SIZES = (1, 100, 1000)
+
+Bench = Callable[[str, Callable[[], object]], None]
+
+
+def measure(func: Callable[[], object], min_time: float = 0.1, repeat: int = 5) -> Dict[str, float]:
+    """Время одной операции в микросекундах: медиана и минимум по ``repeat`` повторам"""
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        # Следующая попытка сразу с оценкой нужного числа вызовов, но не больше чем x10
+        number = max(number + 1, min(number * 10, int(number * min_time / max(elapsed, 1e-9) * 1.2)))
+    times = [elapsed / number * 1e6 for elapsed in timer.repeat(repeat, number)]
+    return {"median_us": statistics.median(times), "min_us": min(times), "number": number, "repeat": repeat}
+
+
+def client_group(bench: Bench):
+    api = MockPetStoreAPI.seeded(pets=100, users=10, orders=10, id_base=1)
+    with MockPetStoreServer(api) as server:
+        # Без записи каждого запроса в лог: вывод засоряет прогон и искажает замеры
+        client = PetStoreClient(server.base_url, request_log=RequestLog(sample_rate=0))
+        raw = requests.Session()
+        pet = {"id": 1_000_000, "name": "bench", "photoUrls": [], "status": "available"}
+        try:
+            bench("client/raw session GET pet", lambda: raw.get(f"{server.base_url}/pet/1"))
+            bench("client/get_pet_by_id", lambda: client.get_pet_by_id(1))
+            bench("client/raw session GET findByStatus",
+                  lambda: raw.get(f"{server.base_url}/pet/findByStatus", params={"status": "available"}))
+            bench("client/find_pets_by_status", lambda: client.find_pets_by_status("available"))
+            bench("client/raw session POST pet", lambda: raw.post(f"{server.base_url}/pet", json=pet))
+            bench("client/add_pet", lambda: client.add_pet(pet))
+        finally:
+            raw.close()
+            client.close()
+
+
+def _orders(count: int) -> bytes:
+    return json.dumps([{"id": i, "petId": i, "quantity": 1, "shipDate": "2024-01-01T00:00:00.000+0000",
+                        "status": "placed", "complete": False} for i in range(count)]).encode()
+
+
+def _users(count: int) -> bytes:
+    return json.dumps(list(DataFactory(seed=0).users(count))).encode()
+
+
+def models_group(bench: Bench, sizes=MODEL_SIZES):
+    for model, make in ((Pet, pets_payload), (Order, _orders), (User, _users)):
+        adapter = TypeAdapter(List[model])
+        for size in sizes:
+            content = make(size)
+            objects = decode(content, List[model])
+            name = f"models/{model.__name__} x{size}"
+            bench(f"{name} parse", lambda: decode(content, List[model]))
+            bench(f"{name} dump", lambda: adapter.dump_json(objects))
+
+
+def mock_api_group(bench: Bench):
+    store = MockPetStoreAPI.seeded(pets=5000, users=2000, orders=2000, id_base=1)
+    username = "seeduser0"
+    pet = {"id": 1, "name": "bench", "photoUrls": [], "status": "sold"}
+    order = {"id": 1, "petId": 1, "quantity": 1, "status": "placed"}
+    bench("mock_api/get_pet_by_id", lambda: store.get_pet_by_id(1))
+    bench("mock_api/find_pets_by_status", lambda: store.find_pets_by_status("available"))
+    bench("mock_api/get_inventory", store.get_inventory)
+    bench("mock_api/get_user_by_username", lambda: store.get_user_by_username(username))
+    bench("mock_api/add_pet", lambda: store.add_pet(pet))
+    bench("mock_api/place_order", lambda: store.place_order(order))
+
+    def fork_and_rollback():
+        with store.fork() as api:
+            api.update_pet(pet)
+
+    bench("mock_api/fork + update + rollback", fork_and_rollback)
+
+
+GROUPS: Dict[str, Callable[[Bench], None]] = {
+    "client": client_group,
+    "models": models_group,
+    "mock_api": mock_api_group,
+}
+
+
+def run_suite(groups=None, pattern: Optional[str] = None, min_time: float = 0.1, repeat: int = 5,
+              progress: Optional[Callable[[str, Dict[str, float]], None]] = None) -> Dict[str, object]:
+    """Прогнать группы; ``pattern`` - подстрока имени случая"""
+    results: Dict[str, Dict[str, float]] = {}
+
+    def bench(name: str, func: Callable[[], object]):
+        if pattern and pattern not in name:
+            return
+        results[name] = measure(func, min_time, repeat)
+        if progress is not None:
+            progress(name, results[name])
+
+    for group in groups or GROUPS:
+        GROUPS[group](bench)
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def save(run: Dict[str, object], path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load(path: str) -> Optional[Dict[str, object]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class Comparison:
+    __slots__ = ("name", "baseline", "current", "status")
+
+    def __init__(self, name: str, baseline: Optional[float], current: Optional[float], status: str):
+        self.name = name
+        self.baseline = baseline
+        self.current = current
+        self.status = status
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if self.baseline is None or self.current is None or not self.baseline:
+            return None
+        return self.current / self.baseline
+
+    def format(self) -> str:
+        base = "-" if self.baseline is None else f"{self.baseline:.2f}"
+        current = "-" if self.current is None else f"{self.current:.2f}"
+        ratio = "" if self.ratio is None else f"x{self.ratio:.2f}"
+        return f"{self.name:<44}{base:>12}{current:>12} us {ratio:>7}  {self.status}"
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], threshold: float = 0.25,
+            include_missing: bool = True) -> List[Comparison]:
+    """Сравнить медианы; регрессия - медленнее базовой линии больше чем в ``1 + threshold`` раз.
+
+    ``include_missing=False`` - не показывать случаи базовой линии, которых нет
+    в прогоне (для прогона части набора).
+    """
+    now, before = current["results"], baseline["results"]
+    missing = [name for name in before if name not in now] if include_missing else []
+    rows = []
+    for name in list(now) + missing:
+        new = now.get(name, {}).get("median_us")
+        old = before.get(name, {}).get("median_us")
+        if old is None:
+            status = "new"
+        elif new is None:
+            status = "missing"
+        elif new > old * (1 + threshold):
+            status = "regression"
+        elif new < old / (1 + threshold):
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append(Comparison(name, old, new, status))
+    return rows
@@ -0,0 +1,105 @@
+import json
+import typing
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Union
+
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+
+    loads: Callable[[Union[bytes, str]], Any] = orjson.loads
+except ImportError:  # orjson - необязательная зависимость
+    loads = json.loads
+
+
+@lru_cache(maxsize=None)
+def type_adapter(model) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def decode(content: Union[bytes, str], model, validate: bool = True):
+    """Разобрать JSON-тело сразу в модель (или ``List[Model]``, ``Dict[str, int]``...).
+
+    С ``validate=True`` байты разбирает и валидирует pydantic-core за один проход -
+    это самый быстрый путь к моделям (см. src.benchmarks.bench_models).
+    С ``validate=False`` тело разбирается быстрым парсером (orjson, если установлен),
+    а модели собираются без проверок: для доверенных данных, которые не проходят
+    валидацию целиком (например, питомцы без ``photoUrls`` на публичном стенде).
+    """
+    if validate:
+        return type_adapter(model).validate_json(content)
+    return construct(model, loads(content))
+
+
+def construct(model, data):
+    """Собрать модель из уже разобранных данных без валидации"""
+    return _constructor(model)(data)
+
+
+@lru_cache(maxsize=None)
+def _constructor(model) -> Callable[[Any], Any]:
+    origin = typing.get_origin(model)
+    args = typing.get_args(model)
+
+    if origin is Union:
+        inner = [a for a in args if a is not type(None)]
+        if len(inner) == 1:
+            build = _constructor(inner[0])
+            return lambda data: None if data is None else build(data)
+        return _identity
+
+    if origin in (list, List):
+        build = _constructor(args[0]) if args else _identity
+        if build is _identity:
+            return _identity
+        return lambda data: [build(item) for item in data] if isinstance(data, list) else data
+
+    if origin in (dict, Dict):
+        build = _constructor(args[1]) if len(args) == 2 else _identity
+        if build is _identity:
+            return _identity
+        return lambda data: {k: build(v) for k, v in data.items()} if isinstance(data, dict) else data
+
+    if isinstance(model, type) and issubclass(model, BaseModel):
+        return _model_builder(model)
+
+    return _identity
+
+
+def _model_builder(model) -> Callable[[Any], Any]:
+    # То же, что model_construct, без его накладных расходов: словарь полей
+    # кладется в экземпляр напрямую, лишние ключи отбрасываются
+    defaults = {name: field.default for name, field in model.model_fields.items()
+                if not field.is_required() and field.default_factory is None}
+    known = frozenset(model.model_fields)
+    nested = {}
+    for name, field in model.model_fields.items():
+        build = _constructor(field.annotation)
+        if build is not _identity:
+            nested[name] = build
+    new = model.__new__
+    setattr_ = object.__setattr__
+
+    def build_model(data):
+        if not isinstance(data, dict):
+            return data
+        values = dict(defaults)
+        fields_set = set()
+        for name, value in data.items():
+            if name in known:
+                build = nested.get(name)
+                values[name] = value if build is None or value is None else build(value)
+                fields_set.add(name)
+        instance = new(model)
+        setattr_(instance, "__dict__", values)
+        setattr_(instance, "__pydantic_fields_set__", fields_set)
+        setattr_(instance, "__pydantic_extra__", None)
+        setattr_(instance, "__pydantic_private__", None)
+        return instance
+
+    return build_model
+
+
+def _identity(data):
+    return data
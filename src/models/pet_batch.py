@@ -0,0 +1,215 @@
+from array import array
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Значение столбца для отсутствующего id, категории или статуса
+MISSING = -1
+STATUSES = ("available", "pending", "sold")
+
+
+def _field(pet: Any, name: str) -> Any:
+    if isinstance(pet, dict):
+        return pet.get(name)
+    return getattr(pet, name, None)
+
+
+def _int_or_missing(value: Any) -> int:
+    return value if isinstance(value, int) and not isinstance(value, bool) else MISSING
+
+
+def _unique_sorted(sorted_values: np.ndarray) -> np.ndarray:
+    """Маска первых вхождений в отсортированном массиве"""
+    mask = np.empty(len(sorted_values), dtype=bool)
+    if len(sorted_values):
+        mask[0] = True
+        np.not_equal(sorted_values[1:], sorted_values[:-1], out=mask[1:])
+    return mask
+
+
+def _isin_sorted(values: np.ndarray, sorted_unique: np.ndarray) -> np.ndarray:
+    """``np.isin`` для отсортированного массива без повторов через бинарный поиск"""
+    if not len(sorted_unique):
+        return np.zeros(len(values), dtype=bool)
+    positions = np.searchsorted(sorted_unique, values)
+    np.minimum(positions, len(sorted_unique) - 1, out=positions)
+    return sorted_unique[positions] == values
+
+
+class PetBatch:
+    """Колоночное хранилище питомцев для массовых сверок.
+
+    Вместо списка словарей держит numpy-столбцы: ``ids``, ``category_ids``,
+    ``status_codes`` (индекс в словаре ``statuses``) и теги в формате CSR -
+    ``tag_ids`` подряд и ``tag_offsets`` длиной ``len(batch) + 1``.
+    Подсчеты по статусам, дедупликация и разности множеств выполняются
+    векторно. Отсутствующие значения - ``MISSING``.
+    """
+
+    __slots__ = ("ids", "category_ids", "status_codes", "statuses", "tag_ids", "tag_offsets")
+
+    def __init__(self, ids: np.ndarray, category_ids: np.ndarray, status_codes: np.ndarray,
+                 statuses: Sequence[str], tag_ids: np.ndarray, tag_offsets: np.ndarray):
+        if not len(ids) == len(category_ids) == len(status_codes) == len(tag_offsets) - 1:
+            raise ValueError("Column lengths do not match")
+        self.ids = ids
+        self.category_ids = category_ids
+        self.status_codes = status_codes
+        self.statuses = tuple(statuses)
+        self.tag_ids = tag_ids
+        self.tag_offsets = tag_offsets
+
+    @classmethod
+    def from_pets(cls, pets: Iterable[Any], statuses: Sequence[str] = STATUSES) -> "PetBatch":
+        """Собрать из словарей или моделей ``Pet``; итератор читается один раз, без списка в памяти"""
+        vocabulary = {status: code for code, status in enumerate(statuses)}
+        ids, category_ids, status_codes = array("q"), array("q"), array("h")
+        tag_ids, tag_offsets = array("q"), array("q", [0])
+
+        for pet in pets:
+            ids.append(_int_or_missing(_field(pet, "id")))
+            category = _field(pet, "category")
+            category_ids.append(MISSING if category is None else _int_or_missing(_field(category, "id")))
+            status = _field(pet, "status")
+            if status is None:
+                status_codes.append(MISSING)
+            else:
+                code = vocabulary.get(status)
+                if code is None:
+                    code = vocabulary[status] = len(vocabulary)
+                status_codes.append(code)
+            for tag in _field(pet, "tags") or ():
+                tag_ids.append(_int_or_missing(_field(tag, "id")))
+            tag_offsets.append(len(tag_ids))
+
+        return cls(
+            np.frombuffer(ids, dtype=np.int64),
+            np.frombuffer(category_ids, dtype=np.int64),
+            np.frombuffer(status_codes, dtype=np.int16),
+            tuple(vocabulary),
+            np.frombuffer(tag_ids, dtype=np.int64),
+            np.frombuffer(tag_offsets, dtype=np.int64),
+        )
+
+    @classmethod
+    def fetch(cls, client, statuses: Sequence[str] = STATUSES) -> "PetBatch":
+        """Питомцы всех статусов через потоковый ``iter_pets_by_status`` клиента"""
+        def pets():
+            for status in statuses:
+                yield from client.iter_pets_by_status(status, model=None)
+
+        return cls.from_pets(pets(), statuses)
+
+    @classmethod
+    def concat(cls, batches: Sequence["PetBatch"]) -> "PetBatch":
+        if not batches:
+            return cls.from_pets(())
+        vocabulary: Dict[str, int] = {}
+        status_codes = []
+        for batch in batches:
+            for status in batch.statuses:
+                vocabulary.setdefault(status, len(vocabulary))
+            remap = np.array([vocabulary[status] for status in batch.statuses] + [MISSING], dtype=np.int16)
+            # MISSING (-1) попадает на последний элемент remap и остается MISSING
+            status_codes.append(remap[batch.status_codes])
+
+        tag_offsets = [np.zeros(1, dtype=np.int64)]
+        shift = 0
+        for batch in batches:
+            tag_offsets.append(batch.tag_offsets[1:] + shift)
+            shift += int(batch.tag_offsets[-1])
+        return cls(
+            np.concatenate([batch.ids for batch in batches]),
+            np.concatenate([batch.category_ids for batch in batches]),
+            np.concatenate(status_codes),
+            tuple(vocabulary),
+            np.concatenate([batch.tag_ids for batch in batches]),
+            np.concatenate(tag_offsets),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __repr__(self) -> str:
+        return f"PetBatch({len(self)} pets, {self.nbytes} bytes)"
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in (self.ids, self.category_ids, self.status_codes,
+                                                self.tag_ids, self.tag_offsets))
+
+    def tags(self, index: int) -> np.ndarray:
+        return self.tag_ids[self.tag_offsets[index]:self.tag_offsets[index + 1]]
+
+    def status_of(self, index: int) -> Optional[str]:
+        code = int(self.status_codes[index])
+        return None if code == MISSING else self.statuses[code]
+
+    def take(self, indices: np.ndarray) -> "PetBatch":
+        """Новый батч из строк ``indices`` (массив индексов или булева маска)"""
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        starts, ends = self.tag_offsets[indices], self.tag_offsets[indices + 1]
+        lengths = ends - starts
+        tag_offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=tag_offsets[1:])
+        # Позиции тегов выбранных строк: начало строки + смещение внутри нее
+        positions = np.repeat(starts - tag_offsets[:-1], lengths) + np.arange(tag_offsets[-1])
+        return PetBatch(self.ids[indices], self.category_ids[indices], self.status_codes[indices],
+                        self.statuses, self.tag_ids[positions], tag_offsets)
+
+    def status_counts(self) -> Dict[str, int]:
+        """Количество питомцев по статусам (без статуса не считаются)"""
+        codes = self.status_codes[self.status_codes != MISSING]
+        counts = np.bincount(codes, minlength=len(self.statuses))
+        return {status: int(count) for status, count in zip(self.statuses, counts)}
+
+    def with_status(self, status: str) -> "PetBatch":
+        if status not in self.statuses:
+            return self.take(np.zeros(0, dtype=np.int64))
+        return self.take(self.status_codes == self.statuses.index(status))
+
+    # np.unique на целых заметно медленнее сортировки, поэтому множества
+    # строятся через np.sort и соседние сравнения
+    def unique_ids(self) -> np.ndarray:
+        ids = np.sort(self.ids[self.ids != MISSING])
+        return ids[_unique_sorted(ids)]
+
+    def duplicate_ids(self) -> np.ndarray:
+        """id, встречающиеся больше одного раза"""
+        ids = np.sort(self.ids[self.ids != MISSING])
+        repeated = ids[1:][ids[1:] == ids[:-1]]
+        return repeated[_unique_sorted(repeated)]
+
+    def dedup(self) -> "PetBatch":
+        """Оставить первое вхождение каждого id, порядок строк сохраняется (строки без id - одна)"""
+        order = np.argsort(self.ids, kind="stable")
+        first = order[_unique_sorted(self.ids[order])]
+        return self.take(np.sort(first))
+
+    def difference(self, other: "PetBatch") -> np.ndarray:
+        """id, которые есть в этом батче и отсутствуют в ``other``"""
+        ids = self.unique_ids()
+        return ids[~_isin_sorted(ids, other.unique_ids())]
+
+    def contains(self, ids: Iterable[int]) -> np.ndarray:
+        return _isin_sorted(np.fromiter(ids, dtype=np.int64), self.unique_ids())
+
+    def with_tag(self, tag_id: int) -> "PetBatch":
+        rows = np.repeat(np.arange(len(self)), np.diff(self.tag_offsets))
+        return self.take(np.unique(rows[self.tag_ids == tag_id]))
+
+    def inventory_mismatches(self, inventory: Dict[str, int],
+                             statuses: Optional[Iterable[str]] = None) -> Dict[str, Tuple[int, int]]:
+        """Расхождения с ``get_inventory``: статус -> (в инвентаре, в батче).
+
+        По умолчанию проверяются статусы, запрошенные при сборке батча.
+        """
+        counts = self.status_counts()
+        mismatches = {}
+        for status in statuses if statuses is not None else self.statuses:
+            expected, actual = inventory.get(status, 0), counts.get(status, 0)
+            if expected != actual:
+                mismatches[status] = (expected, actual)
+        return mismatches
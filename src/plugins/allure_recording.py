@@ -0,0 +1,162 @@
+"""
+pytest-плагин ленивой записи шагов Allure
+
+* ``--allure-steps=full`` (по умолчанию) - шаги ``PetStoreSteps``/``ValidationSteps``
+  сразу пишутся в Allure, как раньше.
+* ``--allure-steps=lazy`` - во время теста шаг только запоминает функцию,
+  аргументы, время и результат. Полные шаги Allure с телами запроса и ответа
+  строятся после теста, если он упал или попал в выборку
+  ``--allure-sample-rate``. Для прошедших тестов вне выборки шаги не строятся.
+
+Выборка детерминирована (crc32 от nodeid), поэтому в каждом прогоне
+подробно записываются одни и те же тесты. Восстановленные шаги идут плоским
+списком после шагов, открытых вручную через ``with allure.step``.
+"""
+import zlib
+from typing import Any, List, Optional
+from uuid import uuid4
+
+import allure
+import pytest
+from allure_commons import plugin_manager
+from allure_commons.model2 import Parameter, TestStepResult
+from allure_commons.utils import func_parameters, represent
+from allure_pytest.listener import AllureListener
+from allure_pytest.utils import get_status, get_status_details
+
+from src.utils import allure_steps
+from src.utils.allure_steps import StepRecord
+
+MODES = ("full", "lazy")
+# Больше этого тела запроса и ответа в отчет не попадают
+MAX_ATTACHMENT_BYTES = 64 * 1024
+
+
+def is_sampled(nodeid: str, rate: float) -> bool:
+    """Попал ли тест в выборку подробной записи"""
+    if rate <= 0:
+        return False
+    return rate >= 1 or zlib.crc32(nodeid.encode()) % 10_000 < rate * 10_000
+
+
+def _ms(seconds: float) -> int:
+    return int(seconds * 1000)
+
+
+def _truncate(body: Any, limit: int) -> Optional[str]:
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        text = body[:limit].decode("utf-8", "replace")
+    else:
+        text = str(body)[:limit]
+    return text + "\n... (truncated)" if len(body) > limit else text
+
+
+def _attachments(result, limit: int):
+    """Тела запроса и ответа шага, если шаг вернул ответ"""
+    if not hasattr(result, "status_code"):
+        return []
+    attachments = []
+    request = getattr(result, "request", None)
+    if request is not None:
+        encoding = request.headers.get("Content-Encoding")
+        request_body = (f"<{len(request.body)} bytes, {encoding}>" if encoding and request.body
+                        else _truncate(request.body, limit))
+        attachments.append(("Request", f"{request.method} {request.url}" +
+                            (f"\n\n{request_body}" if request_body else "")))
+    response_body = _truncate(result.content, limit)
+    attachments.append(("Response", f"HTTP {result.status_code}" +
+                        (f"\n\n{response_body}" if response_body else "")))
+    return attachments
+
+
+def _status(error: Optional[BaseException]):
+    if error is None:
+        return get_status(None), None
+    return get_status(error), get_status_details(type(error), error, error.__traceback__)
+
+
+def _listener() -> Optional[AllureListener]:
+    for plugin in plugin_manager.get_plugins():
+        if isinstance(plugin, AllureListener):
+            return plugin
+    return None
+
+
+def current_test_uuid() -> Optional[str]:
+    """uuid теста, который Allure сейчас ведет в этом потоке; None, если Allure не пишет отчет"""
+    listener = _listener()
+    test = listener and listener.allure_logger.get_test(None)
+    return test.uuid if test else None
+
+
+def replay(records: List[StepRecord], test_uuid: Optional[str],
+           max_attachment_bytes: int = MAX_ATTACHMENT_BYTES) -> bool:
+    """Построить шаги Allure из записей в тесте ``test_uuid``; False, если Allure не пишет отчет"""
+    listener = _listener()
+    if not test_uuid or listener is None:
+        return False
+    reporter = listener.allure_logger
+    for record in records:
+        params = func_parameters(record.func, *record.args, **record.kwargs)
+        title = record.title.format(*map(represent, record.args), **params)
+        uuid = uuid4()
+        reporter.start_step(test_uuid, uuid, TestStepResult(
+            name=title, start=_ms(record.start),
+            parameters=[Parameter(name=name, value=value) for name, value in params.items()]))
+        for name, body in _attachments(record.result, max_attachment_bytes):
+            reporter.attach_data(uuid4(), body, name=name, attachment_type=allure.attachment_type.TEXT,
+                                 parent_uuid=uuid)
+        status, details = _status(record.error)
+        reporter.stop_step(uuid, stop=_ms(record.stop), status=status, statusDetails=details)
+    return True
+
+
+class LazyStepRecorder:
+    """Держит буфер шагов на время теста и решает, строить ли по нему отчет"""
+
+    def __init__(self, sample_rate: float):
+        self.sample_rate = sample_rate
+        self.failed = False
+        self.test_uuid = None
+
+    @pytest.hookimpl(hookwrapper=True, trylast=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        # Обертка AllureListener (tryfirst) к этому моменту уже завела результат теста
+        self.test_uuid = current_test_uuid()
+        yield
+        self.test_uuid = None
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        self.failed = False
+        allure_steps.recorder.buffer = []
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        report = (yield).get_result()
+        self.failed = self.failed or report.failed
+        if call.when != "teardown":
+            return
+        records, allure_steps.recorder.buffer = allure_steps.recorder.buffer, None
+        if records and (self.failed or is_sampled(item.nodeid, self.sample_rate)):
+            replay(records, self.test_uuid)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("allure-recording", "lazy Allure step recording")
+    group.addoption("--allure-steps", choices=MODES, default="full",
+                    help="full: report every step live; lazy: build steps only for failed or sampled tests")
+    group.addoption("--allure-sample-rate", type=float, default=0.0,
+                    help="Share of passed tests that still get full steps in lazy mode (0..1)")
+
+
+def pytest_configure(config):
+    if config.getoption("--allure-steps") == "lazy":
+        config.pluginmanager.register(LazyStepRecorder(config.getoption("--allure-sample-rate")),
+                                      "petstore-lazy-steps")
+
+
+def pytest_unconfigure(config):
+    allure_steps.recorder.buffer = None
@@ -0,0 +1,47 @@
+"""
+pytest-плагин кассет: прогон тестов PetStore на записанном трафике
+
+* Без опций фикстура ``petstore_api`` отдает чистый MockPetStoreAPI.
+* ``--cassette PATH --cassette-mode record`` - ``PetStoreClient`` к ``--cassette-url``
+  (по умолчанию боевой PetStore), весь трафик пишется в кассету.
+* ``--cassette PATH`` (``replay``) - тот же клиент отвечает из кассеты без сети.
+
+Ответы на повторяющиеся запросы выдаются в порядке записи, поэтому
+воспроизводить стоит тот же набор тестов в том же порядке, что записывали.
+"""
+import pytest
+
+from src.utils.api_client import PetStoreClient
+from src.utils.cassette import Cassette, MODES
+from src.utils.mock_api import MockPetStoreAPI
+
+DEFAULT_URL = "https://petstore.swagger.io/v2"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("cassettes", "record/replay PetStore traffic")
+    group.addoption("--cassette", default=None, help="Cassette file to record to or replay from")
+    group.addoption("--cassette-mode", choices=MODES, default="replay", help="Record real traffic or replay it")
+    group.addoption("--cassette-url", default=DEFAULT_URL, help="PetStore base URL used when recording")
+
+
+@pytest.fixture(scope="session")
+def petstore_cassette(request):
+    """Открытая кассета из --cassette или None"""
+    path = request.config.getoption("--cassette")
+    if path is None:
+        yield None
+        return
+    with Cassette(path, request.config.getoption("--cassette-mode")) as cassette:
+        yield cassette
+
+
+@pytest.fixture
+def petstore_api(request, petstore_cassette):
+    """API для сценарных тестов: мок или клиент, пишущий/читающий кассету"""
+    if petstore_cassette is None:
+        yield MockPetStoreAPI()
+        return
+    client = PetStoreClient(request.config.getoption("--cassette-url"), cassette=petstore_cassette)
+    yield client
+    client.close()
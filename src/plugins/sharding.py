@@ -0,0 +1,201 @@
+"""
+pytest-плагин для параллельных прогонов против общего бэкенда
+
+* У каждого воркера свой диапазон ID и свой префикс имен пользователей
+  (фикстура ``ids``), поэтому параллельные тесты не пересекаются по данным.
+  Воркер определяется по pytest-xdist (``PYTEST_XDIST_WORKER``) или по
+  ``--shard-id``/``--shards`` для прогона частями на разных машинах.
+* ``--shards N --shard-id K`` раскладывает тесты по частям. Раскладка должна
+  совпадать на всех машинах, поэтому длительности берутся только из явно
+  переданной общей базы ``--shard-durations`` (база timing_history, закоммиченная
+  или скачанная из артефактов CI): по ней части собираются жадным LPT (самые
+  долгие - в наименее загруженную часть) и заканчиваются примерно одновременно.
+  Без нее тест попадает в часть по хешу nodeid - раскладка детерминирована, но
+  без учета длительностей.
+* Под xdist модули сортируются от долгих к коротким по локальной истории
+  ``--timing-db``: динамическая раздача тестов воркерам тогда близка к LPT.
+
+Подключается в корневом conftest.py через ``pytest_plugins``.
+"""
+import heapq
+import itertools
+import os
+import re
+import statistics
+import threading
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pytest
+
+from src.plugins.timing_history import DEFAULT_DB, TimingHistory
+
+# Длительность теста без истории, если истории нет совсем
+DEFAULT_DURATION = 1.0
+
+
+class WorkerNamespace:
+    """Непересекающиеся ID и имена для одного воркера.
+
+    Воркер ``index`` получает ID из ``[id_base + index * id_span, id_base + (index + 1) * id_span)``;
+    имена пользователей получают суффикс с тегом воркера. Выдача потокобезопасна.
+    """
+
+    def __init__(self, worker: str = "main", index: int = 0, count: int = 1,
+                 id_base: int = 10_000_000, id_span: int = 1_000_000):
+        if not 0 <= index < count:
+            raise ValueError("Worker index must be in [0, count)")
+        self.worker = worker
+        self.index = index
+        self.count = count
+        self.id_start = id_base + index * id_span
+        self.id_stop = self.id_start + id_span
+        self._ids = itertools.count(self.id_start)
+        self._names = itertools.count()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"WorkerNamespace({self.worker!r}, ids {self.id_start}..{self.id_stop - 1})"
+
+    def next_id(self) -> int:
+        with self._lock:
+            value = next(self._ids)
+        if value >= self.id_stop:
+            raise RuntimeError(f"ID range of worker {self.worker} is exhausted")
+        return value
+
+    def username(self, prefix: str = "user") -> str:
+        with self._lock:
+            number = next(self._names)
+        return f"{prefix}_{self.worker}_{number}"
+
+    def owns(self, value: int) -> bool:
+        return self.id_start <= value < self.id_stop
+
+
+def worker_identity(shard_id: Optional[int] = None, shards: Optional[int] = None,
+                    environ=os.environ) -> Tuple[str, int, int]:
+    """Тег, номер и число воркеров: xdist, затем --shard-id/--shards, иначе один воркер"""
+    worker = environ.get("PYTEST_XDIST_WORKER")
+    if worker:
+        match = re.fullmatch(r"gw(\d+)", worker)
+        index = int(match.group(1)) if match else 0
+        count = int(environ.get("PYTEST_XDIST_WORKER_COUNT", index + 1))
+        # Несколько машин с xdist: номер воркера уникален внутри части
+        if shards:
+            return f"s{shard_id}{worker}", shard_id * count + index, shards * count
+        return worker, index, count
+    if shards:
+        return f"s{shard_id}", shard_id, shards
+    return "main", 0, 1
+
+
+class DurationStore:
+    """Длительности тестов по nodeid из базы истории прогонов (см. timing_history)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.durations: Dict[str, float] = {}
+        if os.path.exists(path):
+            history = TimingHistory(path)
+            try:
+                self.durations = history.medians("test")
+            finally:
+                history.close()
+
+    def default_duration(self) -> float:
+        """Оценка для тестов без истории - медиана известных"""
+        return statistics.median(self.durations.values()) if self.durations else DEFAULT_DURATION
+
+
+def assign_shards(nodeids: Sequence[str], durations: Dict[str, float], shards: int,
+                  default: float = DEFAULT_DURATION) -> List[int]:
+    """Номер части для каждого теста (LPT): от долгих к коротким, в наименее загруженную часть"""
+    order = sorted(range(len(nodeids)), key=lambda i: (-durations.get(nodeids[i], default), nodeids[i]))
+    loads = [(0.0, shard) for shard in range(shards)]
+    assignment = [0] * len(nodeids)
+    for i in order:
+        load, shard = heapq.heappop(loads)
+        assignment[i] = shard
+        heapq.heappush(loads, (load + durations.get(nodeids[i], default), shard))
+    return assignment
+
+
+def hash_shards(nodeids: Sequence[str], shards: int) -> List[int]:
+    """Номер части для каждого теста по crc32 nodeid - одинаков на любой машине"""
+    return [zlib.crc32(nodeid.encode()) % shards for nodeid in nodeids]
+
+
+def order_modules_longest_first(items: List[pytest.Item], durations: Dict[str, float],
+                                default: float) -> List[pytest.Item]:
+    """Модули от долгих к коротким, порядок тестов внутри модуля сохраняется"""
+    modules: Dict[str, List[pytest.Item]] = {}
+    for item in items:
+        modules.setdefault(item.nodeid.split("::", 1)[0], []).append(item)
+    totals = {name: sum(durations.get(item.nodeid, default) for item in group) for name, group in modules.items()}
+    ordered = sorted(modules, key=lambda name: (-totals[name], name))
+    return [item for name in ordered for item in modules[name]]
+
+
+def _is_xdist_worker(config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("sharding", "parallel-safe sharding")
+    group.addoption("--shards", type=int, default=None, help="Split the run into this many shards")
+    group.addoption("--shard-id", type=int, default=None, help="Run only this shard (0-based)")
+    group.addoption("--shard-durations", default=None,
+                    help="Shared timing history database used to balance --shards; "
+                         "without it tests are split by a hash of the nodeid")
+    group.addoption("--id-base", type=int, default=10_000_000, help="First ID of the worker ID ranges")
+    group.addoption("--id-span", type=int, default=1_000_000, help="Size of the ID range of one worker")
+
+
+def pytest_configure(config):
+    shards, shard_id = config.getoption("--shards"), config.getoption("--shard-id")
+    if (shards is None) != (shard_id is None):
+        raise pytest.UsageError("--shards and --shard-id must be used together")
+    if shards is not None and not 0 <= shard_id < shards:
+        raise pytest.UsageError("--shard-id must be in [0, --shards)")
+    shard_durations = config.getoption("--shard-durations")
+    if shard_durations is not None and not os.path.exists(shard_durations):
+        raise pytest.UsageError(f"--shard-durations file not found: {shard_durations}")
+    config._petstore_shard_durations = DurationStore(shard_durations) if shard_durations else None
+    # Локальная история (ее пишет timing_history) влияет только на порядок под xdist, не на состав частей
+    config._petstore_durations = DurationStore(str(config.rootpath / config.getoption("--timing-db", DEFAULT_DB)))
+
+
+def pytest_collection_modifyitems(session, config, items):
+    store: DurationStore = config._petstore_durations
+    default = store.default_duration()
+    shards, shard_id = config.getoption("--shards"), config.getoption("--shard-id")
+    if shards is not None and shards > 1:
+        nodeids = [item.nodeid for item in items]
+        shared: Optional[DurationStore] = config._petstore_shard_durations
+        if shared is not None and shared.durations:
+            assignment = assign_shards(nodeids, shared.durations, shards, shared.default_duration())
+        else:
+            assignment = hash_shards(nodeids, shards)
+        selected = [item for item, shard in zip(items, assignment) if shard == shard_id]
+        deselected = [item for item, shard in zip(items, assignment) if shard != shard_id]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+    if _is_xdist_worker(config) and store.durations:
+        # Все воркеры читают одну базу, поэтому порядок у всех одинаковый, как требует xdist
+        items[:] = order_modules_longest_first(items, store.durations, default)
+
+
+@pytest.fixture(scope="session")
+def worker_namespace(request) -> WorkerNamespace:
+    """Диапазон ID и префикс имен текущего воркера"""
+    config = request.config
+    worker, index, count = worker_identity(config.getoption("--shard-id"), config.getoption("--shards"))
+    return WorkerNamespace(worker, index, count, config.getoption("--id-base"), config.getoption("--id-span"))
+
+
+@pytest.fixture
+def ids(worker_namespace) -> WorkerNamespace:
+    """Уникальные ID и имена пользователей для теста: ``ids.next_id()``, ``ids.username("testuser")``"""
+    return worker_namespace
@@ -0,0 +1,239 @@
+"""
+pytest-плагин истории длительностей тестов и шагов с контролем регрессий
+
+* Длительность фазы call каждого успешного теста и медиана каждого шага
+  ``PetStoreSteps``/``ValidationSteps`` за прогон пишутся в SQLite
+  (``--timing-db``). Для каждого теста и шага хранится только последние
+  ``--timing-window`` прогонов.
+* Регрессия - значение прогона больше медианы базовой линии (предыдущие
+  прогоны из окна) в ``1 + --timing-threshold`` раз и больше нее на
+  ``--timing-min-delta`` секунд (порог шума для быстрых тестов). Базовая
+  линия учитывается, только если в ней не меньше ``--timing-min-samples`` прогонов.
+* ``--timing-gate=fail`` роняет прогон при регрессии, ``warn`` только
+  выводит их в итогах, ``off`` отключает проверку (история все равно пишется).
+
+Под xdist шаги собираются в воркерах и уходят в контроллер через
+``user_properties`` отчета, базу пишет только контроллер. Та же база -
+источник длительностей тестов для раскладки по частям в плагине sharding.
+"""
+import sqlite3
+import statistics
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pytest
+
+from src.utils import allure_steps
+
+DEFAULT_DB = ".pytest_timings.sqlite"
+STEPS_PROPERTY = "petstore_step_timings"
+GATES = ("fail", "warn", "off")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (kind, name, run_id)
+) WITHOUT ROWID;
+"""
+
+
+class Regression:
+    __slots__ = ("kind", "name", "seconds", "baseline", "samples")
+
+    def __init__(self, kind: str, name: str, seconds: float, baseline: float, samples: int):
+        self.kind = kind
+        self.name = name
+        self.seconds = seconds
+        self.baseline = baseline
+        self.samples = samples
+
+    @property
+    def ratio(self) -> float:
+        return self.seconds / self.baseline if self.baseline else float("inf")
+
+    def format(self) -> str:
+        return (f"{self.kind} {self.name}: {self.seconds * 1000:.1f} ms vs baseline "
+                f"{self.baseline * 1000:.1f} ms (x{self.ratio:.2f}, {self.samples} runs)")
+
+
+class TimingHistory:
+    """Скользящее окно длительностей по тестам и шагам в SQLite"""
+
+    def __init__(self, path: str, window: int = 20):
+        if window <= 1:
+            raise ValueError("window must be greater than 1")
+        self.path = path
+        self.window = window
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def baselines(self, kind: str, names: Iterable[str]) -> Dict[str, List[float]]:
+        """Значения из окна для каждого имени, от старых к новым"""
+        result = {}
+        for name in names:
+            rows = self._db.execute(
+                "SELECT seconds FROM samples WHERE kind = ? AND name = ? ORDER BY run_id DESC LIMIT ?",
+                (kind, name, self.window),
+            ).fetchall()
+            result[name] = [seconds for (seconds,) in reversed(rows)]
+        return result
+
+    def medians(self, kind: str) -> Dict[str, float]:
+        """Медиана окна для каждого имени вида ``kind`` (длительности тестов для шардирования)"""
+        values: Dict[str, List[float]] = defaultdict(list)
+        for name, seconds in self._db.execute("SELECT name, seconds FROM samples WHERE kind = ?", (kind,)):
+            values[name].append(seconds)
+        return {name: statistics.median(seconds) for name, seconds in values.items()}
+
+    def record(self, samples: Dict[Tuple[str, str], float], started: Optional[float] = None) -> int:
+        """Сохранить прогон и обрезать окно; возвращает номер прогона"""
+        with self._db:
+            run_id = self._db.execute("INSERT INTO runs (started) VALUES (?)",
+                                      (time.time() if started is None else started,)).lastrowid
+            self._db.executemany("INSERT INTO samples (run_id, kind, name, seconds) VALUES (?, ?, ?, ?)",
+                                 [(run_id, kind, name, seconds) for (kind, name), seconds in samples.items()])
+            self._db.execute("""
+                DELETE FROM samples WHERE (kind, name, run_id) IN (
+                    SELECT kind, name, run_id FROM (
+                        SELECT kind, name, run_id,
+                               ROW_NUMBER() OVER (PARTITION BY kind, name ORDER BY run_id DESC) AS position
+                        FROM samples
+                    ) WHERE position > ?
+                )""", (self.window,))
+            self._db.execute("DELETE FROM runs WHERE id NOT IN (SELECT DISTINCT run_id FROM samples)")
+        return run_id
+
+
+def find_regressions(current: Dict[Tuple[str, str], float], history: TimingHistory, threshold: float,
+                     min_delta: float, min_samples: int) -> List[Regression]:
+    """Сравнить значения прогона с базовой линией до его записи в историю"""
+    regressions = []
+    by_kind: Dict[str, List[str]] = defaultdict(list)
+    for kind, name in current:
+        by_kind[kind].append(name)
+    for kind, names in by_kind.items():
+        for name, previous in history.baselines(kind, names).items():
+            if len(previous) < min_samples:
+                continue
+            baseline = statistics.median(previous)
+            seconds = current[(kind, name)]
+            if seconds > baseline * (1 + threshold) and seconds - baseline > min_delta:
+                regressions.append(Regression(kind, name, seconds, baseline, len(previous)))
+    return sorted(regressions, key=lambda r: -r.ratio)
+
+
+class StepTimer:
+    """Собирает длительности шагов текущего теста и кладет их в отчет фазы call"""
+
+    def __init__(self):
+        self._steps: Dict[str, List[float]] = defaultdict(list)
+
+    def __call__(self, name: str, seconds: float):
+        self._steps[name].append(seconds)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        self._steps.clear()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        if call.when == "call" and self._steps:
+            outcome.get_result().user_properties.append((STEPS_PROPERTY, dict(self._steps)))
+
+
+class TimingRecorder:
+    """Принимает отчеты (и от воркеров xdist), сравнивает прогон с историей и пишет его"""
+
+    def __init__(self, config):
+        self.config = config
+        self.history = TimingHistory(str(config.rootpath / config.getoption("--timing-db")),
+                                     config.getoption("--timing-window"))
+        self.tests: Dict[str, float] = {}
+        self.steps: Dict[str, List[float]] = defaultdict(list)
+        self.regressions: List[Regression] = []
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call" or not report.passed:
+            return
+        self.tests[report.nodeid] = report.duration
+        for key, value in report.user_properties:
+            if key == STEPS_PROPERTY:
+                for name, durations in value.items():
+                    self.steps[name].extend(durations)
+
+    def current(self) -> Dict[Tuple[str, str], float]:
+        samples = {("test", nodeid): seconds for nodeid, seconds in self.tests.items()}
+        samples.update({("step", name): statistics.median(durations) for name, durations in self.steps.items()})
+        return samples
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        config = self.config
+        current = self.current()
+        if not current:
+            self.history.close()
+            return
+        gate = config.getoption("--timing-gate")
+        if gate != "off":
+            self.regressions = find_regressions(
+                current, self.history,
+                threshold=config.getoption("--timing-threshold"),
+                min_delta=config.getoption("--timing-min-delta"),
+                min_samples=config.getoption("--timing-min-samples"),
+            )
+        self.history.record(current)
+        self.history.close()
+        if self.regressions and gate == "fail" and session.exitstatus == 0:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.regressions:
+            return
+        gate = self.config.getoption("--timing-gate")
+        terminalreporter.section(f"timing regressions ({gate})", sep="-", red=gate == "fail", yellow=gate == "warn")
+        for regression in self.regressions:
+            terminalreporter.line(regression.format())
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("timing-history", "test and step timing history")
+    group.addoption("--timing-db", default=DEFAULT_DB, help="SQLite file with timing history")
+    group.addoption("--no-timing-history", action="store_true", default=False,
+                    help="Do not record timings or check for regressions")
+    group.addoption("--timing-window", type=int, default=20, help="Runs kept per test and step")
+    group.addoption("--timing-gate", choices=GATES, default="warn",
+                    help="What to do on a timing regression: fail the run, warn, or nothing")
+    group.addoption("--timing-threshold", type=float, default=0.5,
+                    help="Relative slowdown against the baseline median that counts as a regression")
+    group.addoption("--timing-min-delta", type=float, default=0.05,
+                    help="Absolute slowdown in seconds below which changes are ignored")
+    group.addoption("--timing-min-samples", type=int, default=5,
+                    help="Baseline runs required before a test or step is checked")
+
+
+def pytest_configure(config):
+    if config.getoption("--no-timing-history"):
+        return
+    timer = StepTimer()
+    allure_steps.step_timers.append(timer)
+    config.pluginmanager.register(timer, "petstore-step-timer")
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(TimingRecorder(config), "petstore-timing-recorder")
+
+
+def pytest_unconfigure(config):
+    timer = config.pluginmanager.get_plugin("petstore-step-timer")
+    if timer in allure_steps.step_timers:
+        allure_steps.step_timers.remove(timer)
@@ -0,0 +1,53 @@
+import pytest
+from src.utils import request_log
+from src.utils.api_client import PetStoreClient
+from src.utils.mock_api import MockPetStoreAPI
+from src.utils.mock_server import MockPetStoreServer
+
+SEED_PETS = 5000
+SEED_USERS = 2000
+SEED_ORDERS = 2000
+
+
+@pytest.fixture(scope="session")
+def petstore_server():
+    """Локальный HTTP-сервер PetStore API на эфемерном порту"""
+    with MockPetStoreServer() as server:
+        yield server
+
+
+@pytest.fixture
+def live_client(petstore_server):
+    """PetStoreClient, подключенный к локальному серверу с пустым состоянием"""
+    petstore_server.reset()
+    client = PetStoreClient(petstore_server.base_url)
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="session")
+def seeded_store():
+    """Мок-API с тестовыми данными, собирается один раз на процесс (воркер)"""
+    return MockPetStoreAPI.seeded(pets=SEED_PETS, users=SEED_USERS, orders=SEED_ORDERS)
+
+
+@pytest.fixture
+def seeded_api(seeded_store):
+    """Заполненный мок-API для одного теста: изменения откатываются после теста"""
+    with seeded_store.fork() as api:
+        yield api
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    request_log.clear_all()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.failed:
+        text = request_log.dump_all()
+        if text:
+            report.sections.append(("PetStore requests", text))
@@ -0,0 +1,96 @@
+"""
+Тесты генерации шагов из PetStoreClient и ленивой записи шагов Allure
+"""
+import json
+
+import pytest
+from src.plugins.allure_recording import is_sampled
+from src.utils import allure_steps
+from src.utils.allure_steps import PetStoreSteps, STEP_TITLES, client_api_methods
+from src.utils.api_client import PetStoreClient
+from src.utils.mock_api import MockPetStoreAPI
+
+TEST_FILE = """
+from src.utils.allure_steps import PetStoreSteps, ValidationSteps
+from src.utils.mock_api import MockPetStoreAPI
+
+
+def test_passes():
+    response = PetStoreSteps.get_pet_by_id(MockPetStoreAPI(), 1)
+    ValidationSteps.validate_status_code(response, 404)
+
+
+def test_fails():
+    response = PetStoreSteps.get_pet_by_id(MockPetStoreAPI(), 1)
+    ValidationSteps.validate_status_code(response, 200)
+"""
+
+
+class TestGeneratedSteps:
+    """Шаги PetStoreSteps совпадают с методами клиента"""
+
+    def test_every_client_method_has_titled_step(self):
+        methods = client_api_methods()
+        assert set(STEP_TITLES) == set(methods)
+        for name in methods:
+            assert hasattr(PetStoreSteps, name)
+            assert getattr(PetStoreSteps, name).__qualname__ == f"PetStoreSteps.{name}"
+
+    def test_mock_api_implements_every_step(self):
+        missing = [name for name in client_api_methods() if not hasattr(MockPetStoreAPI, name)]
+        assert missing == []
+
+    def test_step_calls_client_method(self):
+        client = PetStoreClient()
+        calls = []
+        client.get_order_by_id = lambda order_id: calls.append(order_id) or "ok"
+        assert PetStoreSteps.get_order_by_id(client, 7) == "ok"
+        assert calls == [7]
+
+
+class TestLazyRecording:
+    """Буфер шагов и выборка"""
+
+    def test_lazy_mode_records_without_allure(self, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("allure.step must not be used in lazy mode")
+
+        monkeypatch.setattr(allure_steps.recorder, "buffer", [])
+        monkeypatch.setattr("allure_commons._allure.StepContext.__enter__", fail)
+        response = PetStoreSteps.get_pet_by_id(MockPetStoreAPI(), 1)
+        with pytest.raises(AssertionError):
+            allure_steps.ValidationSteps.validate_status_code(response, 200)
+
+        first, second = allure_steps.recorder.buffer
+        assert first.title == STEP_TITLES["get_pet_by_id"] and first.result is response
+        assert first.args[1:] == (1,) and first.stop >= first.start
+        assert isinstance(second.error, AssertionError)
+
+    def test_sampling_is_deterministic(self):
+        nodeids = [f"test_x.py::test_{i}" for i in range(1000)]
+        sampled = [nodeid for nodeid in nodeids if is_sampled(nodeid, 0.1)]
+        assert 50 < len(sampled) < 150
+        assert sampled == [nodeid for nodeid in nodeids if is_sampled(nodeid, 0.1)]
+        assert not is_sampled(nodeids[0], 0) and is_sampled(nodeids[0], 1)
+
+    @pytest.mark.parametrize("mode, sample_rate, expected", [
+        ("full", "0", {"test_passes": 2, "test_fails": 2}),
+        ("lazy", "0", {"test_passes": 0, "test_fails": 2}),
+        ("lazy", "1", {"test_passes": 2, "test_fails": 2}),
+    ])
+    def test_steps_in_report(self, pytester, mode, sample_rate, expected):
+        pytester.makeconftest('pytest_plugins = ["src.plugins.allure_recording"]')
+        pytester.makepyfile(test_flow=TEST_FILE)
+        alluredir = pytester.path / "allure-results"
+        result = pytester.runpytest("--alluredir", str(alluredir), "--allure-steps", mode,
+                                    "--allure-sample-rate", sample_rate, "-p", "no:cacheprovider")
+        result.assert_outcomes(passed=1, failed=1)
+
+        reports = [json.loads(path.read_text()) for path in alluredir.glob("*-result.json")]
+        steps = {report["name"]: report.get("steps", []) for report in reports}
+        assert {name: len(value) for name, value in steps.items()} == expected
+        failed_steps = steps["test_fails"]
+        assert failed_steps[0]["name"] == "Получить питомца по ID: 1"
+        assert failed_steps[-1]["status"] == "failed"
+        if mode == "lazy":
+            assert [a["name"] for a in failed_steps[0]["attachments"]] == ["Response"]
@@ -0,0 +1,665 @@
+"""
+Тесты PetStoreClient
+Сетевой слой подменяется через unittest.mock.patch или локальный HTTP-сервер
+"""
+import json
+import logging
+import threading
+import time
+import pytest
+import requests
+from functools import partial
+from typing import List
+from unittest.mock import Mock, patch
+from src.models.decoding import decode
+from src.models.models import ApiResponse, Order, Pet
+from src.utils.api_client import PetStoreClient
+from src.utils.cache import ResponseCache
+from src.utils.compression import CompressionConfig, CorruptBodyError, decompress
+from src.utils import request_log
+from src.utils.metrics import RequestMetrics
+from src.utils.pool import PoolConfig
+from src.utils.request_log import RequestLog, redact_url
+from src.utils.retry import RequestPolicy
+from src.utils.routes import route_template
+from src.utils.streaming import iter_json_array
+
+
+def _fake_request(method, url, **kwargs):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps({"method": method, "url": url, "json": kwargs.get("json")}).encode()
+    return response
+
+
+class TestRunMany:
+    """Тесты пакетного выполнения вызовов"""
+
+    @pytest.fixture
+    def client(self):
+        client = PetStoreClient("http://petstore.local/v2")
+        with patch.object(client.session, "request", side_effect=_fake_request):
+            yield client
+
+    def test_results_keep_input_order(self, client):
+        """Результаты возвращаются в порядке входного списка"""
+        calls = [("get_pet_by_id", pet_id) for pet_id in range(100)]
+        responses = client.run_many(calls, max_concurrency=8)
+        urls = [response.json()["url"] for response in responses]
+        assert urls == [f"http://petstore.local/v2/pet/{pet_id}" for pet_id in range(100)]
+
+    def test_mixed_call_forms(self, client):
+        """Кортежи и функции без аргументов"""
+        pet_data = {"id": 1, "name": "TestDog", "photoUrls": []}
+        responses = client.run_many([
+            ("add_pet", pet_data),
+            partial(client.update_user, "testuser", {"username": "testuser"}),
+            client.get_inventory,
+        ])
+        assert [r.json()["method"] for r in responses] == ["POST", "PUT", "GET"]
+        assert responses[0].json()["json"] == pet_data
+
+    def test_exceptions_are_captured(self, client):
+        """Исключение одного вызова не прерывает пачку"""
+        def boom():
+            raise ConnectionError("connection reset")
+
+        responses = client.run_many([("get_inventory",), boom, ("get_pet_by_id", 1)])
+        assert responses[0].status_code == 200
+        assert isinstance(responses[1], ConnectionError)
+        assert responses[2].status_code == 200
+
+    def test_concurrency_is_bounded(self):
+        """Количество одновременных вызовов не превышает max_concurrency"""
+        client = PetStoreClient("http://petstore.local/v2")
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def slow_request(method, url, **kwargs):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.01)
+            with lock:
+                state["active"] -= 1
+            return _fake_request(method, url, **kwargs)
+
+        with patch.object(client.session, "request", side_effect=slow_request):
+            responses = client.run_many([("get_pet_by_id", i) for i in range(40)], max_concurrency=4)
+
+        assert len(responses) == 40
+        assert 1 < state["peak"] <= 4
+
+    def test_empty_batch(self, client):
+        assert client.run_many([]) == []
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache:
+    """Тесты кеша GET-запросов"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def client(self, petstore_server, clock):
+        petstore_server.reset()
+        client = PetStoreClient(petstore_server.base_url, cache=ResponseCache(max_size=100, ttl=10, clock=clock))
+        with patch.object(client.session, "request", wraps=client.session.request) as request:
+            client.sent = request
+            yield client
+        client.close()
+
+    def test_repeated_get_is_served_from_cache(self, client):
+        client.add_pet({"id": 1, "name": "Dog", "status": "available", "photoUrls": []})
+        first = client.get_pet_by_id(1)
+        second = client.get_pet_by_id(1)
+        assert second is first
+        assert client.sent.call_count == 2
+        assert client.cache.stats()["hits"] == 1
+
+    def test_writes_invalidate_related_entries(self, client):
+        client.add_pet({"id": 1, "name": "Dog", "status": "available", "photoUrls": []})
+        assert client.get_inventory().json()["available"] == 1
+        assert len(client.find_pets_by_status("available").json()) == 1
+        assert client.get_pet_by_id(1).json()["name"] == "Dog"
+
+        client.update_pet_with_form(1, name="Renamed", status="sold")
+        assert client.get_pet_by_id(1).json()["name"] == "Renamed"
+        assert client.find_pets_by_status("available").json() == []
+        assert client.get_inventory().json()["sold"] == 1
+
+        client.delete_pet(1)
+        assert client.get_pet_by_id(1).status_code == 404
+
+    def test_user_and_order_invalidation(self, client):
+        client.create_user({"username": "testuser", "email": "old@example.com"})
+        client.place_order({"id": 1, "petId": 1, "status": "placed"})
+        assert client.get_user_by_username("testuser").json()["email"] == "old@example.com"
+        assert client.get_order_by_id(1).status_code == 200
+
+        client.update_user("testuser", {"username": "testuser", "email": "new@example.com"})
+        client.delete_order(1)
+        assert client.get_user_by_username("testuser").json()["email"] == "new@example.com"
+        assert client.get_order_by_id(1).status_code == 404
+
+        client.delete_user("testuser")
+        assert client.get_user_by_username("testuser").status_code == 404
+
+    def test_rename_invalidates_new_username(self, client):
+        client.create_user({"username": "renamed", "email": "old@example.com"})
+        client.create_user({"username": "testuser"})
+        client.get_user_by_username("renamed")
+        client.get_user_by_username("renamed")
+        sent = client.sent.call_count
+        client.update_user("testuser", {"username": "renamed", "email": "new@example.com"})
+        client.get_user_by_username("renamed")
+        assert client.sent.call_count == sent + 2
+        assert client.cache.stats()["hits"] == 1
+
+    def test_errors_are_not_cached(self, client):
+        assert client.get_pet_by_id(1).status_code == 404
+        client.add_pet({"id": 1, "name": "Dog", "photoUrls": []})
+        assert client.get_pet_by_id(1).status_code == 200
+
+    def test_expired_entry_is_revalidated_with_etag(self, client, clock):
+        client.add_pet({"id": 1, "name": "Dog", "photoUrls": []})
+        first = client.get_pet_by_id(1)
+        assert first.headers.get("ETag")
+
+        clock.now += 11
+        again = client.get_pet_by_id(1)
+        assert again is first
+        assert client.sent.call_args.kwargs["headers"]["If-None-Match"] == first.headers["ETag"]
+        assert client.cache.stats()["revalidations"] == 1
+
+    def test_lru_eviction(self, petstore_server):
+        petstore_server.reset()
+        client = PetStoreClient(petstore_server.base_url, cache=ResponseCache(max_size=2))
+        for pet_id in (1, 2, 3):
+            client.add_pet({"id": pet_id, "name": f"Dog{pet_id}", "photoUrls": []})
+        client.get_pet_by_id(1)
+        client.get_pet_by_id(2)
+        client.get_pet_by_id(1)
+        client.get_pet_by_id(3)
+        assert len(client.cache) == 2
+        assert client.cache.lookup("/pet/2") is None
+        assert client.cache.lookup("/pet/1") is not None
+        assert client.cache.stats()["evictions"] == 1
+
+    def test_cache_is_opt_in(self, live_client):
+        live_client.add_pet({"id": 1, "name": "Dog", "photoUrls": []})
+        assert live_client.get_pet_by_id(1) is not live_client.get_pet_by_id(1)
+
+
+def _response(status_code, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+class TestRequestPolicy:
+    """Тесты таймаутов, повторов и хеджирования"""
+
+    def _client(self, policy, side_effect):
+        client = PetStoreClient("http://petstore.local/v2", policy=policy)
+        patcher = patch.object(client.session, "request", side_effect=side_effect)
+        client.sent = patcher.start()
+        return client, patcher
+
+    @pytest.mark.parametrize("endpoint, template", [
+        ("/pet/42", "/pet/{petId}"),
+        ("/pet/findByStatus?status=sold", "/pet/findByStatus"),
+        ("/store/order/7", "/store/order/{orderId}"),
+        ("/user/login?username=a&password=b", "/user/login"),
+        ("/user/createWithList", "/user/createWithList"),
+        ("/user/john", "/user/{username}"),
+        ("/unknown/path", "other"),
+        ("/pet/1/unknown/42", "other"),
+    ])
+    def test_route_template(self, endpoint, template):
+        assert route_template(endpoint) == template
+
+    def test_per_endpoint_timeouts(self):
+        policy = RequestPolicy(timeout=5, timeouts={"/pet/findByStatus": 30, "DELETE /pet/{petId}": 1})
+        client, patcher = self._client(policy, [_response(200)] * 3)
+        try:
+            client.find_pets_by_status("sold")
+            client.delete_pet(1)
+            client.get_pet_by_id(1)
+        finally:
+            patcher.stop()
+        assert [c.kwargs["timeout"] for c in client.sent.call_args_list] == [30, 1, 5]
+
+    def test_retry_on_status_with_backoff(self):
+        sleeps = []
+        policy = RequestPolicy(max_retries=3, backoff_base=0.1, seed=1, sleep=sleeps.append)
+        client, patcher = self._client(policy, [_response(503), _response(502, {"Retry-After": "2"}), _response(200)])
+        try:
+            response = client.get_pet_by_id(1)
+        finally:
+            patcher.stop()
+        assert response.status_code == 200
+        assert client.sent.call_count == 3
+        assert 0 <= sleeps[0] <= 0.1
+        assert sleeps[1] == 2.0
+        assert policy.stats.to_dict()["retries"] == 2
+
+    def test_non_idempotent_methods_are_not_retried(self):
+        policy = RequestPolicy(max_retries=3, sleep=lambda _: None)
+        client, patcher = self._client(policy, [_response(503), _response(200)])
+        try:
+            assert client.add_pet({"id": 1, "name": "Dog", "photoUrls": []}).status_code == 503
+        finally:
+            patcher.stop()
+        assert client.sent.call_count == 1
+
+    def test_connection_errors_exhaust_retries(self):
+        policy = RequestPolicy(max_retries=2, sleep=lambda _: None)
+        client, patcher = self._client(policy, requests.ConnectionError("refused"))
+        try:
+            with pytest.raises(requests.ConnectionError):
+                client.get_inventory()
+        finally:
+            patcher.stop()
+        assert client.sent.call_count == 3
+        stats = policy.stats.to_dict()
+        assert stats["retries"] == 2
+        assert stats["retries_exhausted"] == 1
+
+    def test_backoff_is_capped(self):
+        policy = RequestPolicy(backoff_base=1, backoff_max=3, seed=7)
+        assert all(0 <= policy.backoff(attempt) <= 3 for attempt in range(1, 20))
+
+    def test_hedged_get_takes_first_response(self):
+        calls = []
+
+        def slow_then_fast(method, url, **kwargs):
+            calls.append(url)
+            if len(calls) == 1:
+                time.sleep(0.3)
+                return _response(500)
+            return _response(200)
+
+        policy = RequestPolicy(hedge=True, hedge_delay=0.02)
+        client, patcher = self._client(policy, slow_then_fast)
+        try:
+            started = time.perf_counter()
+            response = client.get_pet_by_id(1)
+            elapsed = time.perf_counter() - started
+        finally:
+            patcher.stop()
+            policy.close()
+        assert response.status_code == 200
+        assert elapsed < 0.25
+        assert policy.stats.hedges == 1
+        assert policy.stats.hedge_wins == 1
+
+    def test_hedge_loser_response_is_closed(self):
+        loser = _response(500)
+        loser.close = Mock()
+        calls = []
+
+        def slow_then_fast(method, url, **kwargs):
+            calls.append(url)
+            if len(calls) == 1:
+                time.sleep(0.1)
+                return loser
+            return _response(200)
+
+        policy = RequestPolicy(hedge=True, hedge_delay=0.02)
+        client, patcher = self._client(policy, slow_then_fast)
+        try:
+            assert client.get_pet_by_id(1).status_code == 200
+            time.sleep(0.2)
+        finally:
+            patcher.stop()
+        loser.close.assert_called_once_with()
+        with client:
+            assert policy._executor is not None
+        assert policy._executor is None
+
+    def test_hedge_delay_follows_observed_p95(self):
+        policy = RequestPolicy(hedge=True, hedge_min_samples=10, hedge_min_delay=0.001)
+        assert policy.hedge_delay_for("/pet/{petId}") is None
+        for ms in range(1, 101):
+            policy.observe("/pet/{petId}", ms / 1000)
+        assert policy.hedge_delay_for("/pet/{petId}") == pytest.approx(0.095, rel=0.02)
+
+    def test_fast_responses_are_not_hedged(self):
+        policy = RequestPolicy(hedge=True, hedge_delay=1.0)
+        client, patcher = self._client(policy, [_response(200)])
+        try:
+            client.get_pet_by_id(1)
+        finally:
+            patcher.stop()
+            policy.close()
+        assert policy.stats.hedges == 0
+        assert client.sent.call_count == 1
+
+
+class TestConnectionPool:
+    """Тесты настроек и метрик пула соединений"""
+
+    @pytest.fixture
+    def base_url(self, petstore_server):
+        petstore_server.reset()
+        return petstore_server.base_url
+
+    def test_sequential_requests_reuse_connection(self, base_url):
+        client = PetStoreClient(base_url)
+        for _ in range(10):
+            client.get_inventory()
+        stats = client.pool_stats()
+        assert stats["checkouts"] == 10
+        assert stats["opened"] == 1
+        assert stats["reused"] == 9
+        assert stats["in_use"] == 0
+
+    def test_keep_alive_disabled(self, base_url):
+        client = PetStoreClient(base_url, pool=PoolConfig(keep_alive=False))
+        for _ in range(5):
+            client.get_inventory()
+        assert client.pool_stats()["opened"] == 5
+
+    def test_undersized_pool_discards_connections(self, base_url):
+        client = PetStoreClient(base_url, pool=PoolConfig(pool_maxsize=1))
+        client.run_many([("get_pet_by_id", i) for i in range(60)], max_concurrency=8)
+        stats = client.pool_stats()
+        assert stats["checkouts"] == 60
+        assert stats["discarded"] > 0
+
+    def test_blocking_pool_caps_connections(self, base_url):
+        client = PetStoreClient(base_url, pool=PoolConfig(pool_maxsize=2, pool_block=True))
+        responses = client.run_many([("get_pet_by_id", i) for i in range(60)], max_concurrency=8)
+        assert all(r.status_code == 404 for r in responses)
+        stats = client.pool_stats()
+        assert stats["opened"] <= 2
+        assert stats["discarded"] == 0
+        assert stats["wait_seconds_total"] > 0
+
+    def test_pool_size_is_applied(self, base_url):
+        client = PetStoreClient(base_url, pool=PoolConfig(pool_connections=3, pool_maxsize=32, tcp_keepalive=True))
+        adapter = client.session.get_adapter(base_url)
+        assert adapter._pool_maxsize == 32
+        assert adapter._pool_connections == 3
+        client.get_inventory()
+        pool = adapter.poolmanager.connection_from_url(base_url)
+        assert pool.pool.maxsize == 32
+
+
+class TestRequestMetrics:
+    """Тесты метрик запросов"""
+
+    def test_endpoints_keyed_by_route_template(self, live_client):
+        live_client.get_pet_by_id(1)
+        live_client.get_pet_by_id(2)
+        live_client.find_pets_by_status("sold")
+        metrics = live_client.metrics.to_dict()
+        assert set(metrics) == {"GET /pet/{petId}", "GET /pet/findByStatus"}
+        assert live_client.metrics.series_count() == 2
+        assert metrics["GET /pet/{petId}"]["requests"] == 2
+        assert metrics["GET /pet/{petId}"]["statuses"] == {"404": 2}
+
+    def test_byte_counts(self, live_client):
+        pet_data = {"id": 1, "name": "TestDog", "photoUrls": []}
+        live_client.add_pet(pet_data)
+        endpoint = live_client.metrics.get("POST", "/pet")
+        assert endpoint.request_bytes == len(json.dumps(pet_data))
+        assert endpoint.response_bytes > 0
+
+    def test_exceptions_are_counted(self):
+        client = PetStoreClient("http://127.0.0.1:9/v2")
+        with pytest.raises(requests.ConnectionError):
+            client.get_inventory()
+        assert client.metrics.get("GET", "/store/inventory").statuses == {"ConnectionError": 1}
+
+    def test_prometheus_export(self, live_client, tmp_path):
+        for pet_id in range(5):
+            live_client.get_pet_by_id(pet_id)
+        path = tmp_path / "metrics.prom"
+        live_client.metrics.write_prometheus(str(path))
+        text = path.read_text()
+        labels = 'method="GET",route="/pet/{petId}"'
+        assert f'petstore_client_requests_total{{{labels},status="404"}} 5' in text
+        assert f'petstore_client_request_duration_seconds_bucket{{{labels},le="+Inf"}} 5' in text
+        assert f"petstore_client_request_duration_seconds_count{{{labels}}} 5" in text
+        buckets = [int(line.rsplit(" ", 1)[1]) for line in text.splitlines()
+                   if line.startswith("petstore_client_request_duration_seconds_bucket")]
+        assert buckets == sorted(buckets)
+
+    def test_prometheus_buckets_include_values_on_the_bound(self):
+        metrics = RequestMetrics()
+        for seconds in (0.001, 0.001, 0.0011, 0.003):
+            metrics.record("GET", "/pet/{petId}", "200", seconds)
+        text = metrics.to_prometheus()
+        labels = 'method="GET",route="/pet/{petId}"'
+        assert f'petstore_client_request_duration_seconds_bucket{{{labels},le="0.001"}} 2' in text
+        assert f'petstore_client_request_duration_seconds_bucket{{{labels},le="0.0025"}} 3' in text
+        assert f'petstore_client_request_duration_seconds_bucket{{{labels},le="0.005"}} 4' in text
+
+    def test_unknown_routes_share_one_series(self, live_client):
+        for pet_id in range(3):
+            live_client._request("GET", f"/pet/{pet_id}/unknown")
+        assert set(live_client.metrics.to_dict()) == {"GET other"}
+
+    def test_json_export(self, live_client, tmp_path):
+        live_client.get_inventory()
+        path = tmp_path / "metrics.json"
+        live_client.metrics.write_json(str(path))
+        data = json.loads(path.read_text())
+        assert data["GET /store/inventory"]["latency"]["count"] == 1
+
+
+class TestRequestLog:
+    """Тесты журнала запросов"""
+
+    class Url:
+        """URL, который считает, сколько раз его форматировали"""
+
+        def __init__(self):
+            self.formatted = 0
+
+        def __str__(self):
+            self.formatted += 1
+            return "/pet/1"
+
+    def test_ring_buffer_keeps_last_records(self, petstore_server):
+        petstore_server.reset()
+        client = PetStoreClient(petstore_server.base_url, request_log=RequestLog(capacity=3))
+        for pet_id in range(5):
+            client.get_pet_by_id(pet_id)
+        records = client.request_log.records()
+        assert len(records) == 3
+        assert [r[2].rsplit("/", 1)[1] for r in records] == ["2", "3", "4"]
+        assert all(r[3] == "404" for r in records)
+        assert "GET" in client.request_log.dump()
+
+    def test_no_formatting_when_logger_disabled(self, caplog):
+        caplog.set_level(logging.WARNING)
+        url = self.Url()
+        request_log = RequestLog(log=logging.getLogger("petstore.test"))
+        request_log.record("GET", url, "200", 0.001)
+        assert url.formatted == 0
+        assert caplog.records == []
+        assert len(request_log) == 1
+
+    def test_sampling(self, caplog):
+        caplog.set_level(logging.INFO, logger="petstore.test")
+        request_log = RequestLog(sample_rate=0.1, log=logging.getLogger("petstore.test"), seed=1)
+        for _ in range(1000):
+            request_log.record("GET", "/pet/1", "200", 0.001)
+        assert 50 < len(caplog.records) < 150
+        assert len(request_log) == 100
+
+    def test_secret_query_values_are_redacted(self, live_client, caplog):
+        caplog.set_level(logging.DEBUG, logger="src.utils")
+        live_client.user_login("john", "s3cret")
+        dump = live_client.request_log.dump()
+        assert "/user/login?username=john&password=*** -> " in dump
+        assert "s3cret" not in dump
+        assert "s3cret" not in caplog.text
+        assert "password=***" in caplog.text
+        assert redact_url("/user/login?password=a&token=b#x") == "/user/login?password=***&token=***#x"
+        assert redact_url("/pet/1") == "/pet/1"
+
+    def test_failed_test_gets_request_dump(self, live_client):
+        live_client.get_pet_by_id(1)
+        assert "/pet/1 -> 404" in request_log.dump_all()
+        request_log.clear_all()
+        assert request_log.dump_all() == ""
+
+
+class TestTypedResponses:
+    """Тесты разбора ответов в модели"""
+
+    def test_parsed_pet(self, live_client):
+        live_client.add_pet({"id": 1, "name": "Dog", "photoUrls": [], "category": {"id": 2, "name": "dogs"}})
+        response = live_client.get_pet_by_id(1)
+        assert isinstance(response, requests.Response)
+        pet = response.parsed
+        assert isinstance(pet, Pet)
+        assert pet.category.name == "dogs"
+        assert response.parsed is pet
+
+    def test_parsed_list_and_inventory(self, live_client):
+        live_client.add_pet({"id": 1, "name": "Dog", "photoUrls": [], "status": "sold"})
+        pets = live_client.find_pets_by_status("sold").parsed
+        assert [pet.id for pet in pets] == [1]
+        assert live_client.get_inventory().parsed["sold"] == 1
+
+    def test_error_parsed_as_api_response(self, live_client):
+        error = live_client.get_order_by_id(404).parsed
+        assert isinstance(error, ApiResponse)
+        assert error.code == 1
+
+    def test_validation_error(self, live_client):
+        live_client.add_pet({"id": 1, "name": "Dog"})
+        with pytest.raises(ValueError):
+            live_client.get_pet_by_id(1).parse()
+
+    def test_construct_without_validation(self, live_client):
+        live_client.validate_models = False
+        live_client.place_order({"id": 5, "petId": 1, "quantity": 2})
+        order = live_client.get_order_by_id(5).parsed
+        assert isinstance(order, Order)
+        assert order.quantity == 2
+
+    def test_decode_nested_without_validation(self):
+        content = b'[{"id": 1, "name": "Dog", "photoUrls": [], "tags": [{"id": 3, "name": "t"}]}]'
+        pets = decode(content, List[Pet], validate=False)
+        assert pets[0].tags[0].name == "t"
+        assert pets == decode(content, List[Pet])
+
+
+class TestStreaming:
+    """Тесты потокового разбора findByStatus"""
+
+    def test_parser_handles_any_chunking(self):
+        items = [{"id": i, "name": f"пёс {i}", "tags": [1.5, None, True, "a]b,c"]} for i in range(50)] + [12345, []]
+        raw = json.dumps(items, ensure_ascii=False).encode()
+        for size in (1, 3, 64, len(raw)):
+            chunks = [raw[i:i + size] for i in range(0, len(raw), size)]
+            assert list(iter_json_array(chunks)) == items
+
+    @pytest.mark.parametrize("raw", [b"[1,", b"{}", b"[1 2]"])
+    def test_parser_rejects_malformed(self, raw):
+        with pytest.raises(ValueError):
+            list(iter_json_array([raw]))
+
+    def test_iter_pets(self, live_client):
+        for pet_id in range(1, 201):
+            live_client.add_pet({"id": pet_id, "name": f"Dog{pet_id}", "status": "sold", "photoUrls": []})
+        pets = list(live_client.iter_pets_by_status("sold", chunk_size=128))
+        assert [pet.id for pet in pets] == list(range(1, 201))
+        assert all(isinstance(pet, Pet) for pet in pets)
+        dicts = live_client.iter_pets_by_status("sold", model=None)
+        assert next(dicts)["name"] == "Dog1"
+        dicts.close()
+
+    def test_early_stop_releases_connection(self, live_client):
+        for pet_id in range(1, 201):
+            live_client.add_pet({"id": pet_id, "name": f"Dog{pet_id}", "status": "sold", "photoUrls": []})
+        for pet in live_client.iter_pets_by_status("sold", chunk_size=128):
+            break
+        assert live_client.pool_stats()["in_use"] == 0
+        assert live_client.get_pet_by_id(1).status_code == 200
+
+
+class TestCompression:
+    """Тесты сжатия тел запросов и ответов"""
+
+    @pytest.fixture
+    def compressing_server(self, petstore_server):
+        petstore_server.compress_min_size = 256
+        yield petstore_server
+        petstore_server.compress_min_size = None
+
+    def _users(self, count):
+        return [{"id": i, "username": f"user{i}", "email": f"user{i}@example.com"} for i in range(count)]
+
+    @pytest.mark.parametrize("encoding", ["gzip", "deflate", "zstd"])
+    def test_threshold_and_roundtrip(self, encoding):
+        if encoding == "zstd":
+            pytest.importorskip("zstandard")
+        config = CompressionConfig(encoding, min_size=512)
+        assert config.encode(b'{"id": 1}') == (b'{"id": 1}', {})
+        body = json.dumps(self._users(50)).encode()
+        compressed, headers = config.encode(body)
+        assert headers == {"Content-Encoding": encoding}
+        assert len(compressed) < len(body)
+        assert decompress(compressed, encoding) == body
+
+    @pytest.mark.parametrize("encoding", ["gzip", "deflate", "zstd"])
+    def test_corrupt_body(self, petstore_server, encoding):
+        if encoding == "zstd":
+            pytest.importorskip("zstandard")
+        body = CompressionConfig(encoding, min_size=0).compress(json.dumps(self._users(50)).encode())
+        for corrupt in (b"not compressed", body[:len(body) // 2]):
+            with pytest.raises(CorruptBodyError):
+                decompress(corrupt, encoding)
+        response = requests.post(f"{petstore_server.base_url}/user/createWithList", data=b"not compressed",
+                                 headers={"Content-Type": "application/json", "Content-Encoding": encoding})
+        assert response.status_code == 400
+        with pytest.raises(ValueError, match="Unsupported"):
+            decompress(body, "br")
+
+    def test_unsupported_accept_encoding(self):
+        with pytest.raises(ValueError):
+            CompressionConfig(accept=("br",))
+
+    @pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+    def test_compressed_request_body(self, petstore_server, encoding):
+        if encoding == "zstd":
+            pytest.importorskip("zstandard")
+        petstore_server.reset()
+        client = PetStoreClient(petstore_server.base_url, compression=CompressionConfig(encoding, min_size=256))
+        users = self._users(200)
+        assert client.create_users_with_list(users).status_code == 200
+        assert client.add_pet({"id": 1, "name": "Dog", "photoUrls": []}).parsed.name == "Dog"
+        assert len(petstore_server.api.users) == 200
+        sent = client.metrics.get("POST", "/user/createWithList").request_bytes
+        assert sent < len(json.dumps(users)) / 3
+        assert client.metrics.get("POST", "/pet").request_bytes == len(json.dumps({"id": 1, "name": "Dog", "photoUrls": []}))
+        client.close()
+
+    def test_compressed_response(self, compressing_server):
+        compressing_server.reset()
+        client = PetStoreClient(compressing_server.base_url, compression=CompressionConfig())
+        for pet_id in range(1, 101):
+            client.add_pet({"id": pet_id, "name": f"Dog{pet_id}", "status": "sold", "photoUrls": []})
+        response = client.find_pets_by_status("sold")
+        assert response.headers["Content-Encoding"] in ("gzip", "deflate")
+        assert len(response.parsed) == 100
+        assert client.metrics.get("GET", "/pet/findByStatus").response_bytes < len(response.content) / 3
+        assert "Content-Encoding" not in client.get_pet_by_id(1).headers
+        client.close()
@@ -0,0 +1,102 @@
+"""
+Тесты асинхронного клиента PetStore API
+Работают против локального HTTP-сервера
+"""
+import asyncio
+import logging
+import pytest
+import requests
+from src.models.models import ApiResponse, Pet
+from src.utils.async_api_client import AsyncPetStoreClient
+from src.utils.responses import PetStoreResponse
+
+
+class TestAsyncPetStoreClient:
+    """Тесты для AsyncPetStoreClient"""
+
+    @pytest.fixture
+    def base_url(self, petstore_server):
+        petstore_server.reset()
+        return petstore_server.base_url
+
+    def test_response_contract(self, base_url):
+        """Ответ совпадает по контракту с requests.Response"""
+        async def scenario():
+            async with AsyncPetStoreClient(base_url) as client:
+                await client.add_pet({"id": 1, "name": "TestDog", "photoUrls": []})
+                return await client.get_pet_by_id(1)
+
+        response = asyncio.run(scenario())
+        assert isinstance(response, requests.Response)
+        assert response.status_code == 200
+        assert response.json()["name"] == "TestDog"
+        assert response.headers["content-type"].startswith("application/json")
+        assert isinstance(response, PetStoreResponse)
+        assert isinstance(response.parsed, Pet)
+        assert response.parsed.name == "TestDog"
+
+    def test_not_found(self, base_url):
+        """Тест получения несуществующего питомца"""
+        async def scenario():
+            async with AsyncPetStoreClient(base_url) as client:
+                return await client.get_pet_by_id(999)
+
+        response = asyncio.run(scenario())
+        assert response.status_code == 404
+        assert response.json()["message"] == "Pet not found"
+        assert isinstance(response.parsed, ApiResponse)
+        assert response.parsed.message == "Pet not found"
+
+    def test_lazy_request_logging(self, base_url, caplog):
+        """Строки лога форматируются только при включенном уровне"""
+        async def scenario():
+            async with AsyncPetStoreClient(base_url) as client:
+                await client.get_pet_by_id(999)
+
+        caplog.set_level(logging.WARNING, logger="src.utils.async_api_client")
+        asyncio.run(scenario())
+        assert not caplog.records
+        caplog.set_level(logging.INFO, logger="src.utils.async_api_client")
+        asyncio.run(scenario())
+        [record] = caplog.records
+        assert record.msg == "%s %s -> %s in %.1f ms"
+        assert record.args[:3] == ("GET", f"{base_url}/pet/999", 404)
+
+    def test_form_and_query_endpoints(self, base_url):
+        """Форма и параметры запроса проходят так же, как у синхронного клиента"""
+        async def scenario():
+            async with AsyncPetStoreClient(base_url) as client:
+                await client.add_pet({"id": 1, "name": "Dog", "status": "available", "photoUrls": []})
+                await client.update_pet_with_form(1, name="Renamed", status="sold")
+                sold = await client.find_pets_by_status("sold")
+                login = await client.user_login("user", "password")
+                return sold, login
+
+        sold, login = asyncio.run(scenario())
+        assert [pet["name"] for pet in sold.json()] == ["Renamed"]
+        assert login.status_code == 200
+
+    def test_concurrent_requests_share_pool(self, base_url):
+        """Параллельные запросы из одного event loop"""
+        async def scenario():
+            async with AsyncPetStoreClient(base_url, pool_size=10) as client:
+                await asyncio.gather(*(
+                    client.add_pet({"id": i, "name": f"Dog{i}", "photoUrls": []}) for i in range(50)
+                ))
+                responses = await asyncio.gather(*(client.get_pet_by_id(i) for i in range(50)))
+                return responses, client.session.connector.limit
+
+        responses, limit = asyncio.run(scenario())
+        assert limit == 10
+        assert all(response.status_code == 200 for response in responses)
+        assert [response.json()["id"] for response in responses] == list(range(50))
+
+    def test_iter_pets_by_status(self, base_url):
+        """Потоковый разбор findByStatus"""
+        async def scenario():
+            async with AsyncPetStoreClient(base_url) as client:
+                for pet_id in range(1, 6):
+                    await client.add_pet({"id": pet_id, "name": f"Dog{pet_id}", "status": "sold", "photoUrls": []})
+                return [pet.id async for pet in client.iter_pets_by_status("sold", chunk_size=16)]
+
+        assert asyncio.run(scenario()) == [1, 2, 3, 4, 5]
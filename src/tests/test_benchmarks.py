@@ -0,0 +1,43 @@
+"""
+Тесты набора бенчмарков: сравнение с базовой линией и запуск из командной строки
+"""
+import json
+import logging
+
+from src.benchmarks.__main__ import main
+from src.benchmarks.suite import client_group, compare
+
+
+def _run(**medians):
+    return {"results": {name: {"median_us": value} for name, value in medians.items()}}
+
+
+class TestBenchmarkSuite:
+    """Тесты для compare и python -m src.benchmarks"""
+
+    def test_compare_statuses(self):
+        rows = compare(_run(same=10.0, slow=14.0, fast=7.0, new=1.0), _run(same=9.0, slow=10.0, fast=10.0, gone=1.0),
+                       threshold=0.25)
+        assert {row.name: row.status for row in rows} == {
+            "same": "ok", "slow": "regression", "fast": "improvement", "new": "new", "gone": "missing"}
+        assert [row.name for row in compare(_run(same=1.0), _run(same=1.0, gone=1.0), include_missing=False)] == ["same"]
+
+    def test_cli_creates_baseline_then_compares(self, tmp_path, capsys):
+        args = ["--quick", "-k", "mock_api/get_pet_by_id", "--baseline", str(tmp_path / "baseline.json"),
+                "--output", str(tmp_path / "latest.json")]
+        assert main(args) == 0
+        baseline = json.loads((tmp_path / "baseline.json").read_text())
+        assert list(baseline["results"]) == ["mock_api/get_pet_by_id"]
+
+        baseline["results"]["mock_api/get_pet_by_id"]["median_us"] = 1e-6
+        (tmp_path / "baseline.json").write_text(json.dumps(baseline))
+        assert main(args) == 0
+        assert main(args + ["--fail-on-regression"]) == 1
+        assert "regression" in capsys.readouterr().out
+
+    def test_client_group_does_not_log_each_request(self, caplog):
+        caplog.set_level(logging.INFO)
+        names = []
+        client_group(lambda name, func: (names.append(name), func()))
+        assert "client/get_pet_by_id" in names
+        assert not [record for record in caplog.records if record.name == "src.utils.api_client"]
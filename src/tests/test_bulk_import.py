@@ -0,0 +1,97 @@
+"""
+Тесты массового импорта пользователей
+"""
+import json
+import logging
+import threading
+import time
+import pytest
+import requests
+from src.tools.bulk_import import main
+from src.utils.bulk_import import BulkUserImporter, iter_chunks
+from src.utils.data_factory import DataFactory
+
+
+USERS = DataFactory(seed=1, username_prefix="bulkuser")
+
+
+class FakeUserClient:
+    """Клиент, который отвечает заданными статусами и считает параллельные запросы"""
+
+    def __init__(self, statuses=None):
+        self.statuses = statuses or {}
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def create_users_with_list(self, users):
+        with self._lock:
+            self.calls.append(users[0]["username"])
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.002)
+        with self._lock:
+            self.in_flight -= 1
+            queue = self.statuses.get(users[0]["username"])
+            status = queue.pop(0) if queue else 200
+        if status is None:
+            raise requests.ConnectionError("reset")
+        response = requests.Response()
+        response.status_code = status
+        return response
+
+
+class TestBulkImport:
+    """Тесты для BulkUserImporter"""
+
+    def test_chunks_bounded_by_count_and_bytes(self):
+        users = list(USERS.users(1000))
+        by_count = list(iter_chunks(users, max_users=300, max_bytes=None))
+        assert [len(chunk) for chunk in by_count] == [300, 300, 300, 100]
+        by_bytes = list(iter_chunks(users, max_users=1000, max_bytes=4096))
+        assert all(len(json.dumps(chunk)) <= 4096 for chunk in by_bytes)
+        assert sum(len(chunk) for chunk in by_bytes) == 1000
+
+    def test_retries_only_failed_chunks(self):
+        client = FakeUserClient({"bulkuser10": [503, None], "bulkuser20": [400]})
+        importer = BulkUserImporter(client, chunk_size=10, max_retries=2, sleep=lambda seconds: None)
+        report = importer.run(USERS.users(50))
+        assert client.calls.count("bulkuser10") == 3
+        assert client.calls.count("bulkuser20") == 1
+        assert client.calls.count("bulkuser0") == 1
+        assert report.users == 40
+        assert report.retries == 2
+        assert [(r.first_username, r.status) for r in report.failed] == [("bulkuser20", 400)]
+
+    def test_bounded_in_flight(self):
+        client = FakeUserClient()
+        progress = []
+        importer = BulkUserImporter(client, chunk_size=5, max_in_flight=3, progress=progress.append)
+        report = importer.run(USERS.users(200))
+        assert 1 < client.peak <= 3
+        assert report.chunks == len(progress) == 40
+        assert report.throughput > 0
+
+    def test_import_jsonl_to_server(self, live_client, petstore_server, tmp_path):
+        path = tmp_path / "users.jsonl"
+        users = list(USERS.users(1500))
+        path.write_text("\n".join(json.dumps(user) for user in users) + "\n", encoding="utf-8")
+        report = BulkUserImporter(live_client, chunk_size=200, max_in_flight=4).import_file(str(path))
+        assert report.to_dict()["failed_chunks"] == 0
+        assert len(petstore_server.api.users) == 1500
+        assert live_client.get_user_by_username("bulkuser1499").parsed.lastName == users[-1]["lastName"]
+
+    def test_invalid_jsonl_line(self, tmp_path):
+        path = tmp_path / "users.jsonl"
+        path.write_text('{"username": "a"}\n{oops\n', encoding="utf-8")
+        with pytest.raises(ValueError, match=":2:"):
+            BulkUserImporter(FakeUserClient()).import_file(str(path))
+
+    def test_cli_does_not_log_each_request(self, petstore_server, caplog):
+        petstore_server.reset()
+        caplog.set_level(logging.INFO)
+        assert main(["--generate", "300", "--chunk-size", "50", "--base-url", petstore_server.base_url]) == 0
+        assert len(petstore_server.api.users) == 300
+        assert not [record for record in caplog.records if record.name == "src.utils.api_client"]
+        assert any(record.name == "src.utils.bulk_import" for record in caplog.records)
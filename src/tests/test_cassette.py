@@ -0,0 +1,81 @@
+"""
+Тесты записи и воспроизведения трафика PetStoreClient через кассеты
+"""
+import pytest
+from src.models.models import Pet
+from src.utils.api_client import PetStoreClient
+from src.utils.cassette import Cassette, CassetteMissError, CassetteReader, CassetteWriter, request_key
+from src.utils.compression import CompressionConfig
+from src.utils.mock_server import MockPetStoreServer
+
+OFFLINE_URL = "http://offline.invalid/v2"
+
+
+def _record(petstore_server, path, **client_options):
+    petstore_server.reset()
+    with Cassette(str(path), "record") as cassette:
+        client = PetStoreClient(petstore_server.base_url, cassette=cassette, **client_options)
+        client.add_pet({"id": 1, "name": "Rex", "photoUrls": [], "status": "available"})
+        first = client.get_pet_by_id(1).json()
+        client.update_pet({"id": 1, "name": "Max", "photoUrls": [], "status": "sold"})
+        second = client.get_pet_by_id(1).json()
+        client.get_pet_by_id(404)
+        client.find_pets_by_status("sold")
+        client.close()
+    return first, second
+
+
+class TestCassette:
+    """Тесты для Cassette и PetStoreClient(cassette=...)"""
+
+    def test_replay_without_server(self, petstore_server, tmp_path):
+        path = tmp_path / "traffic.cassette"
+        first, second = _record(petstore_server, path)
+
+        with Cassette(str(path)) as cassette:
+            client = PetStoreClient(OFFLINE_URL, cassette=cassette)
+            assert client.add_pet({"id": 1, "name": "Rex", "photoUrls": [], "status": "available"}).ok
+            # Одинаковые запросы получают ответы в порядке записи, после последнего повторяется последний
+            assert client.get_pet_by_id(1).json() == first
+            assert client.update_pet({"id": 1, "name": "Max", "photoUrls": [], "status": "sold"}).ok
+            assert client.get_pet_by_id(1).json() == second
+            assert client.get_pet_by_id(1).parsed == Pet(**second)
+            assert client.get_pet_by_id(404).status_code == 404
+            assert [pet.name for pet in client.iter_pets_by_status("sold")] == ["Max"]
+            with pytest.raises(CassetteMissError):
+                client.get_pet_by_id(2)
+            # Тело входит в ключ
+            with pytest.raises(CassetteMissError):
+                client.add_pet({"id": 1, "name": "Other", "photoUrls": []})
+
+    def test_compressed_traffic_is_stored_decoded(self, tmp_path):
+        path = tmp_path / "compressed.cassette"
+        with MockPetStoreServer(compress_min_size=0) as server:
+            _record(server, path, compression=CompressionConfig(min_size=0))
+        with Cassette(str(path)) as cassette:
+            client = PetStoreClient(OFFLINE_URL, cassette=cassette)
+            response = client.find_pets_by_status("sold")
+            assert "Content-Encoding" not in response.headers
+            assert [pet["name"] for pet in response.json()] == ["Max"]
+
+    def test_reader_without_index_scans_records(self, tmp_path):
+        path = str(tmp_path / "unfinished.cassette")
+        writer = CassetteWriter(path)
+        key = request_key("GET", "http://a/v2/pet/1")
+        writer.append(key, 200, {"Content-Type": "application/json"}, b'{"id": 1}')
+        writer.append(request_key("GET", "http://b/v2/pet/2"), 404, {}, b"")
+        writer._file.flush()
+
+        reader = CassetteReader(path)
+        assert len(reader) == 2
+        assert reader.lookup(request_key("GET", "https://other/v2/pet/1")) == (
+            200, {"Content-Type": "application/json"}, b'{"id": 1}')
+        assert reader.lookup(request_key("POST", "http://a/v2/pet/1")) is None
+        reader.close()
+        writer.close()
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "not-a-cassette"
+        path.write_bytes(b"{}")
+        with pytest.raises(ValueError):
+            Cassette(str(path))
@@ -0,0 +1,87 @@
+"""
+Тесты проверки ответов по спецификации Swagger PetStore
+"""
+import json
+
+import pytest
+from src.utils.api_client import PetStoreClient
+from src.utils.cache import ResponseCache
+from src.utils.contract import ContractValidator, ContractViolationError, SchemaCompiler, load_spec
+
+PET = {"id": 1, "category": {"id": 1, "name": "dogs"}, "name": "Rex", "photoUrls": ["x"],
+       "tags": [{"id": 1, "name": "t"}], "status": "sold"}
+
+
+def _body(value) -> bytes:
+    return json.dumps(value).encode()
+
+
+class TestContractValidator:
+    """Тесты для ContractValidator"""
+
+    @pytest.fixture
+    def validator(self):
+        return ContractValidator()
+
+    def test_valid_responses(self, validator):
+        assert validator.validate("GET", "/pet/{petId}", 200, _body(PET)) is None
+        assert validator.validate("GET", "/pet/findByStatus", 200, _body([PET, PET])) is None
+        assert validator.validate("GET", "/store/inventory", 200, _body({"sold": 1, "x": 2})) is None
+        # Описаны только ошибки - успешный ответ допустим; default допускает любой статус
+        assert validator.validate("POST", "/pet", 200, _body(PET)) is None
+        assert validator.validate("POST", "/user", 500, b"") is None
+        assert validator.summary() == {"checked": 5, "violations": 0, "by_operation": {}}
+
+    @pytest.mark.parametrize("route, status, body, message", [
+        ("/pet/{petId}", 200, {**PET, "tags": [{"id": "1"}]}, "body$.tags[0].id: expected integer, got string"),
+        ("/pet/{petId}", 200, {"name": "Rex"}, "body$: missing required property 'photoUrls'"),
+        ("/pet/{petId}", 200, {**PET, "status": "lost"}, "body$.status: 'lost' is not one of"),
+        ("/pet/{petId}", 200, {**PET, "id": 2 ** 63}, "out of int64 range"),
+        ("/pet/findByStatus", 200, PET, "body$: expected array, got object"),
+        ("/store/inventory", 200, {"sold": True}, "body$.sold: expected integer, got boolean"),
+        ("/pet/{petId}", 500, None, "undeclared status 500"),
+    ])
+    def test_violations(self, validator, route, status, body, message):
+        violation = validator.validate("GET", route, status, None if body is None else _body(body))
+        assert message in violation.message
+        assert validator.summary()["by_operation"] == {f"GET {route}": 1}
+
+    def test_unknown_operation_and_invalid_json(self, validator):
+        assert "not in the specification" in validator.validate("PATCH", "/pet", 200, b"").message
+        assert "not valid JSON" in validator.validate("GET", "/pet/{petId}", 200, b"<pet/>").message
+
+    def test_predicate_matches_detailed_check(self):
+        compiler = SchemaCompiler(load_spec()["definitions"])
+        schema = {"type": "array", "items": {"$ref": "#/definitions/Pet"}}
+        predicate, check = compiler.predicate(schema), compiler.compile(schema)
+        for value in ([PET], [], [{**PET, "category": None}], [{**PET, "photoUrls": "x"}], [{**PET, "id": True}],
+                      [{**PET, "tags": [{"name": 1}]}], {"a": 1}, [{**PET, "extra": object()}]):
+            assert predicate(value) is (check(value) is None)
+
+    def test_client_validates_every_response(self, live_client):
+        contract = ContractValidator(raise_errors=True)
+        client = PetStoreClient(live_client.base_url, contract=contract)
+        client.add_pet(PET)
+        client.get_pet_by_id(1)
+        client.get_pet_by_id(2)
+        assert [pet.name for pet in client.iter_pets_by_status("sold")] == ["Rex"]
+        client.get_inventory()
+        client.place_order({"id": 1, "petId": 1, "quantity": 1, "status": "placed"})
+        client.get_order_by_id(1)
+        client.create_users_with_list([{"username": "u1"}])
+        assert contract.summary()["violations"] == 0
+        # Эталонный PetStore (и мок) отдают на login объект вместо строки из спецификации
+        with pytest.raises(ContractViolationError, match="expected string, got object"):
+            client.user_login("u1", "secret")
+        client.close()
+
+    def test_cache_revalidation_is_not_a_violation(self, live_client):
+        contract = ContractValidator(raise_errors=True)
+        client = PetStoreClient(live_client.base_url, cache=ResponseCache(ttl=0), contract=contract)
+        client.add_pet(PET)
+        assert client.get_pet_by_id(1).json() == PET
+        # Запись устарела сразу (ttl=0): повторный GET уходит условным запросом и получает 304
+        assert client.get_pet_by_id(1).json() == PET
+        assert client.cache.revalidations == 1
+        assert contract.summary() == {"checked": 2, "violations": 0, "by_operation": {}}
+        client.close()
@@ -0,0 +1,61 @@
+"""
+Тесты генератора тестовых данных
+"""
+from collections import Counter
+from itertools import islice
+
+import pytest
+from src.models.models import Order, Pet, User
+from src.utils.data_factory import BLOCK_SIZE, DataFactory, to_models
+from src.utils.mock_api import MockPetStoreAPI
+
+
+class TestDataFactory:
+    """Тесты для DataFactory"""
+
+    def test_reproducible(self):
+        assert list(DataFactory(seed=7).pets(100)) == list(DataFactory(seed=7).pets(100))
+        assert list(DataFactory(seed=7).users(100)) != list(DataFactory(seed=8).users(100))
+
+    def test_independent_of_batching(self):
+        factory = DataFactory(seed=3)
+        orders = list(factory.orders(BLOCK_SIZE + 10))
+        assert list(factory.orders(20, start=BLOCK_SIZE - 10)) == orders[-20:]
+        batches = list(factory.order_batches(BLOCK_SIZE + 10, batch_size=1000))
+        assert [len(batch) for batch in batches] == [1000] * 4 + [BLOCK_SIZE + 10 - 4000]
+        assert [order for batch in batches for order in batch] == orders
+
+    def test_unique_ids_and_usernames(self):
+        factory = DataFactory(seed=1, id_start=5_000_000, username_prefix="w0_")
+        users = list(factory.users(10_000))
+        assert len({user["username"] for user in users}) == len({user["id"] for user in users}) == 10_000
+        assert users[0]["id"] == 5_000_000 and users[0]["username"] == "w0_0"
+        pets = list(islice(factory.pets(), 5000))
+        assert [pet["id"] for pet in pets] == list(range(5_000_000, 5_005_000))
+        assert all(len({tag["id"] for tag in pet["tags"]}) == len(pet["tags"]) for pet in pets)
+
+    def test_payloads_are_valid_models(self):
+        factory = DataFactory(seed=2, pet_id_range=(1, 100))
+        assert len(to_models(list(factory.pets(500)), Pet)) == 500
+        orders = to_models(list(factory.orders(500)), Order)
+        assert all(1 <= order.petId < 100 and order.complete == (order.status == "delivered") for order in orders)
+        assert len(to_models(list(factory.users(500)), User)) == 500
+
+    def test_status_distribution(self):
+        factory = DataFactory(seed=4, pet_statuses={"available": 0.7, "pending": 0.3, "sold": 0},
+                              order_statuses={"delivered": 1})
+        counts = Counter(pet["status"] for pet in factory.pets(20_000))
+        assert counts["sold"] == 0
+        assert 0.67 < counts["available"] / 20_000 < 0.73
+        assert {order["status"] for order in factory.orders(100)} == {"delivered"}
+        with pytest.raises(ValueError):
+            DataFactory(pet_statuses={"available": 0})
+
+    def test_streams_into_mock_store(self):
+        factory = DataFactory(seed=5, pet_statuses={"available": 3, "sold": 1})
+        api = MockPetStoreAPI()
+        api.load_pets(factory.pets(20_000))
+        api.load_users(factory.users(1000))
+        assert len(api.pets) == 20_000
+        assert api.inventory["available"] + api.inventory["sold"] == 20_000
+        assert api.get_user_by_username("user999").status_code == 200
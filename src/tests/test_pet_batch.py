@@ -0,0 +1,58 @@
+"""
+Тесты колоночного PetBatch
+"""
+import numpy as np
+from src.models.models import Pet
+from src.models.pet_batch import MISSING, PetBatch
+
+PETS = [
+    {"id": 1, "name": "A", "photoUrls": [], "status": "sold", "category": {"id": 2}, "tags": [{"id": 5}, {"id": 6}]},
+    {"id": 2, "name": "B", "photoUrls": [], "status": "custom"},
+    {"id": 1, "name": "A", "photoUrls": [], "status": "sold", "tags": [{"id": 7}]},
+    {"id": 3, "name": "C", "photoUrls": [], "tags": [{"id": 5}]},
+]
+
+
+class TestPetBatch:
+    """Тесты для PetBatch"""
+
+    def test_columns(self):
+        batch = PetBatch.from_pets(PETS[:3] + [Pet(**PETS[3])])
+        assert batch.ids.tolist() == [1, 2, 1, 3]
+        assert batch.category_ids.tolist() == [2, MISSING, MISSING, MISSING]
+        assert batch.tags(0).tolist() == [5, 6]
+        assert batch.status_of(1) == "custom"
+        assert batch.status_of(3) is None
+
+    def test_status_counts_and_inventory(self):
+        batch = PetBatch.from_pets(PETS)
+        assert batch.status_counts() == {"available": 0, "pending": 0, "sold": 2, "custom": 1}
+        assert batch.inventory_mismatches({"sold": 2, "pending": 1}) == {"pending": (1, 0), "custom": (0, 1)}
+
+    def test_dedup_and_sets(self):
+        batch = PetBatch.from_pets(PETS)
+        other = PetBatch.from_pets([{"id": 2}, {"id": 9}])
+        assert batch.duplicate_ids().tolist() == [1]
+        deduped = batch.dedup()
+        assert deduped.ids.tolist() == [1, 2, 3]
+        assert deduped.tag_ids.tolist() == [5, 6, 5]
+        assert batch.difference(other).tolist() == [1, 3]
+        assert batch.contains([3, 9]).tolist() == [True, False]
+        assert batch.with_tag(5).ids.tolist() == [1, 3]
+
+    def test_concat_merges_vocabularies(self):
+        first = PetBatch.from_pets(PETS)
+        second = PetBatch.from_pets([{"id": 9, "status": "pending", "tags": [{"id": 1}]}], statuses=("pending",))
+        merged = PetBatch.concat([first, second])
+        assert len(merged) == 5
+        assert merged.status_of(4) == "pending"
+        assert merged.status_of(3) is None
+        assert merged.tags(4).tolist() == [1]
+
+    def test_fetch_matches_inventory(self, live_client):
+        for pet_id in range(1, 31):
+            status = ("available", "pending", "sold")[pet_id % 3]
+            live_client.add_pet({"id": pet_id, "name": f"Dog{pet_id}", "status": status, "photoUrls": []})
+        batch = PetBatch.fetch(live_client)
+        assert np.array_equal(batch.unique_ids(), np.arange(1, 31))
+        assert batch.inventory_mismatches(live_client.get_inventory().parsed) == {}
@@ -0,0 +1,115 @@
+"""
+Тесты генератора нагрузки и гистограмм задержек
+"""
+import random
+import time
+import pytest
+from unittest.mock import Mock
+from src.tools.petstore_load import ArgumentFactory, EndpointMix, LoadGenerator, main
+from src.utils.histogram import LatencyHistogram
+
+
+class SlowClient:
+    """Клиент, который отвечает за фиксированное время"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = []
+
+    def get_pet_by_id(self, pet_id):
+        self.calls.append(pet_id)
+        time.sleep(self.delay)
+        response = Mock()
+        response.status_code = 200 if pet_id % 2 else 404
+        return response
+
+    def get_inventory(self):
+        raise ConnectionError("connection refused")
+
+
+class TestLatencyHistogram:
+    """Тесты LatencyHistogram"""
+
+    def test_percentiles_within_precision(self):
+        histogram = LatencyHistogram(significant_digits=2)
+        values = [random.randint(1, 5_000_000) for _ in range(20000)]
+        for value in values:
+            histogram.record_us(value)
+        values.sort()
+        for percent in (50, 90, 99):
+            exact = values[int(len(values) * percent / 100) - 1]
+            assert abs(histogram.percentile(percent) - exact) / exact < 0.01
+        assert histogram.max == values[-1]
+        assert histogram.count == len(values)
+
+    def test_small_values_are_exact(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 101):
+            histogram.record_us(value)
+        assert histogram.percentile(50) == 50
+        assert histogram.percentile(100) == 100
+
+    def test_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(0.001)
+        b.record(0.003)
+        a.merge(b)
+        assert a.count == 2
+        assert a.min == 1000
+        assert a.max == 3000
+
+
+class TestLoadGenerator:
+    """Тесты планировщика нагрузки"""
+
+    def test_parse_mix(self):
+        mix = EndpointMix.parse("get_pet_by_id=5, get_inventory")
+        assert mix.methods == ["get_pet_by_id", "get_inventory"]
+        assert mix.weights == [5.0, 1.0]
+
+    def test_unknown_method_rejected(self):
+        with pytest.raises(ValueError):
+            EndpointMix.parse("get_pet=1")
+        with pytest.raises(ValueError):
+            EndpointMix.parse("_request=1")
+
+    def test_arguments_for_every_endpoint(self):
+        args = ArgumentFactory(seed=1, id_range=(10, 20))
+        assert 10 <= args.args_for("get_pet_by_id")[0] <= 20
+        assert args.args_for("find_pets_by_status")[0] in ("available", "pending", "sold")
+        username, user = args.args_for("update_user")
+        assert user["username"] == username
+        assert args.args_for("get_inventory") == ()
+
+    def test_uniform_schedule(self):
+        generator = LoadGenerator(SlowClient(0), EndpointMix.parse("get_pet_by_id"), rate=100, duration=1)
+        offsets = list(generator.schedule())
+        assert len(offsets) == 100
+        assert offsets[1] - offsets[0] == pytest.approx(0.01)
+
+    def test_latency_includes_queueing(self):
+        """Задержка считается от запланированного момента, а не от фактической отправки"""
+        client = SlowClient(0.02)
+        generator = LoadGenerator(client, EndpointMix.parse("get_pet_by_id"), rate=200, duration=0.2,
+                                  max_workers=1, seed=1)
+        report = generator.run()
+        stats = report.stats["get_pet_by_id"]
+        assert report.scheduled == 40
+        assert report.completed == 40
+        assert stats.service_time.percentile(99) < 40_000
+        assert stats.latency.percentile(99) > 200_000
+
+    def test_errors_and_statuses(self):
+        client = SlowClient(0)
+        generator = LoadGenerator(client, EndpointMix.parse("get_pet_by_id,get_inventory"), rate=500,
+                                  duration=0.1, seed=3, error_status=400)
+        report = generator.run().to_dict()
+        inventory = report["endpoints"]["get_inventory"]
+        assert inventory["errors"] == inventory["requests"]
+        assert inventory["statuses"] == {"ConnectionError": inventory["requests"]}
+        pets = report["endpoints"]["get_pet_by_id"]
+        assert pets["errors"] == pets["statuses"].get("404", 0)
+
+    def test_cli_rejects_unknown_endpoint(self):
+        with pytest.raises(ValueError):
+            main(["--mix", "no_such_method=1", "--duration", "0"])
@@ -2,158 +2,13 @@
 Мок-тесты для PetStore API
 Работают без реального подключения к API
 """
+import copy
+import json
 import pytest
-from unittest.mock import Mock, patch
 import random
-
-
-class MockPetStoreAPI:
-    """Мок-класс для имитации PetStore API"""
-    
-    def __init__(self):
-        self.pets = {}
-        self.users = {}
-        self.orders = {}
-        self.inventory = {"available": 10, "pending": 5, "sold": 3}
-        self.next_id = 1
-    
-    def add_pet(self, pet_data):
-        """Добавление питомца"""
-        pet_id = pet_data.get("id", self.next_id)
-        self.next_id += 1
-        self.pets[pet_id] = pet_data
-        return self._create_response(200, pet_data)
-    
-    def get_pet(self, pet_id):
-        """Получение питомца по ID"""
-        if pet_id in self.pets:
-            return self._create_response(200, self.pets[pet_id])
-        else:
-            return self._create_response(404, {"code": 1, "type": "error", "message": "Pet not found"})
-    
-    def update_pet(self, pet_data):
-        """Обновление питомца"""
-        pet_id = pet_data["id"]
-        if pet_id in self.pets:
-            self.pets[pet_id] = pet_data
-            return self._create_response(200, pet_data)
-        else:
-            return self._create_response(404, {"code": 1, "type": "error", "message": "Pet not found"})
-    
-    def delete_pet(self, pet_id):
-        """Удаление питомца"""
-        if pet_id in self.pets:
-            del self.pets[pet_id]
-            return self._create_response(200, {"code": 200, "type": "unknown", "message": str(pet_id)})
-        else:
-            return self._create_response(404, {"code": 1, "type": "error", "message": "Pet not found"})
-    
-    def find_pets_by_status(self, status):
-        """Поиск питомцев по статусу"""
-        pets_with_status = [pet for pet in self.pets.values() if pet.get("status") == status]
-        return self._create_response(200, pets_with_status)
-    
-    def update_pet_with_form(self, pet_id, name=None, status=None):
-        """Обновление питомца через форму"""
-        if pet_id in self.pets:
-            if name:
-                self.pets[pet_id]["name"] = name
-            if status:
-                self.pets[pet_id]["status"] = status
-            return self._create_response(200, {"code": 200, "message": "success"})
-        else:
-            return self._create_response(404, {"code": 1, "type": "error", "message": "Pet not found"})
-    
-    def get_inventory(self):
-        """Получение инвентаря"""
-        return self._create_response(200, self.inventory)
-    
-    def place_order(self, order_data):
-        """Размещение заказа"""
-        order_id = order_data.get("id", self.next_id)
-        self.next_id += 1
-        self.orders[order_id] = order_data
-        return self._create_response(200, order_data)
-    
-    def get_order(self, order_id):
-        """Получение заказа по ID"""
-        if order_id in self.orders:
-            return self._create_response(200, self.orders[order_id])
-        else:
-            return self._create_response(404, {"code": 1, "type": "error", "message": "Order not found"})
-    
-    def delete_order(self, order_id):
-        """Удаление заказа"""
-        if order_id in self.orders:
-            del self.orders[order_id]
-            return self._create_response(200, {"code": 200, "type": "unknown", "message": str(order_id)})
-        else:
-            return self._create_response(404, {"code": 1, "type": "error", "message": "Order not found"})
-    
-    def create_user(self, user_data):
-        """Создание пользователя"""
-        username = user_data.get("username", f"user{self.next_id}")
-        self.next_id += 1
-        self.users[username] = user_data
-        return self._create_response(200, {"code": 200, "type": "unknown", "message": str(user_data.get("id", ""))})
-    
-    def get_user(self, username):
-        """Получение пользователя"""
-        if username in self.users:
-            return self._create_response(200, self.users[username])
-        else:
-            return self._create_response(404, {"code": 1, "type": "error", "message": "User not found"})
-    
-    def update_user(self, username, user_data):
-        """Обновление пользователя"""
-        if username in self.users:
-            self.users[username] = user_data
-            return self._create_response(200, {"code": 200, "type": "unknown", "message": str(user_data.get("id", ""))})
-        else:
-            return self._create_response(404, {"code": 1, "type": "error", "message": "User not found"})
-    
-    def delete_user(self, username):
-        """Удаление пользователя"""
-        if username in self.users:
-            del self.users[username]
-            return self._create_response(200, {"code": 200, "type": "unknown", "message": username})
-        else:
-            return self._create_response(404, {"code": 1, "type": "error", "message": "User not found"})
-    
-    def create_users_with_list(self, users_data):
-        """Создание пользователей из списка"""
-        for user in users_data:
-            username = user.get("username")
-            if username:
-                self.users[username] = user
-        return self._create_response(200, {"code": 200, "type": "unknown", "message": "ok"})
-    
-    def create_users_with_array(self, users_data):
-        """Создание пользователей из массива"""
-        for user in users_data:
-            username = user.get("username")
-            if username:
-                self.users[username] = user
-        return self._create_response(200, {"code": 200, "type": "unknown", "message": "ok"})
-    
-    def user_login(self, username, password):
-        """Логин пользователя"""
-        return self._create_response(200, {
-            "code": 200, 
-            "type": "unknown", 
-            "message": f"logged in session: {random.randint(1000000, 9999999)}"
-        })
-    
-    def user_logout(self):
-        """Логаут пользователя"""
-        return self._create_response(200, {"code": 200, "type": "unknown", "message": "ok"})
-    
-    def _create_response(self, status_code, json_data):
-        """Создание мок-ответа"""
-        response = Mock()
-        response.status_code = status_code
-        response.json = Mock(return_value=json_data)
-        return response
+from unittest.mock import patch
+from src.utils.allure_steps import ValidationSteps
+from src.utils.mock_api import MockPetStoreAPI, MockResponse
 
 
 class TestPetStoreMock:
@@ -185,7 +40,7 @@ class TestPetStoreMock:
         pet_data = {"id": 1, "name": "TestDog", "photoUrls": []}
         api.add_pet(pet_data)
         
-        response = api.get_pet(1)
+        response = api.get_pet_by_id(1)
         assert response.status_code == 200
         data = response.json()
         assert data["id"] == 1
@@ -208,13 +63,13 @@ class TestPetStoreMock:
         pet_data = {"id": 1, "name": "TestDog", "photoUrls": []}
         api.add_pet(pet_data)
         
-        response = api.get_pet(1)
+        response = api.get_pet_by_id(1)
         assert response.status_code == 200
         
         response = api.delete_pet(1)
         assert response.status_code == 200
         
-        response = api.get_pet(1)
+        response = api.get_pet_by_id(1)
         assert response.status_code == 404
     
     def test_find_pets_by_status(self, api):
@@ -237,7 +92,7 @@ class TestPetStoreMock:
         response = api.update_pet_with_form(1, name="UpdatedName", status="pending")
         assert response.status_code == 200
         
-        response = api.get_pet(1)
+        response = api.get_pet_by_id(1)
         data = response.json()
         assert data["name"] == "UpdatedName"
         assert data["status"] == "pending"
@@ -265,7 +120,7 @@ class TestPetStoreMock:
         response = api.place_order(order_data)
         assert response.status_code == 200
         
-        response = api.get_order(1)
+        response = api.get_order_by_id(1)
         assert response.status_code == 200
         data = response.json()
         assert data["id"] == 1
@@ -279,7 +134,7 @@ class TestPetStoreMock:
         response = api.delete_order(1)
         assert response.status_code == 200
         
-        response = api.get_order(1)
+        response = api.get_order_by_id(1)
         assert response.status_code == 404
     
     def test_create_and_get_user(self, api):
@@ -295,7 +150,7 @@ class TestPetStoreMock:
         response = api.create_user(user_data)
         assert response.status_code == 200
         
-        response = api.get_user("testuser")
+        response = api.get_user_by_username("testuser")
         assert response.status_code == 200
         data = response.json()
         assert data["username"] == "testuser"
@@ -310,7 +165,7 @@ class TestPetStoreMock:
         response = api.update_user("testuser", updated_data)
         assert response.status_code == 200
         
-        response = api.get_user("testuser")
+        response = api.get_user_by_username("testuser")
         data = response.json()
         assert data["firstName"] == "NewName"
         assert data["email"] == "new@example.com"
@@ -323,7 +178,7 @@ class TestPetStoreMock:
         response = api.delete_user("testuser")
         assert response.status_code == 200
         
-        response = api.get_user("testuser")
+        response = api.get_user_by_username("testuser")
         assert response.status_code == 404
     
     def test_create_users_with_list(self, api):
@@ -336,8 +191,8 @@ class TestPetStoreMock:
         response = api.create_users_with_list(users_data)
         assert response.status_code == 200
         
-        response1 = api.get_user("user1")
-        response2 = api.get_user("user2")
+        response1 = api.get_user_by_username("user1")
+        response2 = api.get_user_by_username("user2")
         assert response1.status_code == 200
         assert response2.status_code == 200
     
@@ -351,8 +206,8 @@ class TestPetStoreMock:
         response = api.create_users_with_array(users_data)
         assert response.status_code == 200
         
-        response1 = api.get_user("user3")
-        response2 = api.get_user("user4")
+        response1 = api.get_user_by_username("user3")
+        response2 = api.get_user_by_username("user4")
         assert response1.status_code == 200
         assert response2.status_code == 200
     
@@ -366,20 +221,237 @@ class TestPetStoreMock:
     
     def test_nonexistent_pet(self, api):
         """Тест получения несуществующего питомца"""
-        response = api.get_pet(999)
+        response = api.get_pet_by_id(999)
         assert response.status_code == 404
     
     def test_nonexistent_order(self, api):
         """Тест получения несуществующего заказа"""
-        response = api.get_order(999)
+        response = api.get_order_by_id(999)
         assert response.status_code == 404
     
     def test_nonexistent_user(self, api):
         """Тест получения несуществующего пользователя"""
-        response = api.get_user("nonexistent")
+        response = api.get_user_by_username("nonexistent")
         assert response.status_code == 404
 
 
+class TestMockStoreIndexes:
+    """Тесты индексов и инвентаря мок-хранилища"""
+    
+    @pytest.fixture
+    def api(self):
+        return MockPetStoreAPI()
+    
+    def _assert_consistent(self, api):
+        """Индексы совпадают с полным перебором"""
+        expected = {}
+        for pet in api.pets.values():
+            if pet.get("status") is not None:
+                expected[pet["status"]] = expected.get(pet["status"], 0) + 1
+        inventory = api.get_inventory().json()
+        for status in set(expected) | set(inventory):
+            assert inventory.get(status, 0) == expected.get(status, 0)
+            found = api.find_pets_by_status(status).json()
+            assert len(found) == expected.get(status, 0)
+            assert all(pet["status"] == status for pet in found)
+    
+    def test_inventory_is_live(self, api):
+        """Инвентарь отражает текущее состояние питомцев"""
+        assert api.get_inventory().json() == {"available": 0, "pending": 0, "sold": 0}
+        api.add_pet({"id": 1, "name": "Dog1", "status": "available", "photoUrls": []})
+        api.add_pet({"id": 2, "name": "Dog2", "status": "available", "photoUrls": []})
+        api.add_pet({"id": 3, "name": "Dog3", "status": "sold", "photoUrls": []})
+        assert api.get_inventory().json() == {"available": 2, "pending": 0, "sold": 1}
+        
+        api.update_pet_with_form(1, status="pending")
+        api.update_pet({"id": 2, "name": "Dog2", "status": "sold", "photoUrls": []})
+        api.delete_pet(3)
+        assert api.get_inventory().json() == {"available": 0, "pending": 1, "sold": 1}
+    
+    def test_custom_status(self, api):
+        """Нестандартные статусы появляются и исчезают из инвентаря"""
+        api.add_pet({"id": 1, "name": "Dog", "status": "quarantine", "photoUrls": []})
+        assert api.get_inventory().json()["quarantine"] == 1
+        api.delete_pet(1)
+        assert "quarantine" not in api.get_inventory().json()
+    
+    def test_readding_pet_replaces_index_entry(self, api):
+        """Повторное добавление с тем же ID не дублирует питомца в индексе"""
+        api.add_pet({"id": 1, "name": "Dog", "status": "available", "photoUrls": []})
+        api.add_pet({"id": 1, "name": "Dog", "status": "sold", "photoUrls": []})
+        assert api.find_pets_by_status("available").json() == []
+        assert len(api.find_pets_by_status("sold").json()) == 1
+        self._assert_consistent(api)
+    
+    def test_caller_mutation_does_not_break_index(self, api):
+        """Изменение переданного словаря после вызова не ломает индекс"""
+        pet_data = {"id": 1, "name": "Dog", "status": "available", "photoUrls": []}
+        api.add_pet(pet_data)
+        pet_data["status"] = "sold"
+        assert len(api.find_pets_by_status("available").json()) == 1
+        self._assert_consistent(api)
+    
+    def test_orders_by_pet_id(self, api):
+        """Индекс заказов по petId"""
+        api.place_order({"id": 1, "petId": 10, "quantity": 1})
+        api.place_order({"id": 2, "petId": 10, "quantity": 2})
+        api.place_order({"id": 3, "petId": 20, "quantity": 1})
+        assert [o["id"] for o in api.find_orders_by_pet_id(10).json()] == [1, 2]
+        
+        api.delete_order(1)
+        api.place_order({"id": 2, "petId": 20, "quantity": 2})
+        assert api.find_orders_by_pet_id(10).json() == []
+        assert [o["id"] for o in api.find_orders_by_pet_id(20).json()] == [3, 2]
+    
+    def test_large_store_stays_consistent(self, api):
+        """Индексы остаются корректными на большом наборе и случайных изменениях"""
+        statuses = ["available", "pending", "sold", None]
+        rng = random.Random(42)
+        api.load_pets(
+            {"id": i, "name": f"Pet{i}", "photoUrls": [], "status": statuses[i % 4]}
+            for i in range(100000)
+        )
+        for _ in range(2000):
+            pet_id = rng.randrange(100000)
+            action = rng.random()
+            if action < 0.4:
+                api.update_pet_with_form(pet_id, status=rng.choice(statuses[:3]))
+            elif action < 0.7:
+                api.delete_pet(pet_id)
+            else:
+                api.add_pet({"id": pet_id, "name": "New", "photoUrls": [], "status": rng.choice(statuses)})
+        self._assert_consistent(api)
+
+
+class TestMockStoreSnapshots:
+    """Тесты снимков состояния мок-хранилища"""
+    
+    def _state(self, api):
+        return (
+            {k: dict(v) for k, v in api.pets.items()},
+            {k: dict(v) for k, v in api.orders.items()},
+            {k: dict(v) for k, v in api.users.items()},
+            dict(api.inventory),
+            api.next_id,
+        )
+    
+    def test_rollback_restores_state(self):
+        api = MockPetStoreAPI.seeded(pets=50, users=20, orders=20, id_base=1)
+        before = self._state(api)
+        api.checkpoint()
+        
+        api.add_pet({"name": "NoId", "photoUrls": [], "status": "pending"})
+        api.update_pet_with_form(1, name="Renamed", status="sold")
+        api.update_pet({"id": 2, "name": "Updated", "photoUrls": [], "status": "sold"})
+        api.delete_pet(3)
+        api.delete_pet(3)
+        api.add_pet({"id": 4, "name": "Replaced", "photoUrls": [], "status": "quarantine"})
+        api.place_order({"id": 1, "petId": 999, "quantity": 5})
+        api.delete_order(2)
+        api.create_user({"username": "seeduser0", "firstName": "Changed"})
+        api.create_users_with_list([{"username": "newuser"}])
+        api.delete_user("seeduser1")
+        
+        assert api.pending_changes > 0
+        api.rollback()
+        assert self._state(api) == before
+        assert api.pending_changes == 0
+        assert [o["id"] for o in api.find_orders_by_pet_id(2).json()] == [2]
+        assert len(api.find_pets_by_status("sold").json()) == api.inventory["sold"]
+    
+    def test_rollback_without_checkpoint(self):
+        with pytest.raises(RuntimeError):
+            MockPetStoreAPI().rollback()
+    
+    def test_seeded_api_changes_are_isolated(self, seeded_store):
+        """Изменения в одной копии хранилища не видны в следующей"""
+        inventory = dict(seeded_store.inventory)
+        with seeded_store.fork() as api:
+            api.delete_pet(100000)
+            api.add_pet({"id": 1, "name": "TestDog", "photoUrls": [], "status": "available"})
+            api.create_user({"username": "seeduser0", "firstName": "Changed"})
+            assert api.get_pet_by_id(100000).status_code == 404
+        with seeded_store.fork() as api:
+            assert api.get_pet_by_id(100000).status_code == 200
+            assert api.get_pet_by_id(1).status_code == 404
+            assert api.get_user_by_username("seeduser0").json()["firstName"] == "Seed"
+            assert api.inventory == inventory
+            assert sum(api.get_inventory().json().values()) == len(api.pets)
+    
+    def test_response_mutation_does_not_leak(self, seeded_store):
+        """Ответы отдают данные хранилища только для чтения, копия меняется независимо"""
+        with seeded_store.fork() as api:
+            pet = api.get_pet_by_id(100000).json()
+            with pytest.raises(TypeError):
+                pet["name"] = "Mutated"
+            with pytest.raises(TypeError):
+                api.find_pets_by_status("available").json()[0].update(status="gone")
+            with pytest.raises(TypeError):
+                api.get_order_by_id(100000).json()["quantity"] = 99
+            with pytest.raises(TypeError):
+                del api.find_orders_by_pet_id(100000).json()[0]["status"]
+            with pytest.raises(TypeError):
+                api.get_user_by_username("seeduser0").json().setdefault("phone", "1")
+            tagged = {"id": 1, "name": "TestDog", "photoUrls": [], "tags": [{"id": 1, "name": "a"}], "status": "sold"}
+            with pytest.raises(TypeError):
+                api.add_pet(tagged).json()["tags"].append({"id": 2, "name": "b"})
+            tagged["tags"][0]["name"] = "changed"
+            assert api.get_pet_by_id(1).json()["tags"] == [{"id": 1, "name": "a"}]
+            
+            editable = copy.deepcopy(pet)
+            editable["name"] = "Mutated"
+            editable["photoUrls"].append("https://example.com/photo.jpg")
+            assert json.loads(api.get_pet_by_id(100000).text) == pet
+        assert seeded_store.get_pet_by_id(100000).json() == {
+            "id": 100000, "name": "SeedPet0", "photoUrls": [], "status": "available"}
+        assert seeded_store.orders[100000]["status"] == "placed"
+        assert seeded_store.get_order_by_id(100000).json()["quantity"] == 1
+        assert "phone" not in seeded_store.users["seeduser0"]
+        assert 1 not in seeded_store.pets
+    
+    def test_reads_do_not_copy(self):
+        """Чтение отдает сохраненный объект, копия делается только при записи"""
+        api = MockPetStoreAPI()
+        pet = {"id": 1, "name": "Dog", "status": "available", "photoUrls": []}
+        stored = api.add_pet(pet).json()
+        assert stored is not pet and stored == pet
+        assert api.get_pet_by_id(1).json() is stored
+        assert api.find_pets_by_status("available").json()[0] is stored
+        api.update_pet_with_form(1, name="Cat")
+        with pytest.raises(TypeError):
+            api.get_pet_by_id(1).json()["name"] = "Cow"
+        assert stored["name"] == "Dog"
+    
+    def test_seeded_store_contents(self, seeded_api):
+        assert len(seeded_api.pets) == 5000
+        assert seeded_api.get_user_by_username("seeduser0").status_code == 200
+        assert seeded_api.get_order_by_id(100000).json()["petId"] == 100000
+
+
+class TestMockResponse:
+    """Тесты легкого ответа мок-API"""
+    
+    def test_response_interface(self):
+        response = MockResponse(200, {"id": 1, "name": "TestDog"})
+        assert response.status_code == 200
+        assert response.ok
+        assert response.json() == {"id": 1, "name": "TestDog"}
+        assert json.loads(response.text) == {"id": 1, "name": "TestDog"}
+        assert response.content == response.text.encode("utf-8")
+        assert response.headers["Content-Type"] == "application/json"
+        assert response.elapsed.total_seconds() == 0
+    
+    def test_slots(self):
+        """Ответ не создает __dict__ на каждый вызов"""
+        response = MockResponse(404, {"message": "Pet not found"})
+        assert not response.ok
+        with pytest.raises(AttributeError):
+            response.unexpected = True
+    
+    def test_validation_steps_accept_response(self):
+        ValidationSteps.validate_status_code(MockPetStoreAPI().get_pet_by_id(1), 404)
+
+
 def test_with_patch():
     """Тест с использованием unittest.mock.patch"""
     with patch('requests.post') as mock_post:
@@ -0,0 +1,103 @@
+"""
+Сквозные тесты PetStoreClient против локального HTTP-сервера
+"""
+import pytest
+from src.utils.api_client import PetStoreClient
+from src.utils.mock_server import MockPetStoreServer
+
+
+class TestPetRoutes:
+    """Маршруты /pet"""
+
+    def test_add_and_get_pet(self, live_client):
+        pet_data = {"id": 1, "name": "TestDog", "photoUrls": ["https://example.com/photo.jpg"], "status": "available"}
+        response = live_client.add_pet(pet_data)
+        assert response.status_code == 200
+        assert response.json() == pet_data
+
+        response = live_client.get_pet_by_id(1)
+        assert response.status_code == 200
+        assert response.json()["name"] == "TestDog"
+
+    def test_update_and_delete_pet(self, live_client):
+        live_client.add_pet({"id": 1, "name": "OldName", "photoUrls": []})
+        response = live_client.update_pet({"id": 1, "name": "NewName", "photoUrls": [], "status": "sold"})
+        assert response.json()["name"] == "NewName"
+
+        assert live_client.delete_pet(1).status_code == 200
+        assert live_client.get_pet_by_id(1).status_code == 404
+        assert live_client.delete_pet(1).status_code == 404
+
+    def test_find_pets_by_status(self, live_client):
+        live_client.add_pet({"id": 1, "name": "Dog1", "status": "available", "photoUrls": []})
+        live_client.add_pet({"id": 2, "name": "Dog2", "status": "sold", "photoUrls": []})
+        live_client.add_pet({"id": 3, "name": "Dog3", "status": "available", "photoUrls": []})
+
+        pets = live_client.find_pets_by_status("available").json()
+        assert sorted(pet["id"] for pet in pets) == [1, 3]
+
+    def test_update_pet_with_form(self, live_client):
+        live_client.add_pet({"id": 1, "name": "Original", "status": "available", "photoUrls": []})
+        assert live_client.update_pet_with_form(1, name="UpdatedName", status="pending").status_code == 200
+
+        data = live_client.get_pet_by_id(1).json()
+        assert data["name"] == "UpdatedName"
+        assert data["status"] == "pending"
+
+    def test_invalid_pet_id(self, live_client):
+        assert live_client.get_pet_by_id("abc").status_code == 404
+
+    def test_invalid_body(self, live_client):
+        response = live_client._request("POST", "/pet", data="not json")
+        assert response.status_code == 400
+
+
+class TestStoreAndUserRoutes:
+    """Маршруты /store и /user"""
+
+    def test_order_workflow(self, live_client):
+        order_data = {"id": 1, "petId": 123, "quantity": 1, "status": "placed", "complete": True}
+        assert live_client.place_order(order_data).status_code == 200
+        assert live_client.get_order_by_id(1).json()["status"] == "placed"
+        assert live_client.delete_order(1).status_code == 200
+        assert live_client.get_order_by_id(1).status_code == 404
+
+    def test_inventory(self, live_client):
+        inventory = live_client.get_inventory().json()
+        assert {"available", "pending", "sold"} <= set(inventory)
+
+    def test_user_workflow(self, live_client):
+        assert live_client.create_user({"id": 1, "username": "testuser", "email": "test@example.com"}).status_code == 200
+        assert live_client.get_user_by_username("testuser").json()["email"] == "test@example.com"
+
+        live_client.update_user("testuser", {"username": "testuser", "email": "new@example.com"})
+        assert live_client.get_user_by_username("testuser").json()["email"] == "new@example.com"
+
+        assert live_client.delete_user("testuser").status_code == 200
+        assert live_client.get_user_by_username("testuser").status_code == 404
+
+    def test_create_users_and_login(self, live_client):
+        users = [{"username": "user1"}, {"username": "user2"}]
+        assert live_client.create_users_with_list(users).status_code == 200
+        assert live_client.create_users_with_array([{"username": "user3"}]).status_code == 200
+        for username in ("user1", "user2", "user3"):
+            assert live_client.get_user_by_username(username).status_code == 200
+
+        assert "logged in session" in live_client.user_login("user1", "password").json()["message"]
+        assert live_client.user_logout().json()["message"] == "ok"
+
+
+class TestServerLifecycle:
+    """Запуск и остановка сервера"""
+
+    def test_ephemeral_ports_do_not_clash(self):
+        with MockPetStoreServer() as first, MockPetStoreServer() as second:
+            assert first.port != second.port
+            PetStoreClient(first.base_url).add_pet({"id": 1, "name": "Dog", "photoUrls": []})
+            assert PetStoreClient(first.base_url).get_pet_by_id(1).status_code == 200
+            assert PetStoreClient(second.base_url).get_pet_by_id(1).status_code == 404
+
+    def test_concurrent_clients(self, petstore_server, live_client):
+        calls = [("add_pet", {"id": i, "name": f"Dog{i}", "photoUrls": []}) for i in range(50)]
+        assert all(r.status_code == 200 for r in live_client.run_many(calls, max_concurrency=10))
+        assert len(petstore_server.api.pets) == 50
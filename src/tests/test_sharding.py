@@ -0,0 +1,97 @@
+"""
+Тесты плагина шардирования и пространств ID воркеров
+"""
+import pytest
+from src.plugins.sharding import (
+    DurationStore, WorkerNamespace, assign_shards, hash_shards, worker_identity,
+)
+from src.plugins.timing_history import TimingHistory
+
+
+class TestWorkerNamespace:
+    """Тесты для WorkerNamespace"""
+
+    def test_ranges_are_disjoint(self):
+        namespaces = [WorkerNamespace(f"gw{i}", i, 4, id_base=1000, id_span=100) for i in range(4)]
+        allocated = [{ns.next_id() for _ in range(100)} for ns in namespaces]
+        assert sum(len(values) for values in allocated) == len(set().union(*allocated)) == 400
+        assert all(ns.owns(value) for ns, values in zip(namespaces, allocated) for value in values)
+        with pytest.raises(RuntimeError):
+            namespaces[0].next_id()
+
+    def test_usernames_are_unique_per_worker(self):
+        first, second = WorkerNamespace("gw0", 0, 2), WorkerNamespace("gw1", 1, 2)
+        assert first.username("testuser") == "testuser_gw0_0"
+        assert first.username("testuser") != second.username("testuser")
+
+    def test_fixture(self, ids, worker_namespace):
+        assert ids is worker_namespace
+        assert ids.owns(ids.next_id())
+
+    @pytest.mark.parametrize("environ, shard_id, shards, expected", [
+        ({}, None, None, ("main", 0, 1)),
+        ({"PYTEST_XDIST_WORKER": "gw2", "PYTEST_XDIST_WORKER_COUNT": "4"}, None, None, ("gw2", 2, 4)),
+        ({}, 1, 3, ("s1", 1, 3)),
+        ({"PYTEST_XDIST_WORKER": "gw1", "PYTEST_XDIST_WORKER_COUNT": "2"}, 1, 3, ("s1gw1", 3, 6)),
+    ])
+    def test_worker_identity(self, environ, shard_id, shards, expected):
+        assert worker_identity(shard_id, shards, environ) == expected
+
+
+class TestShardScheduling:
+    """Тесты LPT-раскладки и истории длительностей"""
+
+    def test_lpt_balances_load(self):
+        durations = {f"t{i}": float(d) for i, d in enumerate([8, 7, 6, 5, 4, 3, 2, 1])}
+        nodeids = sorted(durations)
+        assignment = assign_shards(nodeids, durations, 2)
+        loads = [sum(durations[n] for n, s in zip(nodeids, assignment) if s == shard) for shard in range(2)]
+        assert sorted(loads) == [18.0, 18.0]
+
+    def test_every_test_in_exactly_one_shard(self):
+        nodeids = [f"test_{i}" for i in range(25)]
+        assignment = assign_shards(nodeids, {}, 4)
+        assert sorted(set(assignment)) == [0, 1, 2, 3]
+        assert assignment == assign_shards(nodeids, {}, 4)
+
+    def test_durations_come_from_timing_history(self, tmp_path):
+        path = str(tmp_path / "timings.sqlite")
+        assert DurationStore(path).durations == {}
+        history = TimingHistory(path, window=3)
+        for seconds in (2.0, 4.0, 3.0, 9.0):
+            history.record({("test", "a"): seconds, ("test", "b"): 1.0, ("step", "s"): 5.0})
+        history.close()
+        store = DurationStore(path)
+        assert store.durations == {"a": 4.0, "b": 1.0}
+        assert store.default_duration() == 2.5
+
+    def _run_shards(self, pytester, *args):
+        names = []
+        for shard_id in range(3):
+            result = pytester.runpytest("-p", "no:cacheprovider", "-v", "--shards", "3", "--shard-id", str(shard_id),
+                                        *args)
+            names.append({line.split("::")[1].split()[0] for line in result.outlines if " PASSED" in line})
+        return names
+
+    def test_shards_split_the_run(self, pytester):
+        pytester.makeconftest('pytest_plugins = ["src.plugins.sharding"]')
+        pytester.makepyfile("\n".join(f"def test_{i}(): pass" for i in range(10)))
+        # Локальная история не влияет на состав частей: без общей базы раскладка по хешу nodeid
+        history = TimingHistory(str(pytester.path / ".pytest_timings.sqlite"))
+        history.record({("test", "test_shards_split_the_run.py::test_0"): 100.0})
+        history.close()
+        names = self._run_shards(pytester)
+        nodeids = [f"test_shards_split_the_run.py::test_{i}" for i in range(10)]
+        expected = [{nodeid.split("::")[1] for nodeid, shard in zip(nodeids, hash_shards(nodeids, 3)) if shard == k}
+                    for k in range(3)]
+        assert names == expected
+        assert set().union(*names) == {f"test_{i}" for i in range(10)}
+
+        shared = TimingHistory(str(pytester.path / "shared.sqlite"))
+        shared.record({("test", nodeid): 1.0 for nodeid in nodeids})
+        shared.close()
+        names = self._run_shards(pytester, "--shard-durations", "shared.sqlite")
+        assert sorted(len(shard) for shard in names) == [3, 3, 4]
+        assert set().union(*names) == {f"test_{i}" for i in range(10)}
+        result = pytester.runpytest("--shards", "3", "--shard-id", "0", "--shard-durations", "missing.sqlite")
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
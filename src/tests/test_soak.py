@@ -0,0 +1,85 @@
+"""
+Тесты длительного прогона и поиска утечек
+"""
+import json
+import random
+
+from src.tools.petstore_load import EndpointMix, LoadGenerator
+from src.tools.soak import ResourceSampler, SoakTest, detect_growth, main
+from src.utils.api_client import PetStoreClient
+
+
+class LeakySampler(ResourceSampler):
+    """Сэмплер, к показателям которого добавлен заведомо растущий список"""
+
+    def __init__(self, client):
+        super().__init__(client, trace=False, count_objects=False)
+        self.leaked = []
+
+    def sample(self):
+        self.leaked.append(bytearray(1024))
+        return {**super().sample(), "leaked_blocks": len(self.leaked)}
+
+
+class TestDetectGrowth:
+    """Тесты detect_growth"""
+
+    def test_monotonic_growth_is_flagged(self):
+        times = list(range(40))
+        values = [1000 + 50 * t + random.randint(-40, 40) for t in times]
+        growth = detect_growth("rss_bytes", times, values, threshold=500)
+        assert growth.flagged
+        assert 150_000 < growth.per_hour < 210_000
+
+    def test_plateau_and_noise_are_not_flagged(self):
+        times = list(range(40))
+        plateau = [100 if t < 12 else 200 for t in times]
+        assert not detect_growth("cache_entries", times, plateau).flagged
+        noise = [1000 + random.randint(-100, 100) for _ in times]
+        assert not detect_growth("open_fds", times, noise, threshold=300).flagged
+        # Рост меньше порога - шум
+        assert not detect_growth("open_fds", times, [t // 10 for t in times], threshold=4).flagged
+        assert detect_growth("open_fds", times[:7], times[:7]) is None
+
+
+class TestSoakTest:
+    """Тесты SoakTest на локальном сервере"""
+
+    def _generator(self, client, duration):
+        mix = EndpointMix.parse("get_pet_by_id=3,add_pet=1,get_inventory=1")
+        return LoadGenerator(client, mix, rate=300, duration=duration, max_workers=8, seed=1)
+
+    def test_client_stays_flat(self, live_client):
+        sampler = ResourceSampler(live_client, count_objects=False)
+        try:
+            report = SoakTest(self._generator(live_client, 1.5), sampler, interval=0.05, warmup=0.7).run()
+        finally:
+            sampler.close()
+        assert report.load.completed == report.load.scheduled
+        assert len(report.samples) >= 20
+        assert report.samples[-1]["pool_opened"] <= live_client.pool_config.pool_maxsize
+        # Простаивающие соединения ограничены pool_maxsize, занятые - числом потоков генератора
+        assert max(sample["pool_connections"] for sample in report.samples) <= live_client.pool_config.pool_maxsize + 8
+        assert report.samples[-1]["request_log_records"] == 100
+        for metric in ("pool_connections", "request_log_records", "metric_series", "open_fds"):
+            assert not report.growth[metric].flagged
+        assert "pool_connections" in report.format()
+
+    def test_growth_fails_the_run(self, live_client):
+        soak = SoakTest(self._generator(live_client, 0.5), LeakySampler(live_client), interval=0.02,
+                        thresholds={"leaked_blocks": 5})
+        report = soak.run()
+        assert report.leaks == ["leaked_blocks"]
+        assert report.to_dict()["growth"]["leaked_blocks"]["flagged"]
+
+    def test_cli_writes_samples_and_report(self, petstore_server, tmp_path):
+        petstore_server.reset()
+        samples, report = tmp_path / "samples.jsonl", tmp_path / "soak.json"
+        code = main(["--base-url", petstore_server.base_url, "--rate", "100", "--duration", "0.5",
+                     "--interval", "0.05", "--warmup", "0", "--no-tracemalloc", "--seed", "3",
+                     "--cache", "16", "--samples", str(samples), "--json", str(report)])
+        data = json.loads(report.read_text())
+        lines = [json.loads(line) for line in samples.read_text().splitlines()]
+        assert lines == data["samples"]
+        assert code == (1 if data["leaks"] else 0)
+        assert all(sample["cache_entries"] <= 16 for sample in lines)
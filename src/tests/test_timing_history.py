@@ -0,0 +1,69 @@
+"""
+Тесты плагина истории длительностей
+"""
+import pytest
+from src.plugins.timing_history import TimingHistory, find_regressions
+
+TEST_FILE = """
+import os
+import time
+from src.utils.allure_steps import ValidationSteps
+
+
+def test_flow():
+    time.sleep(float(os.environ.get("FLOW_DELAY", "0")))
+    ValidationSteps.validate_response_is_list([])
+"""
+
+
+class TestTimingHistory:
+    """Тесты для TimingHistory и поиска регрессий"""
+
+    @pytest.fixture
+    def history(self, tmp_path):
+        history = TimingHistory(str(tmp_path / "timings.sqlite"), window=3)
+        yield history
+        history.close()
+
+    def test_rolling_window(self, history):
+        for seconds in (1.0, 2.0, 3.0, 4.0, 5.0):
+            history.record({("test", "a"): seconds, ("step", "s"): seconds / 10})
+        assert history.baselines("test", ["a", "missing"]) == {"a": [3.0, 4.0, 5.0], "missing": []}
+        assert history._db.execute("SELECT COUNT(*) FROM runs").fetchone() == (3,)
+
+    def test_regression_thresholds(self, history):
+        for _ in range(3):
+            history.record({("test", "a"): 1.0, ("test", "fast"): 0.001})
+        current = {("test", "a"): 1.6, ("test", "fast"): 0.01, ("test", "new"): 9.0}
+        regressions = find_regressions(current, history, threshold=0.5, min_delta=0.05, min_samples=3)
+        assert [(r.name, r.baseline) for r in regressions] == [("a", 1.0)]
+        assert find_regressions(current, history, threshold=0.5, min_delta=0.05, min_samples=4) == []
+
+
+class TestTimingGate:
+    """Тесты контроля регрессий в прогоне pytest"""
+
+    @pytest.fixture
+    def project(self, pytester):
+        pytester.makeconftest('pytest_plugins = ["src.plugins.timing_history"]')
+        pytester.makepyfile(test_flow=TEST_FILE)
+        for _ in range(3):
+            pytester.runpytest("--timing-min-samples", "3").assert_outcomes(passed=1)
+        return pytester
+
+    def test_fail_gate(self, project, monkeypatch):
+        monkeypatch.setenv("FLOW_DELAY", "0.1")
+        result = project.runpytest("--timing-min-samples", "3", "--timing-gate", "fail")
+        result.assert_outcomes(passed=1)
+        assert result.ret == pytest.ExitCode.TESTS_FAILED
+        result.stdout.fnmatch_lines(["*timing regressions (fail)*", "test test_flow.py::test_flow: *"])
+
+    def test_warn_gate_and_steps(self, project, monkeypatch):
+        monkeypatch.setenv("FLOW_DELAY", "0.1")
+        result = project.runpytest("--timing-min-samples", "3")
+        assert result.ret == pytest.ExitCode.OK
+        result.stdout.fnmatch_lines(["*timing regressions (warn)*"])
+        history = TimingHistory(str(project.path / ".pytest_timings.sqlite"))
+        assert len(history.baselines("step", ["ValidationSteps.validate_response_is_list"])
+                   ["ValidationSteps.validate_response_is_list"]) == 4
+        history.close()
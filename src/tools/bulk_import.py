@@ -0,0 +1,68 @@
+"""
+Массовое создание пользователей PetStore (petstore-bulk-import)
+
+Запуск:
+    python -m src.tools.bulk_import users.jsonl --base-url http://localhost:8080/v2 --in-flight 8
+    python -m src.tools.bulk_import --generate 200000 --prefix loaduser
+
+Пользователи читаются из JSONL лениво (или генерируются на лету) и отправляются
+кусками через createWithList; прогресс и пропускная способность пишутся в stderr.
+"""
+import argparse
+import json
+import logging
+import sys
+from typing import List, Optional
+
+from src.utils.api_client import PetStoreClient
+from src.utils.bulk_import import BulkUserImporter, IMPORT_METHODS, iter_jsonl
+from src.utils.data_factory import DataFactory
+from src.utils.request_log import RequestLog
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="petstore-bulk-import", description="Chunked bulk user import")
+    parser.add_argument("path", nargs="?", help="JSONL file with one user per line")
+    parser.add_argument("--generate", type=int, default=None, help="Generate this many users instead of a file")
+    parser.add_argument("--prefix", default="bulkuser", help="Username prefix for generated users")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated users")
+    parser.add_argument("--base-url", default="https://petstore.swagger.io/v2")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Max users per request")
+    parser.add_argument("--max-chunk-bytes", type=int, default=1024 * 1024, help="Max request body size")
+    parser.add_argument("--in-flight", type=int, default=4, help="Max concurrent chunk uploads")
+    parser.add_argument("--retries", type=int, default=2, help="Retries per failed chunk")
+    parser.add_argument("--method", choices=IMPORT_METHODS, default="create_users_with_list")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write report as JSON to this file")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    options = parser.parse_args(argv)
+    if (options.path is None) == (options.generate is None):
+        parser.error("pass either a JSONL path or --generate")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", stream=sys.stderr)
+    # Каждый запрос в лог не пишем, только прогресс импорта
+    client = PetStoreClient(options.base_url, request_log=RequestLog(sample_rate=0))
+    importer = BulkUserImporter(
+        client,
+        chunk_size=options.chunk_size,
+        max_chunk_bytes=options.max_chunk_bytes,
+        max_in_flight=options.in_flight,
+        max_retries=options.retries,
+        method=options.method,
+    )
+    if options.path:
+        users = iter_jsonl(options.path)
+    else:
+        users = DataFactory(options.seed, username_prefix=options.prefix).users(options.generate)
+    report = importer.run(users)
+    print(report.format())
+    if options.json_path:
+        with open(options.json_path, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    return 0 if not report.failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
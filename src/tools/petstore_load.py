@@ -0,0 +1,330 @@
+"""
+Генератор нагрузки на PetStore API (petstore-load)
+
+Запуск:
+    python -m src.tools.petstore_load --base-url http://localhost:8080/v2 --rate 200 --duration 30
+        --mix get_pet_by_id=5,find_pets_by_status=2,get_inventory=1
+
+Нагрузка открытого типа: моменты отправки запросов расписаны заранее по целевой
+интенсивности и не зависят от того, как быстро отвечает сервер. Задержка считается
+от запланированного момента отправки, поэтому ожидание в очереди клиента тоже
+попадает в перцентили (без coordinated omission).
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple, Callable, Iterator, Optional
+
+from src.utils.api_client import PetStoreClient
+from src.utils.contract import ContractValidator
+from src.utils.histogram import LatencyHistogram
+
+PET_STATUSES = ("available", "pending", "sold")
+ORDER_STATUSES = ("placed", "approved", "delivered")
+
+
+class ArgumentFactory:
+    """Аргументы для вызовов методов PetStoreClient под нагрузкой"""
+
+    def __init__(self, seed: Optional[int] = None, id_range: Tuple[int, int] = (1, 1000),
+                 username_prefix: str = "loaduser"):
+        self.random = random.Random(seed)
+        self.id_range = id_range
+        self.username_prefix = username_prefix
+
+    def _id(self) -> int:
+        return self.random.randint(*self.id_range)
+
+    def _username(self) -> str:
+        return f"{self.username_prefix}{self._id()}"
+
+    def _pet(self) -> Dict[str, Any]:
+        pet_id = self._id()
+        return {
+            "id": pet_id,
+            "name": f"LoadPet{pet_id}",
+            "photoUrls": [],
+            "status": self.random.choice(PET_STATUSES),
+        }
+
+    def _order(self) -> Dict[str, Any]:
+        return {
+            "id": self._id(),
+            "petId": self._id(),
+            "quantity": 1,
+            "status": self.random.choice(ORDER_STATUSES),
+            "complete": False,
+        }
+
+    def _user(self) -> Dict[str, Any]:
+        username = self._username()
+        return {"username": username, "firstName": "Load", "email": f"{username}@example.com"}
+
+    def args_for(self, method: str) -> tuple:
+        if method in ("get_pet_by_id", "delete_pet"):
+            return (self._id(),)
+        if method in ("add_pet", "update_pet"):
+            return (self._pet(),)
+        if method == "find_pets_by_status":
+            return (self.random.choice(PET_STATUSES),)
+        if method == "update_pet_with_form":
+            return (self._id(), None, self.random.choice(PET_STATUSES))
+        if method == "place_order":
+            return (self._order(),)
+        if method in ("get_order_by_id", "delete_order"):
+            return (self._id(),)
+        if method == "create_user":
+            return (self._user(),)
+        if method in ("create_users_with_list", "create_users_with_array"):
+            return ([self._user() for _ in range(10)],)
+        if method in ("get_user_by_username", "delete_user"):
+            return (self._username(),)
+        if method == "update_user":
+            user = self._user()
+            return (user["username"], user)
+        if method == "user_login":
+            return (self._username(), "password")
+        return ()
+
+
+class EndpointMix:
+    """Взвешенный набор методов PetStoreClient"""
+
+    def __init__(self, weights: Dict[str, float]):
+        if not weights:
+            raise ValueError("Endpoint mix is empty")
+        for method, weight in weights.items():
+            if method.startswith("_") or not callable(getattr(PetStoreClient, method, None)):
+                raise ValueError(f"Unknown PetStoreClient method: {method}")
+            if weight <= 0:
+                raise ValueError(f"Weight for {method} must be positive")
+        self.methods = list(weights)
+        self.weights = [weights[m] for m in self.methods]
+
+    @classmethod
+    def parse(cls, spec: str) -> "EndpointMix":
+        """Разобрать строку вида ``get_pet_by_id=5,get_inventory=1``"""
+        weights = {}
+        for part in spec.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            method, _, weight = part.partition("=")
+            weights[method.strip()] = float(weight) if weight else 1.0
+        return cls(weights)
+
+    def choose(self, rng: random.Random) -> str:
+        return rng.choices(self.methods, self.weights)[0]
+
+
+class EndpointStats:
+    """Статистика по одному методу"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.statuses: Dict[str, int] = {}
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, service_time: float, status: str, error: bool):
+        self.latency.record(latency)
+        self.service_time.record(service_time)
+        with self._lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if error:
+                self.errors += 1
+
+
+class LoadReport:
+    """Итоги прогона нагрузки"""
+
+    def __init__(self, stats: Dict[str, EndpointStats], elapsed: float, scheduled: int, target_rate: float):
+        self.stats = stats
+        self.elapsed = elapsed
+        self.scheduled = scheduled
+        self.target_rate = target_rate
+
+    @property
+    def completed(self) -> int:
+        return sum(s.latency.count for s in self.stats.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(s.errors for s in self.stats.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        endpoints = {}
+        for method, s in sorted(self.stats.items()):
+            count = s.latency.count
+            endpoints[method] = {
+                "requests": count,
+                "errors": s.errors,
+                "error_rate": s.errors / count if count else 0.0,
+                "throughput_rps": count / self.elapsed if self.elapsed else 0.0,
+                "statuses": dict(s.statuses),
+                "latency": s.latency.to_dict(),
+                "service_time": s.service_time.to_dict(),
+            }
+        return {
+            "target_rate_rps": self.target_rate,
+            "scheduled": self.scheduled,
+            "completed": self.completed,
+            "errors": self.errors,
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_rps": self.completed / self.elapsed if self.elapsed else 0.0,
+            "endpoints": endpoints,
+        }
+
+    def format(self) -> str:
+        lines = [
+            f"Target rate: {self.target_rate:.1f} req/s, scheduled: {self.scheduled}, "
+            f"completed: {self.completed}, elapsed: {self.elapsed:.2f}s, "
+            f"throughput: {self.completed / self.elapsed if self.elapsed else 0.0:.1f} req/s",
+            f"{'endpoint':<26}{'count':>8}{'err%':>8}{'rps':>9}"
+            f"{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'p99.9 ms':>10}{'max ms':>10}",
+        ]
+        for method, s in sorted(self.stats.items()):
+            h = s.latency
+            count = h.count
+            p = h.percentiles((50, 90, 99, 99.9))
+            lines.append(
+                f"{method:<26}{count:>8}{(100.0 * s.errors / count if count else 0.0):>8.2f}"
+                f"{(count / self.elapsed if self.elapsed else 0.0):>9.1f}"
+                + "".join(f"{p[q] / 1000:>10.2f}" for q in (50, 90, 99, 99.9))
+                + f"{(h.max or 0) / 1000:>10.2f}"
+            )
+        return "\n".join(lines)
+
+
+class LoadGenerator:
+    """Планировщик нагрузки открытого типа поверх PetStoreClient.
+
+    Запросы отправляются в пул потоков в заранее расписанные моменты времени
+    (равномерно или по Пуассону). Если сервер тормозит, запросы копятся в очереди пула,
+    а не откладываются - предложенная нагрузка остается целевой.
+    """
+
+    def __init__(self, client: PetStoreClient, mix: EndpointMix, rate: float, duration: float,
+                 max_workers: int = 64, arrival: str = "uniform", seed: Optional[int] = None,
+                 args: Optional[ArgumentFactory] = None, error_status: int = 500,
+                 clock: Callable[[], float] = time.perf_counter):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if arrival not in ("uniform", "poisson"):
+            raise ValueError("arrival must be 'uniform' or 'poisson'")
+        self.client = client
+        self.mix = mix
+        self.rate = rate
+        self.duration = duration
+        self.max_workers = max_workers
+        self.arrival = arrival
+        self.random = random.Random(seed)
+        self.args = args or ArgumentFactory(seed)
+        self.error_status = error_status
+        self.clock = clock
+        self.stats: Dict[str, EndpointStats] = {m: EndpointStats() for m in mix.methods}
+
+    def schedule(self) -> Iterator[float]:
+        """Смещения моментов отправки от начала прогона, в секундах"""
+        t = 0.0
+        n = 0
+        while True:
+            if self.arrival == "poisson":
+                t += self.random.expovariate(self.rate)
+            else:
+                t = n / self.rate
+            if t >= self.duration:
+                return
+            n += 1
+            yield t
+
+    def _execute(self, method: str, args: tuple, intended: float):
+        started = self.clock()
+        try:
+            response = getattr(self.client, method)(*args)
+            status = str(response.status_code)
+            error = response.status_code >= self.error_status
+        except Exception as exc:
+            status = type(exc).__name__
+            error = True
+        finished = self.clock()
+        self.stats[method].record(finished - intended, finished - started, status, error)
+
+    def run(self) -> LoadReport:
+        scheduled = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            start = self.clock()
+            for offset in self.schedule():
+                scheduled += 1
+                intended = start + offset
+                delay = intended - self.clock()
+                if delay > 0:
+                    time.sleep(delay)
+                method = self.mix.choose(self.random)
+                executor.submit(self._execute, method, self.args.args_for(method), intended)
+        elapsed = self.clock() - start
+        return LoadReport(self.stats, elapsed, scheduled, self.rate)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="petstore-load", description="Open-loop load generator for PetStore API")
+    parser.add_argument("--base-url", default="https://petstore.swagger.io/v2")
+    parser.add_argument("--mix", default="get_pet_by_id=5,find_pets_by_status=2,get_inventory=1",
+                        help="Weighted PetStoreClient methods, e.g. get_pet_by_id=5,add_pet=1")
+    parser.add_argument("--rate", type=float, default=50.0, help="Target request rate, req/s")
+    parser.add_argument("--duration", type=float, default=10.0, help="Run duration, seconds")
+    parser.add_argument("--workers", type=int, default=64, help="Max concurrent requests")
+    parser.add_argument("--arrival", choices=("uniform", "poisson"), default="uniform")
+    parser.add_argument("--id-range", default="1:1000", help="Pet/order/user id range, min:max")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--error-status", type=int, default=500,
+                        help="Responses with status >= this value are counted as errors")
+    parser.add_argument("--validate-contract", action="store_true",
+                        help="Check every response against the vendored Swagger spec")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write report as JSON to this file")
+    parser.add_argument("--metrics-json", default=None, help="Write client request metrics as JSON to this file")
+    parser.add_argument("--metrics-prom", default=None,
+                        help="Write client request metrics in Prometheus text format to this file")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    options = build_parser().parse_args(argv)
+    id_min, _, id_max = options.id_range.partition(":")
+    contract = ContractValidator() if options.validate_contract else None
+    client = PetStoreClient(options.base_url, contract=contract)
+    generator = LoadGenerator(
+        client,
+        EndpointMix.parse(options.mix),
+        rate=options.rate,
+        duration=options.duration,
+        max_workers=options.workers,
+        arrival=options.arrival,
+        seed=options.seed,
+        args=ArgumentFactory(options.seed, (int(id_min), int(id_max))),
+        error_status=options.error_status,
+    )
+    report = generator.run()
+    print(report.format())
+    if contract is not None:
+        summary = contract.summary()
+        print(f"contract: {summary['checked']} responses checked, {summary['violations']} violations")
+        for operation, count in sorted(summary["by_operation"].items()):
+            print(f"  {operation}: {count}")
+    if options.json_path:
+        with open(options.json_path, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    if options.metrics_json:
+        client.metrics.write_json(options.metrics_json)
+    if options.metrics_prom:
+        client.metrics.write_prometheus(options.metrics_prom)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
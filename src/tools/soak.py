@@ -0,0 +1,370 @@
+"""
+Длительный прогон PetStoreClient с контролем утечек памяти и соединений (petstore-soak)
+
+Запуск:
+    python -m src.tools.soak --base-url http://localhost:8080/v2 --rate 50 --duration 14400
+        --interval 60 --warmup 600 --json soak.json
+
+Нагрузка - тот же открытый генератор, что и в petstore-load, на одном клиенте (и одной
+Session) на весь прогон. Раз в ``--interval`` секунд снимаются показатели процесса и
+клиента: память под tracemalloc, RSS, открытые дескрипторы, соединения в пуле, размер
+журнала запросов, кеша и число серий метрик. После прогрева каждая серия делится на
+окна; если медианы окон растут от окна к окну и прирост больше порога, серия
+считается утечкой и команда завершается с кодом 1.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from statistics import median
+from typing import Dict, Any, List, Optional, Callable, TextIO
+
+from src.tools.petstore_load import ArgumentFactory, EndpointMix, LoadGenerator, LoadReport
+from src.utils.api_client import PetStoreClient
+from src.utils.cache import ResponseCache
+
+# Минимальный прирост между первым и последним окном, ниже которого рост считается шумом
+GROWTH_THRESHOLDS: Dict[str, float] = {
+    "traced_bytes": 1 << 20,
+    "rss_bytes": 8 << 20,
+    "open_fds": 4,
+    "pool_connections": 2,
+    "pool_in_use": 2,
+    "request_log_records": 1,
+    "cache_entries": 1,
+    "metric_series": 1,
+    "gc_objects": 5000,
+}
+
+
+def rss_bytes() -> Optional[int]:
+    """Текущий RSS процесса; без /proc - пиковый RSS из getrusage"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def open_fds() -> Optional[int]:
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+
+def pooled_connections(client: PetStoreClient) -> int:
+    """Соединения, которые лежат в пулах urllib3 сессии клиента (без выданных в работу)"""
+    count = 0
+    for adapter in set(client.session.adapters.values()):
+        adapter = getattr(adapter, "inner", adapter)
+        manager = getattr(adapter, "poolmanager", None)
+        if manager is None:
+            continue
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            if pool is not None and pool.pool is not None:
+                # Очередь пула заполнена None-заглушками до maxsize
+                count += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+    return count
+
+
+class ResourceSampler:
+    """Снимки показателей процесса и PetStoreClient.
+
+    ``trace=True`` включает tracemalloc (если он еще не запущен) и сохраняет базовый
+    снимок в ``mark_baseline()`` - по нему ``top_growth()`` показывает строки кода,
+    на которых выросло больше всего памяти.
+    """
+
+    def __init__(self, client: PetStoreClient, trace: bool = True, frames: int = 1, count_objects: bool = True):
+        self.client = client
+        self.trace = trace
+        self.count_objects = count_objects
+        self._started_tracing = False
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self._started_tracing = True
+
+    def sample(self) -> Dict[str, Optional[float]]:
+        client = self.client
+        pool = client.pool_stats()
+        values: Dict[str, Optional[float]] = {
+            "traced_bytes": tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None,
+            "rss_bytes": rss_bytes(),
+            "open_fds": open_fds(),
+            "pool_connections": pooled_connections(client) + pool["in_use"],
+            "pool_in_use": pool["in_use"],
+            "pool_opened": pool["opened"],
+            "pool_discarded": pool["discarded"],
+            "request_log_records": len(client.request_log),
+            "cache_entries": len(client.cache) if isinstance(client.cache, ResponseCache) else None,
+            "metric_series": client.metrics.series_count(),
+            "gc_objects": len(gc.get_objects()) if self.count_objects else None,
+        }
+        return values
+
+    def mark_baseline(self):
+        if tracemalloc.is_tracing():
+            self._baseline = tracemalloc.take_snapshot()
+
+    def top_growth(self, limit: int = 10) -> List[str]:
+        """Строки кода с наибольшим приростом памяти с момента ``mark_baseline()``"""
+        if self._baseline is None or not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot()
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen *>")]
+        stats = snapshot.filter_traces(filters).compare_to(self._baseline.filter_traces(filters), "lineno")
+        return [str(stat) for stat in stats[:limit] if stat.size_diff > 0]
+
+    def close(self):
+        self._baseline = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+class Growth:
+    """Результат проверки одной серии на монотонный рост"""
+
+    def __init__(self, metric: str, windows: List[float], per_hour: float, flagged: bool):
+        self.metric = metric
+        self.windows = windows
+        self.per_hour = per_hour
+        self.flagged = flagged
+
+    @property
+    def delta(self) -> float:
+        return self.windows[-1] - self.windows[0] if self.windows else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"windows": self.windows, "delta": self.delta, "per_hour": self.per_hour, "flagged": self.flagged}
+
+
+def _slope(times: List[float], values: List[float]) -> float:
+    """Наклон прямой по МНК, единиц в секунду"""
+    n = len(times)
+    mean_t = sum(times) / n
+    mean_v = sum(values) / n
+    var = sum((t - mean_t) ** 2 for t in times)
+    if not var:
+        return 0.0
+    return sum((t - mean_t) * (v - mean_v) for t, v in zip(times, values)) / var
+
+
+def detect_growth(metric: str, times: List[float], values: List[float], threshold: float = 0.0,
+                  windows: int = 4) -> Optional[Growth]:
+    """Проверить серию на рост: медианы ``windows`` окон строго возрастают и прирост > ``threshold``.
+
+    Разовый скачок с выходом на плато (заполнился кеш, открылись соединения) не
+    считается утечкой - последнее окно должно быть выше предыдущего. Для серии
+    короче двух точек на окно возвращается None.
+    """
+    if len(values) < windows * 2:
+        return None
+    size = len(values) / windows
+    medians = [float(median(values[int(i * size):int((i + 1) * size)])) for i in range(windows)]
+    rising = all(later > earlier for earlier, later in zip(medians, medians[1:]))
+    per_hour = _slope(times, values) * 3600
+    return Growth(metric, medians, per_hour, rising and medians[-1] - medians[0] > threshold)
+
+
+class SoakReport:
+    """Итоги длительного прогона: нагрузка, снимки показателей и найденный рост"""
+
+    def __init__(self, load: LoadReport, samples: List[Dict[str, Any]], growth: Dict[str, Growth],
+                 warmup: float, top_growth: List[str]):
+        self.load = load
+        self.samples = samples
+        self.growth = growth
+        self.warmup = warmup
+        self.top_growth = top_growth
+
+    @property
+    def leaks(self) -> List[str]:
+        return sorted(metric for metric, growth in self.growth.items() if growth.flagged)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "load": self.load.to_dict(),
+            "warmup_s": self.warmup,
+            "samples": self.samples,
+            "growth": {metric: growth.to_dict() for metric, growth in sorted(self.growth.items())},
+            "leaks": self.leaks,
+            "top_growth": self.top_growth,
+        }
+
+    def format(self) -> str:
+        lines = [self.load.format(), "", f"resources: {len(self.samples)} samples, warmup {self.warmup:g}s"]
+        lines.append(f"{'metric':<22}{'first':>14}{'last':>14}{'per hour':>14}")
+        for metric, growth in sorted(self.growth.items()):
+            mark = "  GROWING" if growth.flagged else ""
+            lines.append(f"{metric:<22}{growth.windows[0]:>14.0f}{growth.windows[-1]:>14.0f}"
+                         f"{growth.per_hour:>14.1f}{mark}")
+        if self.top_growth:
+            lines.append("")
+            lines.append("top allocations since warmup:")
+            lines.extend(f"  {line}" for line in self.top_growth)
+        return "\n".join(lines)
+
+
+class SoakTest:
+    """Длительная нагрузка на один PetStoreClient с периодическими снимками ресурсов.
+
+    ``LoadGenerator`` работает в фоновом потоке, основной поток каждые ``interval``
+    секунд вызывает ``sampler.sample()``. Снимки за первые ``warmup`` секунд в анализ
+    роста не входят. ``on_sample`` получает каждый снимок сразу - например, чтобы
+    дописывать его в файл и не потерять данные, если прогон оборвется.
+    """
+
+    def __init__(self, generator: LoadGenerator, sampler: ResourceSampler, interval: float = 60.0,
+                 warmup: float = 0.0, windows: int = 4, thresholds: Optional[Dict[str, float]] = None,
+                 on_sample: Optional[Callable[[Dict[str, Any]], None]] = None, top: int = 10,
+                 clock: Callable[[], float] = time.monotonic):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.generator = generator
+        self.sampler = sampler
+        self.interval = interval
+        self.warmup = warmup
+        self.windows = windows
+        self.thresholds = GROWTH_THRESHOLDS if thresholds is None else thresholds
+        self.on_sample = on_sample
+        self.top = top
+        self.clock = clock
+        self.samples: List[Dict[str, Any]] = []
+
+    def _record(self, elapsed: float):
+        sample = {"elapsed_s": round(elapsed, 3), **self.sampler.sample()}
+        self.samples.append(sample)
+        if self.on_sample is not None:
+            self.on_sample(sample)
+
+    def run(self) -> SoakReport:
+        result: Dict[str, Any] = {}
+        done = threading.Event()
+
+        def load():
+            try:
+                result["report"] = self.generator.run()
+            except BaseException as exc:
+                result["error"] = exc
+            finally:
+                done.set()
+
+        thread = threading.Thread(target=load, name="soak-load", daemon=True)
+        start = self.clock()
+        baseline_marked = self.warmup <= 0
+        if baseline_marked:
+            self.sampler.mark_baseline()
+        thread.start()
+        self._record(0.0)
+        next_sample = start + self.interval
+        while not done.wait(max(0.0, next_sample - self.clock())):
+            elapsed = self.clock() - start
+            if not baseline_marked and elapsed >= self.warmup:
+                self.sampler.mark_baseline()
+                baseline_marked = True
+            self._record(elapsed)
+            next_sample += self.interval
+        thread.join()
+        self._record(self.clock() - start)
+        if "error" in result:
+            raise result["error"]
+        top_growth = self.sampler.top_growth(self.top) if baseline_marked else []
+        return SoakReport(result["report"], self.samples, self.analyse(), self.warmup, top_growth)
+
+    def analyse(self) -> Dict[str, Growth]:
+        """Проверить на рост все серии снимков после прогрева"""
+        measured = [sample for sample in self.samples if sample["elapsed_s"] >= self.warmup]
+        growth: Dict[str, Growth] = {}
+        for metric, threshold in self.thresholds.items():
+            points = [(sample["elapsed_s"], sample[metric]) for sample in measured
+                      if sample.get(metric) is not None]
+            found = detect_growth(metric, [t for t, _ in points], [v for _, v in points], threshold, self.windows)
+            if found is not None:
+                growth[metric] = found
+        return growth
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="petstore-soak",
+                                     description="Long-running PetStore load with memory and connection leak checks")
+    parser.add_argument("--base-url", default="https://petstore.swagger.io/v2")
+    parser.add_argument("--mix", default="get_pet_by_id=5,find_pets_by_status=2,get_inventory=1,add_pet=1",
+                        help="Weighted PetStoreClient methods, e.g. get_pet_by_id=5,add_pet=1")
+    parser.add_argument("--rate", type=float, default=20.0, help="Target request rate, req/s")
+    parser.add_argument("--duration", type=float, default=3600.0, help="Run duration, seconds")
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between resource samples")
+    parser.add_argument("--warmup", type=float, default=300.0,
+                        help="Samples taken earlier than this are not used for growth detection")
+    parser.add_argument("--windows", type=int, default=4, help="Number of windows compared for monotonic growth")
+    parser.add_argument("--workers", type=int, default=16, help="Max concurrent requests")
+    parser.add_argument("--id-range", default="1:1000", help="Pet/order/user id range, min:max")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--cache", type=int, default=0, metavar="SIZE",
+                        help="Give the client a ResponseCache of this size to check it stays bounded")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Do not trace Python allocations")
+    parser.add_argument("--tracemalloc-frames", type=int, default=1)
+    parser.add_argument("--top", type=int, default=10, help="Show this many allocation sites that grew the most")
+    parser.add_argument("--samples", dest="samples_path", default=None,
+                        help="Append every sample as a JSON line to this file while running")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write report as JSON to this file")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    options = build_parser().parse_args(argv)
+    id_min, _, id_max = options.id_range.partition(":")
+    cache = ResponseCache(max_size=options.cache) if options.cache else None
+    client = PetStoreClient(options.base_url, cache=cache)
+    generator = LoadGenerator(
+        client,
+        EndpointMix.parse(options.mix),
+        rate=options.rate,
+        duration=options.duration,
+        max_workers=options.workers,
+        seed=options.seed,
+        args=ArgumentFactory(options.seed, (int(id_min), int(id_max))),
+    )
+    sampler = ResourceSampler(client, trace=not options.no_tracemalloc, frames=options.tracemalloc_frames)
+    samples_file: Optional[TextIO] = open(options.samples_path, "a", encoding="utf-8") if options.samples_path else None
+
+    def write_sample(sample: Dict[str, Any]):
+        samples_file.write(json.dumps(sample) + "\n")
+        samples_file.flush()
+
+    try:
+        soak = SoakTest(generator, sampler, interval=options.interval, warmup=options.warmup,
+                        windows=options.windows, on_sample=write_sample if samples_file else None, top=options.top)
+        report = soak.run()
+    finally:
+        sampler.close()
+        client.close()
+        if samples_file is not None:
+            samples_file.close()
+    print(report.format())
+    if options.json_path:
+        with open(options.json_path, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    if report.leaks:
+        print(f"growing: {', '.join(report.leaks)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
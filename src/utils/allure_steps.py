@@ -1,132 +1,172 @@
 import allure
-from typing import Dict, Any, List
+import functools
+import inspect
+import time
+from typing import Dict, Any, List, Callable, Optional, Tuple
+
+from src.utils.api_client import PetStoreClient
+
+# Получатели длительности шагов (имя шага, секунды); подключает плагин timing_history
+step_timers: List[Callable[[str, float], None]] = []
+
+
+class StepRecord:
+    """Шаг, записанный в ленивом режиме: все нужное, чтобы потом построить шаг Allure"""
+
+    __slots__ = ("func", "title", "args", "kwargs", "start", "stop", "result", "error")
+
+    def __init__(self, func, title: str, args: Tuple, kwargs: Dict[str, Any], start: float):
+        self.func = func
+        self.title = title
+        self.args = args
+        self.kwargs = kwargs
+        self.start = start
+        self.stop = start
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class StepRecorder:
+    """Режим записи шагов.
+
+    Пока ``buffer`` равен None, шаги сразу уходят в ``allure.step``. Плагин
+    allure_recording в ленивом режиме ставит на время теста пустой список:
+    шаг тогда только запоминает функцию, аргументы, время и результат, без
+    форматирования заголовка и объектов Allure.
+    """
+
+    def __init__(self):
+        self.buffer: Optional[List[StepRecord]] = None
+
+
+recorder = StepRecorder()
+
+
+def step(title: str):
+    """allure.step с ленивым режимом записи и отчетом длительности в ``step_timers``"""
+    def decorator(func):
+        stepped = allure.step(title)(func)
+        name = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            buffer = recorder.buffer
+            if buffer is None and not step_timers:
+                return stepped(*args, **kwargs)
+            record = StepRecord(func, title, args, kwargs, time.time()) if buffer is not None else None
+            started = time.perf_counter()
+            try:
+                if record is None:
+                    return stepped(*args, **kwargs)
+                record.result = func(*args, **kwargs)
+                return record.result
+            except BaseException as exc:
+                if record is not None:
+                    record.error = exc
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                if record is not None:
+                    record.stop = record.start + elapsed
+                    buffer.append(record)
+                for timer in step_timers:
+                    timer(name, elapsed)
+
+        return wrapper
+
+    return decorator
+
+
+# Заголовки шагов по методам PetStoreClient; шаги генерируются из методов клиента,
+# поэтому имена шагов всегда совпадают с именами методов
+STEP_TITLES = {
+    "add_pet": "Добавить питомца",
+    "get_pet_by_id": "Получить питомца по ID: {pet_id}",
+    "update_pet": "Обновить питомца",
+    "delete_pet": "Удалить питомца по ID: {pet_id}",
+    "find_pets_by_status": "Найти питомцев по статусу: {status}",
+    "update_pet_with_form": "Обновить питомца через форму (ID: {pet_id}, имя: {name}, статус: {status})",
+    "get_inventory": "Получить инвентарь магазина",
+    "place_order": "Разместить заказ",
+    "get_order_by_id": "Получить заказ по ID: {order_id}",
+    "delete_order": "Удалить заказ по ID: {order_id}",
+    "create_user": "Создать пользователя",
+    "create_users_with_list": "Создать пользователей из списка",
+    "create_users_with_array": "Создать пользователей из массива",
+    "get_user_by_username": "Получить пользователя по имени: {username}",
+    "update_user": "Обновить пользователя: {username}",
+    "delete_user": "Удалить пользователя: {username}",
+    "user_login": "Логин пользователя: {username}",
+    "user_logout": "Логаут пользователя",
+}
+
+# Публичные методы клиента, которые не являются вызовами API
+NOT_STEPS = frozenset({"close", "pool_stats", "run_many", "iter_pets_by_status"})
+
+
+def client_api_methods() -> List[str]:
+    return [name for name, _ in inspect.getmembers(PetStoreClient, inspect.isfunction)
+            if not name.startswith("_") and name not in NOT_STEPS]
+
+
+def _client_step(name: str, title: str):
+    signature = inspect.signature(getattr(PetStoreClient, name))
+    parameters = list(signature.parameters.values())[1:]
+
+    def call(api_client, *args, **kwargs):
+        return getattr(api_client, name)(*args, **kwargs)
+
+    call.__name__ = name
+    call.__qualname__ = f"PetStoreSteps.{name}"
+    call.__doc__ = title
+    # Сигнатура метода клиента нужна Allure для подстановки параметров в заголовок
+    call.__signature__ = signature.replace(parameters=[
+        inspect.Parameter("api_client", inspect.Parameter.POSITIONAL_OR_KEYWORD)] + parameters)
+    return staticmethod(step(title)(call))
 
 
 class PetStoreSteps:
-    """Allure шаги для PetStore API"""
-    
-    @staticmethod
-    @allure.step("Добавить питомца")
-    def add_pet(api_client, pet_data: Dict[str, Any]):
-        return api_client.add_pet(pet_data)
-    
-    @staticmethod
-    @allure.step("Получить питомца по ID: {pet_id}")
-    def get_pet(api_client, pet_id: int):
-        return api_client.get_pet(pet_id)
-    
-    @staticmethod
-    @allure.step("Обновить питомца")
-    def update_pet(api_client, pet_data: Dict[str, Any]):
-        return api_client.update_pet(pet_data)
-    
-    @staticmethod
-    @allure.step("Удалить питомца по ID: {pet_id}")
-    def delete_pet(api_client, pet_id: int):
-        return api_client.delete_pet(pet_id)
-    
-    @staticmethod
-    @allure.step("Найти питомцев по статусу: {status}")
-    def find_pets_by_status(api_client, status: str):
-        return api_client.find_pets_by_status(status)
-    
-    @staticmethod
-    @allure.step("Обновить питомца через форму (ID: {pet_id}, имя: {name}, статус: {status})")
-    def update_pet_with_form(api_client, pet_id: int, name: str = None, status: str = None):
-        return api_client.update_pet_with_form(pet_id, name, status)
-    
-    @staticmethod
-    @allure.step("Получить инвентарь магазина")
-    def get_inventory(api_client):
-        return api_client.get_inventory()
-    
-    @staticmethod
-    @allure.step("Разместить заказ")
-    def place_order(api_client, order_data: Dict[str, Any]):
-        return api_client.place_order(order_data)
-    
-    @staticmethod
-    @allure.step("Получить заказ по ID: {order_id}")
-    def get_order(api_client, order_id: int):
-        return api_client.get_order(order_id)
-    
-    @staticmethod
-    @allure.step("Удалить заказ по ID: {order_id}")
-    def delete_order(api_client, order_id: int):
-        return api_client.delete_order(order_id)
-    
-    @staticmethod
-    @allure.step("Создать пользователя")
-    def create_user(api_client, user_data: Dict[str, Any]):
-        return api_client.create_user(user_data)
-    
-    @staticmethod
-    @allure.step("Получить пользователя по имени: {username}")
-    def get_user(api_client, username: str):
-        return api_client.get_user(username)
-    
-    @staticmethod
-    @allure.step("Обновить пользователя: {username}")
-    def update_user(api_client, username: str, user_data: Dict[str, Any]):
-        return api_client.update_user(username, user_data)
-    
-    @staticmethod
-    @allure.step("Удалить пользователя: {username}")
-    def delete_user(api_client, username: str):
-        return api_client.delete_user(username)
-    
-    @staticmethod
-    @allure.step("Создать пользователей из списка")
-    def create_users_with_list(api_client, users_data: List[Dict[str, Any]]):
-        return api_client.create_users_with_list(users_data)
-    
-    @staticmethod
-    @allure.step("Создать пользователей из массива")
-    def create_users_with_array(api_client, users_data: List[Dict[str, Any]]):
-        return api_client.create_users_with_array(users_data)
-    
-    @staticmethod
-    @allure.step("Логин пользователя: {username}")
-    def user_login(api_client, username: str, password: str):
-        return api_client.user_login(username, password)
-    
-    @staticmethod
-    @allure.step("Логаут пользователя")
-    def user_logout(api_client):
-        return api_client.user_logout()
+    """Allure шаги для PetStore API: по шагу на каждый метод PetStoreClient"""
+
+
+_unknown = set(STEP_TITLES) - set(client_api_methods())
+if _unknown:
+    raise RuntimeError(f"STEP_TITLES refers to missing PetStoreClient methods: {sorted(_unknown)}")
+for _name in client_api_methods():
+    setattr(PetStoreSteps, _name, _client_step(_name, STEP_TITLES.get(_name, _name)))
 
 
 class ValidationSteps:
     """Allure шаги для валидации"""
     
     @staticmethod
-    @allure.step("Проверить статус код: {expected_status}")
+    @step("Проверить статус код: {expected_status}")
     def validate_status_code(response, expected_status: int):
         assert response.status_code == expected_status, \
             f"Expected status {expected_status}, but got {response.status_code}"
     
     @staticmethod
-    @allure.step("Проверить что ответ содержит поле: {field}")
+    @step("Проверить что ответ содержит поле: {field}")
     def validate_response_contains_field(response_data, field: str):
         assert field in response_data, f"Response doesn't contain field: {field}"
     
     @staticmethod
-    @allure.step("Проверить значение поля: {field} = {expected_value}")
+    @step("Проверить значение поля: {field} = {expected_value}")
     def validate_field_value(response_data, field: str, expected_value):
         assert response_data[field] == expected_value, \
             f"Field {field} expected to be {expected_value}, but got {response_data[field]}"
     
     @staticmethod
-    @allure.step("Проверить что ответ является списком")
+    @step("Проверить что ответ является списком")
     def validate_response_is_list(response_data):
         assert isinstance(response_data, list), "Response should be a list"
     
     @staticmethod
-    @allure.step("Проверить что ответ является словарем")
+    @step("Проверить что ответ является словарем")
     def validate_response_is_dict(response_data):
         assert isinstance(response_data, dict), "Response should be a dictionary"
     
     @staticmethod
-    @allure.step("Проверить что список не пустой")
+    @step("Проверить что список не пустой")
     def validate_list_not_empty(response_data):
         assert len(response_data) > 0, "List should not be empty"
\ No newline at end of file
@@ -1,84 +1,287 @@
+import json
 import requests
 import logging
-from typing import Optional, Dict, Any, List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional, Dict, Any, List, Callable, Iterable, Iterator, Tuple, Union
+
+from src.models.models import Pet, Order, User, ApiResponse
+from src.utils.cache import ResponseCache
+from src.utils.cassette import Cassette
+from src.utils.compression import CompressionConfig
+from src.utils.contract import ContractValidator
+from src.utils.metrics import RequestMetrics
+from src.utils.pool import PoolConfig, PoolMetrics, InstrumentedHTTPAdapter
+from src.utils.request_log import RequestLog, redact_url
+from src.utils.responses import PetStoreResponse
+from src.utils.retry import RequestPolicy
+from src.utils.routes import route_template
+from src.utils.streaming import iter_response_items
 
 logger = logging.getLogger(__name__)
 
+Call = Union[Callable[[], Any], Tuple]
+
+
+PET_TAGS = ("pets", "inventory")
+
+
+def _request_size(response: requests.Response) -> int:
+    request = getattr(response, "request", None)
+    body = getattr(request, "body", None)
+    return len(body) if isinstance(body, (bytes, str)) else 0
+
+
+def _response_size(response: requests.Response) -> int:
+    length = response.headers.get("Content-Length")
+    if length is not None and length.isdigit():
+        return int(length)
+    content = getattr(response, "_content", None)
+    return len(content) if isinstance(content, bytes) else 0
+
 
 class PetStoreClient:
-    def __init__(self, base_url: str = "https://petstore.swagger.io/v2"):
+    def __init__(self, base_url: str = "https://petstore.swagger.io/v2", cache: Optional[ResponseCache] = None,
+                 policy: Optional[RequestPolicy] = None, pool: Optional[PoolConfig] = None,
+                 metrics: Optional[RequestMetrics] = None, request_log: Optional[RequestLog] = None,
+                 validate_models: bool = True, compression: Optional[CompressionConfig] = None,
+                 cassette: Optional[Cassette] = None, contract: Optional[ContractValidator] = None):
         self.base_url = base_url
+        self.validate_models = validate_models
+        self.compression = compression
+        self.cassette = cassette
+        self.contract = contract
+        self.cache = cache
+        self.policy = policy
+        self.metrics = metrics or RequestMetrics()
+        self.request_log = request_log if request_log is not None else RequestLog(log=logger)
+        self.pool_config = pool or PoolConfig()
+        self.pool_metrics = PoolMetrics()
         self.session = requests.Session()
+        adapter = InstrumentedHTTPAdapter(self.pool_config, self.pool_metrics)
+        if cassette is not None:
+            adapter = cassette.adapter(adapter)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.session.headers.update({
             "Content-Type": "application/json",
             "Accept": "application/json"
         })
+        if not self.pool_config.keep_alive:
+            self.session.headers["Connection"] = "close"
+        if compression is not None:
+            self.session.headers["Accept-Encoding"] = compression.accept_encoding
 
-    def _request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+    def close(self):
+        """Закрыть Session и пул потоков хеджирования политики"""
+        self.session.close()
+        if self.policy is not None:
+            self.policy.close()
+
+    def __enter__(self) -> "PetStoreClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Метрики пула соединений: открыто, переиспользовано, ожидание свободного соединения"""
+        return self.pool_metrics.to_dict()
+
+    def _request(self, method: str, endpoint: str, cache_tags: Optional[Tuple[str, ...]] = None,
+                 invalidates: Tuple[str, ...] = (), model: Any = None, compress: bool = False,
+                 **kwargs) -> PetStoreResponse:
+        """Выполнить запрос к API.
+
+        ``cache_tags`` помечает идемпотентный GET как кешируемый (если клиенту передан кеш),
+        ``invalidates`` - теги ресурсов, которые сбрасываются после изменяющего запроса,
+        ``model`` - тип, в который ``response.parsed`` разбирает тело ответа,
+        ``compress`` разрешает сжать JSON-тело (если клиенту передан CompressionConfig).
+        """
+        if compress and self.compression is not None and "json" in kwargs:
+            self._encode_json(kwargs)
+        if self.cache is not None and cache_tags is not None:
+            return self._cached_request(method, endpoint, cache_tags, model, **kwargs)
+
+        response = self._send(method, endpoint, model, **kwargs)
+        if self.cache is not None and invalidates:
+            self.cache.invalidate(*invalidates)
+        return response
+
+    def _encode_json(self, kwargs: Dict[str, Any]):
+        # Кодируем так же, как requests для json=, и сжимаем, если тело больше порога
+        body = json.dumps(kwargs.pop("json"), allow_nan=False).encode("utf-8")
+        kwargs["data"], headers = self.compression.encode(body)
+        if headers:
+            kwargs["headers"] = {**kwargs.get("headers", {}), **headers}
+
+    def _cached_request(self, method: str, endpoint: str, cache_tags: Tuple[str, ...], model: Any,
+                        **kwargs) -> PetStoreResponse:
+        entry = self.cache.lookup(endpoint)
+        if entry is not None:
+            if self.cache.is_fresh(entry):
+                return entry.response
+            kwargs["headers"] = {**kwargs.get("headers", {}), **ResponseCache.conditional_headers(entry)}
+
+        response = self._send(method, endpoint, model, **kwargs)
+        if entry is not None and response.status_code == 304:
+            return self.cache.revalidated(entry)
+        if response.status_code == 200:
+            self.cache.store(endpoint, response, cache_tags)
+        return response
+
+    def _send(self, method: str, endpoint: str, model: Any = None, **kwargs) -> PetStoreResponse:
         url = f"{self.base_url}{endpoint}"
-        logger.info(f"Making {method} request to {url}")
+        route = route_template(endpoint)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Making %s request to %s", method, redact_url(url))
         
-        response = self.session.request(method, url, **kwargs)
-        logger.info(f"Response status: {response.status_code}")
+        started = time.perf_counter()
+        try:
+            if self.policy is not None:
+                send = partial(self.session.request, method, url)
+                response = self.policy.execute(send, method, route, **kwargs)
+            else:
+                response = self.session.request(method, url, **kwargs)
+        except Exception as exc:
+            elapsed = time.perf_counter() - started
+            self.metrics.record(method, route, type(exc).__name__, elapsed)
+            self.request_log.record(method, url, type(exc).__name__, elapsed)
+            raise
+        elapsed = time.perf_counter() - started
+        status = str(response.status_code)
+        sent, received = _request_size(response), _response_size(response)
+        self.metrics.record(method, route, status, elapsed, sent, received)
+        self.request_log.record(method, url, status, elapsed, sent, received)
+        # 304 на условный GET кеша в спецификации не описан - проверяется сама запись кеша при сохранении
+        if self.contract is not None and response.status_code != 304:
+            # Потоковый ответ читает вызывающий код, для него проверяется только статус
+            stream = kwargs.get("stream", False)
+            self.contract.validate(method, route, response.status_code, None if stream else response.content,
+                                   check_body=not stream)
         
-        return response
+        return PetStoreResponse.from_response(response, model, self.validate_models)
+
+    def run_many(self, calls: Iterable[Call], max_concurrency: int = 10) -> List[Any]:
+        """Выполнить пачку вызовов API параллельно на общем Session.
+
+        Вызов - это либо кортеж ``(имя_метода, *args)``, например ``("add_pet", pet_data)``,
+        либо функция без аргументов. Результаты возвращаются в порядке входного списка;
+        исключение отдельного вызова кладется на его место вместо ответа.
+        """
+        calls = [self._resolve_call(call) for call in calls]
+        if not calls:
+            return []
+
+        def invoke(call):
+            try:
+                return call()
+            except Exception as exc:
+                return exc
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(calls)))) as executor:
+            return list(executor.map(invoke, calls))
+
+    def _resolve_call(self, call: Call) -> Callable[[], Any]:
+        if callable(call):
+            return call
+        name, *args = call
+        method = getattr(self, name)
+        return lambda: method(*args)
+
+    def _user_tags(self, users_data: List[Dict[str, Any]]) -> Tuple[str, ...]:
+        if self.cache is None:
+            return ()
+        return tuple(f"user:{user.get('username')}" for user in users_data)
+
+    def get_pet_by_id(self, pet_id: int) -> PetStoreResponse:
+        return self._request("GET", f"/pet/{pet_id}", cache_tags=(f"pet:{pet_id}",), model=Pet)
+
+    def add_pet(self, pet_data: Dict[str, Any]) -> PetStoreResponse:
+        return self._request("POST", "/pet", invalidates=(f"pet:{pet_data.get('id')}",) + PET_TAGS, model=Pet,
+                             compress=True, json=pet_data)
 
-    def get_pet_by_id(self, pet_id: int) -> requests.Response:
-        return self._request("GET", f"/pet/{pet_id}")
+    def update_pet(self, pet_data: Dict[str, Any]) -> PetStoreResponse:
+        return self._request("PUT", "/pet", invalidates=(f"pet:{pet_data.get('id')}",) + PET_TAGS, model=Pet,
+                             compress=True, json=pet_data)
 
-    def add_pet(self, pet_data: Dict[str, Any]) -> requests.Response:
-        return self._request("POST", "/pet", json=pet_data)
+    def delete_pet(self, pet_id: int) -> PetStoreResponse:
+        return self._request("DELETE", f"/pet/{pet_id}", invalidates=(f"pet:{pet_id}",) + PET_TAGS,
+                             model=ApiResponse)
 
-    def update_pet(self, pet_data: Dict[str, Any]) -> requests.Response:
-        return self._request("PUT", "/pet", json=pet_data)
+    def find_pets_by_status(self, status: str) -> PetStoreResponse:
+        return self._request("GET", f"/pet/findByStatus?status={status}", cache_tags=("pets",), model=List[Pet])
 
-    def delete_pet(self, pet_id: int) -> requests.Response:
-        return self._request("DELETE", f"/pet/{pet_id}")
+    def iter_pets_by_status(self, status: str, model: Any = Pet, validate: Optional[bool] = None,
+                            chunk_size: int = 64 * 1024) -> Iterator[Any]:
+        """Питомцы со статусом ``status`` по одному, без чтения всего ответа в память.
 
-    def find_pets_by_status(self, status: str) -> requests.Response:
-        return self._request("GET", f"/pet/findByStatus?status={status}")
+        Ответ читается потоком и разбирается инкрементально; ``model=None`` отдает словари.
+        Итерацию можно прервать - соединение закроется. Кеш не используется,
+        ответ не 2xx приводит к requests.HTTPError.
+        """
+        response = self._send("GET", f"/pet/findByStatus?status={status}", stream=True)
+        if not response.ok:
+            response.close()
+            response.raise_for_status()
+        if validate is None:
+            validate = self.validate_models
+        yield from iter_response_items(response, model, validate, chunk_size)
 
-    def update_pet_with_form(self, pet_id: int, name: str = None, status: str = None) -> requests.Response:
+    def update_pet_with_form(self, pet_id: int, name: str = None, status: str = None) -> PetStoreResponse:
         data = {}
         if name:
             data["name"] = name
         if status:
             data["status"] = status
         
-        return self._request("POST", f"/pet/{pet_id}", data=data)
+        return self._request("POST", f"/pet/{pet_id}", invalidates=(f"pet:{pet_id}",) + PET_TAGS,
+                             model=ApiResponse, data=data)
 
-    def get_inventory(self) -> requests.Response:
-        return self._request("GET", "/store/inventory")
+    def get_inventory(self) -> PetStoreResponse:
+        return self._request("GET", "/store/inventory", cache_tags=("inventory",), model=Dict[str, int])
 
-    def place_order(self, order_data: Dict[str, Any]) -> requests.Response:
-        return self._request("POST", "/store/order", json=order_data)
+    def place_order(self, order_data: Dict[str, Any]) -> PetStoreResponse:
+        return self._request("POST", "/store/order", invalidates=(f"order:{order_data.get('id')}",), model=Order,
+                             compress=True, json=order_data)
 
-    def get_order_by_id(self, order_id: int) -> requests.Response:
-        return self._request("GET", f"/store/order/{order_id}")
+    def get_order_by_id(self, order_id: int) -> PetStoreResponse:
+        return self._request("GET", f"/store/order/{order_id}", cache_tags=(f"order:{order_id}",), model=Order)
 
-    def delete_order(self, order_id: int) -> requests.Response:
-        return self._request("DELETE", f"/store/order/{order_id}")
+    def delete_order(self, order_id: int) -> PetStoreResponse:
+        return self._request("DELETE", f"/store/order/{order_id}", invalidates=(f"order:{order_id}",),
+                             model=ApiResponse)
 
-    def create_user(self, user_data: Dict[str, Any]) -> requests.Response:
-        return self._request("POST", "/user", json=user_data)
+    def create_user(self, user_data: Dict[str, Any]) -> PetStoreResponse:
+        return self._request("POST", "/user", invalidates=(f"user:{user_data.get('username')}",),
+                             model=ApiResponse, json=user_data)
 
-    def create_users_with_list(self, users_data: List[Dict[str, Any]]) -> requests.Response:
-        return self._request("POST", "/user/createWithList", json=users_data)
+    def create_users_with_list(self, users_data: List[Dict[str, Any]]) -> PetStoreResponse:
+        return self._request("POST", "/user/createWithList", invalidates=self._user_tags(users_data),
+                             model=ApiResponse, compress=True, json=users_data)
 
-    def create_users_with_array(self, users_data: List[Dict[str, Any]]) -> requests.Response:
-        return self._request("POST", "/user/createWithArray", json=users_data)
+    def create_users_with_array(self, users_data: List[Dict[str, Any]]) -> PetStoreResponse:
+        return self._request("POST", "/user/createWithArray", invalidates=self._user_tags(users_data),
+                             model=ApiResponse, compress=True, json=users_data)
 
-    def get_user_by_username(self, username: str) -> requests.Response:
-        return self._request("GET", f"/user/{username}")
+    def get_user_by_username(self, username: str) -> PetStoreResponse:
+        return self._request("GET", f"/user/{username}", cache_tags=(f"user:{username}",), model=User)
 
-    def update_user(self, username: str, user_data: Dict[str, Any]) -> requests.Response:
-        return self._request("PUT", f"/user/{username}", json=user_data)
+    def update_user(self, username: str, user_data: Dict[str, Any]) -> PetStoreResponse:
+        invalidates = (f"user:{username}",)
+        new_username = user_data.get("username")
+        if new_username and new_username != username:
+            # Переименование: запись под новым именем тоже устарела
+            invalidates += (f"user:{new_username}",)
+        return self._request("PUT", f"/user/{username}", invalidates=invalidates, model=ApiResponse,
+                             json=user_data)
 
-    def delete_user(self, username: str) -> requests.Response:
-        return self._request("DELETE", f"/user/{username}")
+    def delete_user(self, username: str) -> PetStoreResponse:
+        return self._request("DELETE", f"/user/{username}", invalidates=(f"user:{username}",), model=ApiResponse)
 
-    def user_login(self, username: str, password: str) -> requests.Response:
-        return self._request("GET", f"/user/login?username={username}&password={password}")
+    def user_login(self, username: str, password: str) -> PetStoreResponse:
+        return self._request("GET", f"/user/login?username={username}&password={password}", model=ApiResponse)
 
-    def user_logout(self) -> requests.Response:
-        return self._request("GET", "/user/logout")
\ No newline at end of file
+    def user_logout(self) -> PetStoreResponse:
+        return self._request("GET", "/user/logout", model=ApiResponse)
\ No newline at end of file
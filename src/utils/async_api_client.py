@@ -0,0 +1,164 @@
+import asyncio
+import aiohttp
+import logging
+import requests
+from datetime import timedelta
+from requests.structures import CaseInsensitiveDict
+from typing import Optional, Dict, Any, List, AsyncIterator
+
+from src.models.models import Pet, Order, User, ApiResponse
+from src.utils.request_log import redact_url
+from src.utils.responses import PetStoreResponse
+from src.utils.streaming import JsonArrayParser, item_builder
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPetStoreClient:
+    """Асинхронный клиент PetStore API с тем же набором методов, что и PetStoreClient.
+
+    Все методы - корутины и возвращают ``PetStoreResponse`` с уже прочитанным телом и теми же
+    моделями в ``.parsed``, что и у синхронного клиента, поэтому ответы можно передавать
+    в ``ValidationSteps`` так же, как ответы PetStoreClient.
+    Соединения берутся из общего пула ``aiohttp.TCPConnector``.
+    """
+
+    def __init__(self, base_url: str = "https://petstore.swagger.io/v2",
+                 pool_size: int = 100, pool_size_per_host: int = 0,
+                 timeout: Optional[float] = None, validate_models: bool = True):
+        self.base_url = base_url
+        self.validate_models = validate_models
+        self.pool_size = pool_size
+        self.pool_size_per_host = pool_size_per_host
+        self.timeout = timeout
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.pool_size_per_host)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncPetStoreClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _request(self, method: str, endpoint: str, model: Any = None, **kwargs) -> PetStoreResponse:
+        url = f"{self.base_url}{endpoint}"
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Making %s request to %s", method, redact_url(url))
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        async with self.session.request(method, url, **kwargs) as resp:
+            body = await resp.read()
+            response = self._build_response(resp, body, loop.time() - started)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s %s -> %s in %.1f ms", method, redact_url(url), response.status_code,
+                        response.elapsed.total_seconds() * 1000)
+
+        return PetStoreResponse.from_response(response, model, self.validate_models)
+
+    @staticmethod
+    def _build_response(resp: aiohttp.ClientResponse, body: bytes, elapsed: float) -> requests.Response:
+        """Переложить ответ aiohttp в requests.Response, чтобы контракт совпадал с PetStoreClient"""
+        response = requests.Response()
+        response.status_code = resp.status
+        response.reason = resp.reason
+        response.headers = CaseInsensitiveDict(resp.headers)
+        response.url = str(resp.url)
+        response.encoding = resp.get_encoding() if body else None
+        response.elapsed = timedelta(seconds=elapsed)
+        response._content = body
+        return response
+
+    async def get_pet_by_id(self, pet_id: int) -> PetStoreResponse:
+        return await self._request("GET", f"/pet/{pet_id}", model=Pet)
+
+    async def add_pet(self, pet_data: Dict[str, Any]) -> PetStoreResponse:
+        return await self._request("POST", "/pet", model=Pet, json=pet_data)
+
+    async def update_pet(self, pet_data: Dict[str, Any]) -> PetStoreResponse:
+        return await self._request("PUT", "/pet", model=Pet, json=pet_data)
+
+    async def delete_pet(self, pet_id: int) -> PetStoreResponse:
+        return await self._request("DELETE", f"/pet/{pet_id}", model=ApiResponse)
+
+    async def find_pets_by_status(self, status: str) -> PetStoreResponse:
+        return await self._request("GET", f"/pet/findByStatus?status={status}", model=List[Pet])
+
+    async def iter_pets_by_status(self, status: str, model: Any = Pet, validate: bool = True,
+                                  chunk_size: int = 64 * 1024) -> AsyncIterator[Any]:
+        """Питомцы со статусом ``status`` по одному, тело разбирается по мере получения"""
+        url = f"{self.base_url}/pet/findByStatus?status={status}"
+        build = item_builder(model, validate)
+        async with self.session.get(url) as resp:
+            resp.raise_for_status()
+            parser = JsonArrayParser(resp.get_encoding())
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                for item in parser.feed(chunk):
+                    yield build(item)
+            for item in parser.close():
+                yield build(item)
+
+    async def update_pet_with_form(self, pet_id: int, name: str = None, status: str = None) -> PetStoreResponse:
+        data = {}
+        if name:
+            data["name"] = name
+        if status:
+            data["status"] = status
+
+        return await self._request("POST", f"/pet/{pet_id}", model=ApiResponse, data=data)
+
+    async def get_inventory(self) -> PetStoreResponse:
+        return await self._request("GET", "/store/inventory", model=Dict[str, int])
+
+    async def place_order(self, order_data: Dict[str, Any]) -> PetStoreResponse:
+        return await self._request("POST", "/store/order", model=Order, json=order_data)
+
+    async def get_order_by_id(self, order_id: int) -> PetStoreResponse:
+        return await self._request("GET", f"/store/order/{order_id}", model=Order)
+
+    async def delete_order(self, order_id: int) -> PetStoreResponse:
+        return await self._request("DELETE", f"/store/order/{order_id}", model=ApiResponse)
+
+    async def create_user(self, user_data: Dict[str, Any]) -> PetStoreResponse:
+        return await self._request("POST", "/user", model=ApiResponse, json=user_data)
+
+    async def create_users_with_list(self, users_data: List[Dict[str, Any]]) -> PetStoreResponse:
+        return await self._request("POST", "/user/createWithList", model=ApiResponse, json=users_data)
+
+    async def create_users_with_array(self, users_data: List[Dict[str, Any]]) -> PetStoreResponse:
+        return await self._request("POST", "/user/createWithArray", model=ApiResponse, json=users_data)
+
+    async def get_user_by_username(self, username: str) -> PetStoreResponse:
+        return await self._request("GET", f"/user/{username}", model=User)
+
+    async def update_user(self, username: str, user_data: Dict[str, Any]) -> PetStoreResponse:
+        return await self._request("PUT", f"/user/{username}", model=ApiResponse, json=user_data)
+
+    async def delete_user(self, username: str) -> PetStoreResponse:
+        return await self._request("DELETE", f"/user/{username}", model=ApiResponse)
+
+    async def user_login(self, username: str, password: str) -> PetStoreResponse:
+        return await self._request("GET", f"/user/login?username={username}&password={password}",
+                                   model=ApiResponse)
+
+    async def user_logout(self) -> PetStoreResponse:
+        return await self._request("GET", "/user/logout", model=ApiResponse)
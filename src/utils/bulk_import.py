@@ -0,0 +1,199 @@
+import json
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Статусы, после которых кусок отправляется повторно; остальные ошибки окончательные
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IMPORT_METHODS = ("create_users_with_list", "create_users_with_array")
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Пользователи из JSONL-файла по одному, пустые строки пропускаются"""
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{path}:{line_number}: invalid JSON: {exc.msg}") from exc
+
+
+def iter_chunks(users: Iterable[Dict[str, Any]], max_users: int = 500,
+                max_bytes: Optional[int] = 1024 * 1024) -> Iterator[List[Dict[str, Any]]]:
+    """Разбить поток пользователей на куски не больше ``max_users`` штук и ``max_bytes`` байт тела.
+
+    Размер считается так же, как requests кодирует ``json=``. Пользователь, который
+    сам по себе больше ``max_bytes``, уходит отдельным куском.
+    """
+    if max_users <= 0:
+        raise ValueError("max_users must be positive")
+    chunk: List[Dict[str, Any]] = []
+    size = 2  # "[" и "]"
+    for user in users:
+        user_size = len(json.dumps(user).encode()) + (2 if chunk else 0)  # ", " между элементами
+        if chunk and (len(chunk) >= max_users or max_bytes is not None and size + user_size > max_bytes):
+            yield chunk
+            chunk, size = [], 2
+            user_size -= 2
+        chunk.append(user)
+        size += user_size
+    if chunk:
+        yield chunk
+
+
+class ChunkResult:
+    """Итог отправки одного куска"""
+
+    __slots__ = ("index", "users", "status", "attempts", "error", "first_username")
+
+    def __init__(self, index: int, users: int, status: Optional[int], attempts: int,
+                 error: Optional[str], first_username: Optional[str]):
+        self.index = index
+        self.users = users
+        self.status = status
+        self.attempts = attempts
+        self.error = error
+        self.first_username = first_username
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ImportReport:
+    """Прогресс и итоги импорта"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self.chunks = 0
+        self.users = 0
+        self.retries = 0
+        self.failed: List[ChunkResult] = []
+
+    @property
+    def failed_users(self) -> int:
+        return sum(result.users for result in self.failed)
+
+    @property
+    def throughput(self) -> float:
+        """Импортировано пользователей в секунду"""
+        return self.users / self.elapsed if self.elapsed else 0.0
+
+    def add(self, result: ChunkResult):
+        self.elapsed = time.perf_counter() - self.started
+        self.chunks += 1
+        self.retries += result.attempts - 1
+        if result.ok:
+            self.users += result.users
+        else:
+            self.failed.append(result)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "chunks": self.chunks,
+            "users": self.users,
+            "failed_chunks": len(self.failed),
+            "failed_users": self.failed_users,
+            "retries": self.retries,
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_users_per_s": round(self.throughput, 1),
+            "failures": [{"chunk": r.index, "first_username": r.first_username, "users": r.users,
+                          "status": r.status, "error": r.error} for r in self.failed],
+        }
+
+    def format(self) -> str:
+        return (f"{self.users} users in {self.chunks} chunks, {self.elapsed:.1f} s, "
+                f"{self.throughput:.0f} users/s, {self.retries} retries, "
+                f"{len(self.failed)} failed chunks ({self.failed_users} users)")
+
+
+class BulkUserImporter:
+    """Массовое создание пользователей кусками через ``create_users_with_list``.
+
+    Вход читается лениво (любой итератор или JSONL-файл), куски ограничены
+    по числу пользователей и по байтам тела. Одновременно в работе не больше
+    ``max_in_flight`` кусков, поэтому память не зависит от размера входа.
+    Повторно отправляются только куски, упавшие с ошибкой соединения или
+    статусом из ``RETRY_STATUSES``. ``progress`` вызывается после каждого
+    куска, в лог прогресс пишется не чаще раза в ``log_interval`` секунд.
+    """
+
+    def __init__(self, client, chunk_size: int = 500, max_chunk_bytes: Optional[int] = 1024 * 1024,
+                 max_in_flight: int = 4, max_retries: int = 2, backoff: float = 0.5,
+                 method: str = "create_users_with_list",
+                 progress: Optional[Callable[[ImportReport], None]] = None,
+                 log_interval: float = 5.0, sleep: Callable[[float], None] = time.sleep):
+        if method not in IMPORT_METHODS:
+            raise ValueError(f"method must be one of {IMPORT_METHODS}")
+        if max_in_flight <= 0:
+            raise ValueError("max_in_flight must be positive")
+        self.client = client
+        self.chunk_size = chunk_size
+        self.max_chunk_bytes = max_chunk_bytes
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.method = method
+        self.progress = progress
+        self.log_interval = log_interval
+        self.sleep = sleep
+
+    def import_file(self, path: str) -> ImportReport:
+        return self.run(iter_jsonl(path))
+
+    def run(self, users: Iterable[Dict[str, Any]]) -> ImportReport:
+        report = ImportReport()
+        last_log = report.started
+        send = getattr(self.client, self.method)
+        chunks = enumerate(iter_chunks(users, self.chunk_size, self.max_chunk_bytes))
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            pending = set()
+            for index, chunk in chunks:
+                if len(pending) >= self.max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    last_log = self._collect(done, report, last_log)
+                pending.add(executor.submit(self._send_chunk, send, index, chunk))
+            if pending:
+                last_log = self._collect(wait(pending).done, report, last_log)
+
+        report.elapsed = time.perf_counter() - report.started
+        logger.info("Bulk import finished: %s", report.format())
+        return report
+
+    def _collect(self, done, report: ImportReport, last_log: float) -> float:
+        for future in done:
+            report.add(future.result())
+            if self.progress is not None:
+                self.progress(report)
+        now = time.perf_counter()
+        if now - last_log >= self.log_interval:
+            logger.info("Bulk import progress: %s", report.format())
+            return now
+        return last_log
+
+    def _send_chunk(self, send, index: int, chunk: List[Dict[str, Any]]) -> ChunkResult:
+        status, error = None, None
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = send(chunk)
+                status = response.status_code
+                error = None if response.ok else f"HTTP {status}"
+                retryable = status in RETRY_STATUSES
+            except requests.RequestException as exc:
+                status, error, retryable = None, type(exc).__name__, True
+            if error is None or not retryable or attempt > self.max_retries:
+                break
+            self.sleep(self.backoff * 2 ** (attempt - 1))
+        return ChunkResult(index, len(chunk), status, attempt, error, chunk[0].get("username"))
@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Iterable, Callable, Set
+
+import requests
+
+
+class CacheEntry:
+    """Закешированный ответ и его валидаторы"""
+
+    __slots__ = ("key", "response", "expires_at", "etag", "last_modified", "tags")
+
+    def __init__(self, key: str, response: requests.Response, expires_at: float, tags: Iterable[str]):
+        self.key = key
+        self.response = response
+        self.expires_at = expires_at
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        self.tags = tuple(tags)
+
+    @property
+    def revalidatable(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+
+class ResponseCache:
+    """Кеш ответов идемпотентных GET-запросов для PetStoreClient.
+
+    Записи вытесняются по LRU при превышении ``max_size`` и устаревают через ``ttl``
+    секунд. Устаревшая запись с ETag/Last-Modified не удаляется, а перепроверяется
+    условным запросом. Каждая запись помечена тегами ресурсов (``pet:1``, ``pets``,
+    ``inventory``...), по которым клиент сбрасывает кеш после изменяющих запросов.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """Вернуть запись по ключу; свежесть проверяется через ``is_fresh``"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= self.clock() and not entry.revalidatable:
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        fresh = entry.expires_at > self.clock()
+        if fresh:
+            with self._lock:
+                self.hits += 1
+        return fresh
+
+    @staticmethod
+    def conditional_headers(entry: CacheEntry) -> Dict[str, str]:
+        headers = {}
+        if entry.etag is not None:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified is not None:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def revalidated(self, entry: CacheEntry) -> requests.Response:
+        """Сервер ответил 304: продлить запись и вернуть сохраненный ответ"""
+        with self._lock:
+            entry.expires_at = self.clock() + self.ttl
+            self.revalidations += 1
+        return entry.response
+
+    def store(self, key: str, response: requests.Response, tags: Iterable[str]):
+        if "no-store" in response.headers.get("Cache-Control", ""):
+            return
+        entry = CacheEntry(key, response, self.clock() + self.ttl, tags)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *tags: str):
+        """Сбросить все записи, помеченные любым из тегов"""
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
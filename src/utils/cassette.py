@@ -0,0 +1,269 @@
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+MODES = ("record", "replay")
+MAGIC = b"PSCASS1\n"
+TRAILER_MAGIC = b"PSCASIDX"
+# Запись: ключ, статус, длина заголовков (JSON), длина тела; дальше заголовки и тело
+_RECORD = struct.Struct("<16sHII")
+# Индекс: ключ и смещение записи, отсортирован по ключу, затем по порядку записи
+_ENTRY = struct.Struct("<16sQ")
+# Хвост файла: смещение индекса, число записей, метка
+_TRAILER = struct.Struct("<QI8s")
+# Заголовки, которые описывают передачу, а не тело: тело хранится уже распакованным
+_TRANSPORT_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"})
+
+
+class CassetteMissError(requests.ConnectionError):
+    """В кассете нет ответа на запрос"""
+
+
+def request_key(method: str, url: str, body=None) -> bytes:
+    """Ключ запроса: метод, путь с query-строкой (без хоста) и хеш тела"""
+    parts = urlsplit(url)
+    route = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    body_hash = hashlib.blake2b(body or b"", digest_size=16).digest()
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(method.upper().encode())
+    digest.update(b"\0")
+    digest.update(route.encode())
+    digest.update(b"\0")
+    digest.update(body_hash)
+    return digest.digest()
+
+
+class CassetteWriter:
+    """Дописывает пары запрос/ответ в файл и при закрытии пишет индекс"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._entries = []
+        self._lock = threading.Lock()
+
+    def append(self, key: bytes, status: int, headers: Dict[str, str], body: bytes):
+        header_bytes = json.dumps(headers, separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(_RECORD.pack(key, status, len(header_bytes), len(body)))
+            self._file.write(header_bytes)
+            self._file.write(body)
+            self._entries.append((key, offset))
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            index_offset = self._file.tell()
+            # sorted стабилен: ответы на одинаковые запросы остаются в порядке записи
+            for key, offset in sorted(self._entries, key=lambda entry: entry[0]):
+                self._file.write(_ENTRY.pack(key, offset))
+            self._file.write(_TRAILER.pack(index_offset, len(self._entries), TRAILER_MAGIC))
+            self._file.close()
+
+
+class _Keys:
+    """Ключи индекса как последовательность для bisect, без разбора всего индекса"""
+
+    def __init__(self, index, count: int):
+        self._index = index
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position: int) -> bytes:
+        start = position * _ENTRY.size
+        return bytes(self._index[start:start + 16])
+
+    def offset(self, position: int) -> int:
+        return _ENTRY.unpack_from(self._index, position * _ENTRY.size)[1]
+
+
+class CassetteReader:
+    """Чтение кассеты через mmap: поиск ответа - двоичный поиск по готовому индексу.
+
+    Открытие и поиск не зависят от размера кассеты (кроме log n поиска).
+    Если запись кассеты оборвалась и индекса нет, он строится одним проходом.
+    Повторные одинаковые запросы получают ответы в порядке записи, после
+    последнего повторяется последний.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._keys: Optional[_Keys] = None
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a PetStore cassette")
+        self._keys = self._load_index(size)
+        self._runs: Dict[bytes, Tuple[int, int]] = {}
+        self._played: Dict[bytes, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _load_index(self, size: int) -> _Keys:
+        if size >= len(MAGIC) + _TRAILER.size:
+            index_offset, count, marker = _TRAILER.unpack_from(self._map, size - _TRAILER.size)
+            if marker == TRAILER_MAGIC and index_offset + count * _ENTRY.size == size - _TRAILER.size:
+                return _Keys(memoryview(self._map)[index_offset:index_offset + count * _ENTRY.size], count)
+        return self._scan(size)
+
+    def _scan(self, size: int) -> _Keys:
+        entries = []
+        offset = len(MAGIC)
+        while offset + _RECORD.size <= size:
+            key, _, header_length, body_length = _RECORD.unpack_from(self._map, offset)
+            end = offset + _RECORD.size + header_length + body_length
+            if end > size:
+                break
+            entries.append((key, offset))
+            offset = end
+        index = b"".join(_ENTRY.pack(key, offset) for key, offset in sorted(entries, key=lambda entry: entry[0]))
+        return _Keys(index, len(entries))
+
+    def _run(self, key: bytes) -> Tuple[int, int]:
+        run = self._runs.get(key)
+        if run is None:
+            start = bisect_left(self._keys, key)
+            stop = start
+            while stop < len(self._keys) and self._keys[stop] == key:
+                stop += 1
+            run = self._runs[key] = (start, stop - start)
+        return run
+
+    def lookup(self, key: bytes) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """Статус, заголовки и тело следующего ответа на запрос с ключом ``key``"""
+        with self._lock:
+            start, count = self._run(key)
+            if not count:
+                return None
+            played = self._played.get(key, 0)
+            self._played[key] = played + 1
+        offset = self._keys.offset(start + min(played, count - 1))
+        _, status, header_length, body_length = _RECORD.unpack_from(self._map, offset)
+        body_start = offset + _RECORD.size + header_length
+        headers = json.loads(self._map[offset + _RECORD.size:body_start])
+        return status, headers, self._map[body_start:body_start + body_length]
+
+    def rewind(self):
+        """Начать выдачу повторяющихся ответов сначала"""
+        with self._lock:
+            self._played.clear()
+
+    def close(self):
+        index = getattr(self._keys, "_index", None)
+        if isinstance(index, memoryview):
+            index.release()
+        self._keys = None
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+
+class RecordingAdapter(BaseAdapter):
+    """Отправляет запросы через ``inner`` и пишет каждую пару запрос/ответ в кассету"""
+
+    def __init__(self, inner: BaseAdapter, writer: CassetteWriter):
+        super().__init__()
+        self.inner = inner
+        self.writer = writer
+
+    def send(self, request, **kwargs):
+        response = self.inner.send(request, **kwargs)
+        body = response.content
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() not in _TRANSPORT_HEADERS}
+        self.writer.append(request_key(request.method, request.url, request.body),
+                           response.status_code, headers, body)
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Отвечает на запросы из кассеты без сети"""
+
+    def __init__(self, reader: CassetteReader):
+        super().__init__()
+        self.reader = reader
+
+    def send(self, request, **kwargs):
+        found = self.reader.lookup(request_key(request.method, request.url, request.body))
+        if found is None:
+            raise CassetteMissError(f"No recorded response for {request.method} {request.url}", request=request)
+        status, headers, body = found
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.headers["Content-Length"] = str(len(body))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(body)
+        response._content = body
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(0)
+        return response
+
+    def close(self):
+        pass
+
+
+class Cassette:
+    """Кассета для PetStoreClient: ``record`` пишет реальный трафик, ``replay`` отдает его из файла.
+
+    Формат: записи ``[ключ, статус, заголовки JSON, тело]`` подряд, затем индекс
+    (ключ, смещение) отсортированный по ключу и хвост со смещением индекса.
+    Ключ - хеш метода, пути с query и хеша тела, поэтому хост не важен:
+    записанное с боевого стенда воспроизводится с любым base_url.
+    """
+
+    def __init__(self, path: str, mode: str = "replay"):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        self.path = path
+        self.mode = mode
+        self.writer = CassetteWriter(path) if mode == "record" else None
+        self.reader = CassetteReader(path) if mode == "replay" else None
+
+    def adapter(self, inner: BaseAdapter) -> BaseAdapter:
+        """Адаптер для монтирования в Session вместо ``inner``"""
+        if self.writer is not None:
+            return RecordingAdapter(inner, self.writer)
+        return ReplayAdapter(self.reader)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        if self.reader is not None:
+            self.reader.close()
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,117 @@
+import gzip
+import zlib
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+try:
+    from urllib3.response import HAS_ZSTD
+except ImportError:  # urllib3 < 2 не распаковывает zstd
+    HAS_ZSTD = False
+
+try:
+    import zstandard
+except ImportError:  # zstandard - необязательная зависимость
+    zstandard = None
+
+# Ошибки распаковки поврежденного тела: zlib.error, BadGzipFile (OSError), EOFError, ZstdError
+_DECODE_ERRORS = (zlib.error, OSError, EOFError) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+ENCODINGS = ("gzip", "deflate", "zstd")
+
+
+def _gzip(level: Optional[int]) -> Callable[[bytes], bytes]:
+    return lambda body: gzip.compress(body, compresslevel=6 if level is None else level, mtime=0)
+
+
+def _deflate(level: Optional[int]) -> Callable[[bytes], bytes]:
+    return lambda body: zlib.compress(body, -1 if level is None else level)
+
+
+def _zstd(level: Optional[int]) -> Callable[[bytes], bytes]:
+    compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+    return compressor.compress
+
+
+_COMPRESSORS = {"gzip": _gzip, "deflate": _deflate, "zstd": _zstd}
+
+
+def response_encodings() -> Tuple[str, ...]:
+    """Кодировки ответа, которые умеет распаковывать urllib3 в этом окружении"""
+    return ("zstd", "gzip", "deflate") if HAS_ZSTD else ("gzip", "deflate")
+
+
+class CompressionConfig:
+    """Сжатие тел запросов и согласование сжатых ответов для PetStoreClient.
+
+    Тело запроса сжимается ``encoding`` (gzip, deflate или zstd - последний
+    требует пакет zstandard), только если оно не меньше ``min_size`` байт и
+    сжатие действительно уменьшило размер. ``accept`` - кодировки ответа для
+    заголовка Accept-Encoding; по умолчанию все, что может распаковать urllib3.
+    Порог для ответов задает сервер, клиент только объявляет, что умеет.
+    """
+
+    def __init__(self, encoding: str = "gzip", min_size: int = 1024, level: Optional[int] = None,
+                 accept: Optional[Sequence[str]] = None):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"encoding must be one of {ENCODINGS}")
+        if encoding == "zstd" and zstandard is None:
+            raise ValueError("zstd request compression requires the zstandard package")
+        if min_size < 0:
+            raise ValueError("min_size must not be negative")
+        supported = response_encodings()
+        accept = supported if accept is None else tuple(accept)
+        unsupported = [name for name in accept if name not in supported]
+        if unsupported:
+            raise ValueError(f"Cannot decode responses encoded with {', '.join(unsupported)}")
+        self.encoding = encoding
+        self.min_size = min_size
+        self.level = level
+        self.accept = accept
+        self._compress = _COMPRESSORS[encoding](level)
+
+    @property
+    def accept_encoding(self) -> str:
+        return ", ".join(self.accept) if self.accept else "identity"
+
+    def compress(self, body: bytes) -> Optional[bytes]:
+        """Сжатое тело или None, если сжимать не стоит"""
+        if len(body) < self.min_size:
+            return None
+        compressed = self._compress(body)
+        return compressed if len(compressed) < len(body) else None
+
+    def encode(self, body: bytes) -> Tuple[bytes, Dict[str, str]]:
+        """Тело для отправки и заголовки к нему"""
+        compressed = self.compress(body)
+        if compressed is None:
+            return body, {}
+        return compressed, {"Content-Encoding": self.encoding}
+
+
+class CorruptBodyError(ValueError):
+    """Тело не распаковывается указанной кодировкой"""
+
+
+def decompress(body: bytes, encoding: str) -> bytes:
+    """Распаковать тело с Content-Encoding ``encoding`` (для мок-сервера и тестов).
+
+    Неизвестная кодировка - ValueError, поврежденное тело - CorruptBodyError.
+    """
+    if encoding in ("", "identity"):
+        return body
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+    if encoding == "zstd" and zstandard is None:
+        raise ValueError("zstd decoding requires the zstandard package")
+    try:
+        if encoding == "gzip":
+            return gzip.decompress(body)
+        if encoding == "deflate":
+            return zlib.decompress(body)
+        decoder = zstandard.ZstdDecompressor().decompressobj()
+        data = decoder.decompress(body)
+    except _DECODE_ERRORS as exc:
+        raise CorruptBodyError(f"Corrupt {encoding} body: {exc}") from exc
+    # Оборванный zstd-кадр распаковывается частично без ошибки
+    if not decoder.eof:
+        raise CorruptBodyError("Corrupt zstd body: truncated frame")
+    return data
@@ -0,0 +1,359 @@
+import json
+import logging
+import os
+import threading
+from functools import lru_cache
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, FrozenSet, Optional, Tuple
+
+from src.models.decoding import loads
+
+logger = logging.getLogger(__name__)
+
+SPEC_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "contracts", "petstore_v2.json")
+
+# Проверка значения: None, если значение подходит, иначе "путь: причина"
+Check = Callable[[Any], Optional[str]]
+
+_INT_RANGES = {"int32": (-2 ** 31, 2 ** 31 - 1), "int64": (-2 ** 63, 2 ** 63 - 1)}
+
+
+class ContractViolation:
+    """Расхождение ответа со спецификацией"""
+
+    __slots__ = ("method", "route", "status", "message")
+
+    def __init__(self, method: str, route: str, status: int, message: str):
+        self.method = method
+        self.route = route
+        self.status = status
+        self.message = message
+
+    def __repr__(self) -> str:
+        return f"ContractViolation({self.format()!r})"
+
+    def format(self) -> str:
+        return f"{self.method} {self.route} -> {self.status}: {self.message}"
+
+
+class ContractViolationError(AssertionError):
+    def __init__(self, violation: ContractViolation):
+        super().__init__(violation.format())
+        self.violation = violation
+
+
+class SchemaCompiler:
+    """Компилирует схемы Swagger 2.0 в проверяющие функции.
+
+    Поддерживается то, что есть в спецификации PetStore: type/format (с диапазонами
+    int32/int64), enum, required, properties, items, additionalProperties и $ref на
+    definitions. Лишние свойства объектов допустимы, как и по умолчанию в Swagger.
+
+    ``predicate`` генерирует из схемы исходный код одной функции без вложенных
+    вызовов и возвращает только True/False - это быстрый путь для каждого ответа.
+    ``compile`` собирает функцию из замыканий, которая объясняет нарушение;
+    она вызывается, только если предикат вернул False.
+    """
+
+    def __init__(self, definitions: Dict[str, Any]):
+        self.definitions = definitions
+        self._refs: Dict[str, Check] = {}
+
+    def compile(self, schema: Dict[str, Any]) -> Check:
+        if "$ref" in schema:
+            return self._ref(schema["$ref"])
+        kind = schema.get("type", "object" if "properties" in schema else None)
+        check = {
+            "object": self._object,
+            "array": self._array,
+            "integer": self._integer,
+            "number": self._number,
+            "string": self._string,
+            "boolean": self._boolean,
+        }.get(kind, lambda schema: _accept)(schema)
+        if "enum" in schema:
+            check = _with_enum(check, frozenset(schema["enum"]))
+        return check
+
+    def predicate(self, schema: Dict[str, Any]) -> Callable[[Any], bool]:
+        lines = ["def predicate(v0):"]
+        self._emit(schema, "v0", 1, lines, ())
+        lines.append("    return True")
+        namespace = {"_MISSING": _MISSING}
+        exec(compile("\n".join(lines), "<contract>", "exec"), namespace)
+        return namespace["predicate"]
+
+    def _emit(self, schema: Dict[str, Any], var: str, depth: int, lines, refs: Tuple[str, ...]):
+        pad = "    " * depth
+        if "$ref" in schema:
+            name = schema["$ref"].rsplit("/", 1)[-1]
+            if name not in self.definitions:
+                raise ValueError(f"Unknown schema reference: {schema['$ref']}")
+            if name in refs:
+                raise ValueError(f"Recursive schema {name} is not supported")
+            self._emit(self.definitions[name], var, depth, lines, refs + (name,))
+            return
+        kind = schema.get("type", "object" if "properties" in schema else None)
+        child = f"v{depth}"
+        if kind == "object":
+            lines.append(f"{pad}if type({var}) is not dict: return False")
+            for name in schema.get("required", ()):
+                lines.append(f"{pad}if {name!r} not in {var}: return False")
+            for name, sub in schema.get("properties", {}).items():
+                lines.append(f"{pad}{child} = {var}.get({name!r}, _MISSING)")
+                lines.append(f"{pad}if {child} is not _MISSING:")
+                self._emit(sub, child, depth + 1, lines, refs)
+                lines.append(f"{pad}    pass")
+            extra = schema.get("additionalProperties")
+            if isinstance(extra, dict):
+                lines.append(f"{pad}for {child} in {var}.values():")
+                self._emit(extra, child, depth + 1, lines, refs)
+                lines.append(f"{pad}    pass")
+        elif kind == "array":
+            lines.append(f"{pad}if type({var}) is not list: return False")
+            lines.append(f"{pad}for {child} in {var}:")
+            self._emit(schema.get("items", {}), child, depth + 1, lines, refs)
+            lines.append(f"{pad}    pass")
+        elif kind == "integer":
+            low, high = _INT_RANGES.get(schema.get("format"), (None, None))
+            condition = f"type({var}) is not int"
+            if low is not None:
+                condition += f" or not {low} <= {var} <= {high}"
+            lines.append(f"{pad}if {condition}: return False")
+        elif kind == "number":
+            lines.append(f"{pad}if type({var}) is not int and type({var}) is not float: return False")
+        elif kind in ("string", "boolean"):
+            lines.append(f"{pad}if type({var}) is not {'str' if kind == 'string' else 'bool'}: return False")
+        if "enum" in schema:
+            lines.append(f"{pad}if {var} not in {frozenset(schema['enum'])!r}: return False")
+
+    def _ref(self, ref: str) -> Check:
+        name = ref.rsplit("/", 1)[-1]
+        if name not in self.definitions:
+            raise ValueError(f"Unknown schema reference: {ref}")
+        compiled = self._refs
+
+        # Определение компилируется при первой проверке, поэтому рекурсивные схемы допустимы
+        def check(value):
+            target = compiled.get(name)
+            if target is None:
+                target = compiled[name] = self.compile(self.definitions[name])
+            return target(value)
+
+        return check
+
+    def _object(self, schema: Dict[str, Any]) -> Check:
+        required: Tuple[str, ...] = tuple(schema.get("required", ()))
+        properties = tuple((name, self.compile(sub)) for name, sub in schema.get("properties", {}).items())
+        extra = schema.get("additionalProperties")
+        extra_check = self.compile(extra) if isinstance(extra, dict) else None
+
+        def check(value):
+            if type(value) is not dict:
+                return f": expected object, got {_type_name(value)}"
+            for name in required:
+                if name not in value:
+                    return f": missing required property {name!r}"
+            for name, sub in properties:
+                if name in value:
+                    error = sub(value[name])
+                    if error is not None:
+                        return f".{name}{error}"
+            if extra_check is not None:
+                for name, item in value.items():
+                    error = extra_check(item)
+                    if error is not None:
+                        return f".{name}{error}"
+            return None
+
+        return check
+
+    def _array(self, schema: Dict[str, Any]) -> Check:
+        item_check = self.compile(schema.get("items", {}))
+
+        def check(value):
+            if type(value) is not list:
+                return f": expected array, got {_type_name(value)}"
+            for index, item in enumerate(value):
+                error = item_check(item)
+                if error is not None:
+                    return f"[{index}]{error}"
+            return None
+
+        return check
+
+    def _integer(self, schema: Dict[str, Any]) -> Check:
+        low, high = _INT_RANGES.get(schema.get("format"), (None, None))
+
+        def check(value):
+            if type(value) is not int:
+                return f": expected integer, got {_type_name(value)}"
+            if low is not None and not low <= value <= high:
+                return f": {value} is out of {schema['format']} range"
+            return None
+
+        return check
+
+    def _number(self, schema: Dict[str, Any]) -> Check:
+        def check(value):
+            if type(value) not in (int, float):
+                return f": expected number, got {_type_name(value)}"
+            return None
+
+        return check
+
+    def _string(self, schema: Dict[str, Any]) -> Check:
+        return _type_check(str, "string")
+
+    def _boolean(self, schema: Dict[str, Any]) -> Check:
+        return _type_check(bool, "boolean")
+
+
+_MISSING = object()
+
+
+def _accept(value) -> None:
+    return None
+
+
+def _type_name(value) -> str:
+    return {dict: "object", list: "array", str: "string", bool: "boolean", int: "integer",
+            float: "number", type(None): "null"}.get(type(value), type(value).__name__)
+
+
+def _type_check(expected: type, name: str) -> Check:
+    def check(value):
+        if type(value) is not expected:
+            return f": expected {name}, got {_type_name(value)}"
+        return None
+
+    return check
+
+
+def _with_enum(check: Check, allowed: FrozenSet[Any]) -> Check:
+    def enum_check(value):
+        error = check(value)
+        if error is None and value not in allowed:
+            return f": {value!r} is not one of {sorted(allowed)}"
+        return error
+
+    return enum_check
+
+
+class Operation:
+    """Скомпилированные ожидания одной операции: статусы и схемы тел ответов"""
+
+    __slots__ = ("method", "route", "operation_id", "statuses", "has_default", "schemas", "predicates",
+                 "declares_success")
+
+    def __init__(self, method: str, route: str, spec: Dict[str, Any], compiler: SchemaCompiler):
+        self.method = method
+        self.route = route
+        self.operation_id = spec.get("operationId")
+        responses = spec.get("responses", {})
+        self.has_default = "default" in responses
+        self.statuses = frozenset(int(code) for code in responses if code != "default")
+        self.declares_success = any(200 <= code < 300 for code in self.statuses)
+        self.schemas: Dict[Any, Check] = {}
+        self.predicates: Dict[Any, Callable[[Any], bool]] = {}
+        for code, response in responses.items():
+            if "schema" in response:
+                key = code if code == "default" else int(code)
+                self.schemas[key] = compiler.compile(response["schema"])
+                self.predicates[key] = compiler.predicate(response["schema"])
+
+    def check_status(self, status: int) -> Optional[str]:
+        if status in self.statuses or self.has_default:
+            return None
+        # В спецификации PetStore у части операций (addPet, deletePet...) описаны только ошибки;
+        # успешный ответ для них не считается нарушением
+        if 200 <= status < 300 and not self.declares_success:
+            return None
+        return f"undeclared status {status} (declared: {sorted(self.statuses)})"
+
+    def check_body(self, status: int, content: bytes) -> Optional[str]:
+        key = status if status in self.predicates else "default"
+        predicate = self.predicates.get(key)
+        if predicate is None:
+            return None
+        try:
+            data = loads(content)
+        except ValueError:
+            return "response body is not valid JSON"
+        if predicate(data):
+            return None
+        return "body$" + self.schemas[key](data)
+
+
+class ContractValidator:
+    """Проверка ответов PetStoreClient по спецификации Swagger (по умолчанию вложенная petstore v2).
+
+    Схемы компилируются один раз при создании; для ответа ищется операция по
+    методу и шаблону маршрута (словарь), проверяются статус и JSON-тело по
+    схеме этого статуса. Нарушения считаются по операциям и последние
+    ``keep`` хранятся в ``violations``; ``raise_errors=True`` превращает
+    нарушение в ContractViolationError (для функциональных тестов), по
+    умолчанию в лог пишется первое нарушение каждой операции (для
+    нагрузочных прогонов).
+    """
+
+    def __init__(self, spec: Optional[Dict[str, Any]] = None, raise_errors: bool = False, keep: int = 1000):
+        self.raise_errors = raise_errors
+        # Вложенная спецификация компилируется один раз на процесс и общая для всех клиентов
+        self.operations = compile_operations(spec) if spec is not None else _default_operations()
+        self.checked = 0
+        self.failures: Counter = Counter()
+        self.violations: Deque[ContractViolation] = deque(maxlen=keep)
+        self._lock = threading.Lock()
+
+    def validate(self, method: str, route: str, status: int, content: Optional[bytes],
+                 check_body: bool = True) -> Optional[ContractViolation]:
+        """Проверить ответ; возвращает нарушение или None"""
+        operation = self.operations.get((method, route))
+        if operation is None:
+            message = "operation is not in the specification"
+        else:
+            message = operation.check_status(status)
+            if message is None and check_body and content:
+                message = operation.check_body(status, content)
+        with self._lock:
+            self.checked += 1
+            if message is None:
+                return None
+            violation = ContractViolation(method, route, status, message)
+            key = f"{method} {route}"
+            first = key not in self.failures
+            self.failures[key] += 1
+            self.violations.append(violation)
+        if self.raise_errors:
+            raise ContractViolationError(violation)
+        if first:
+            logger.warning("Contract violation: %s", violation.format())
+        return violation
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"checked": self.checked, "violations": sum(self.failures.values()),
+                    "by_operation": dict(self.failures)}
+
+
+def load_spec(path: str = SPEC_PATH) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compile_operations(spec: Dict[str, Any]) -> Dict[Tuple[str, str], Operation]:
+    """Операции спецификации по (метод, шаблон пути)"""
+    compiler = SchemaCompiler(spec.get("definitions", {}))
+    operations = {}
+    for route, path_item in spec.get("paths", {}).items():
+        for method, operation in path_item.items():
+            if method == "parameters":
+                continue
+            operations[(method.upper(), route)] = Operation(method.upper(), route, operation, compiler)
+    return operations
+
+
+@lru_cache(maxsize=None)
+def _default_operations() -> Dict[Tuple[str, str], Operation]:
+    return compile_operations(load_spec())
@@ -0,0 +1,197 @@
+import datetime
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Type
+
+import numpy as np
+from pydantic import BaseModel
+
+from src.models.decoding import type_adapter
+
+PET_STATUSES = ("available", "pending", "sold")
+ORDER_STATUSES = ("placed", "approved", "delivered")
+
+CATEGORIES = ("Dogs", "Cats", "Birds", "Fish", "Rabbits", "Reptiles", "Rodents", "Horses")
+TAGS = ("friendly", "vaccinated", "trained", "young", "senior", "playful", "calm", "hypoallergenic",
+        "neutered", "microchipped", "indoor", "outdoor")
+PET_NAMES = ("Buddy", "Luna", "Max", "Bella", "Charlie", "Lucy", "Rocky", "Daisy", "Milo", "Coco",
+             "Oscar", "Nala", "Simba", "Lola", "Toby", "Ruby", "Leo", "Molly", "Jack", "Zoe")
+FIRST_NAMES = ("Anna", "Ivan", "Maria", "Alexei", "Olga", "Dmitry", "Elena", "Sergey", "Natalia", "Pavel",
+               "Emma", "Liam", "Olivia", "Noah", "Sophia", "James", "Mia", "Lucas", "Ava", "Ethan")
+LAST_NAMES = ("Ivanov", "Petrova", "Smirnov", "Volkova", "Kuznetsov", "Sokolova", "Popov", "Lebedeva",
+              "Smith", "Johnson", "Brown", "Miller", "Davis", "Wilson", "Taylor", "Clark")
+
+# Сущности генерируются блоками фиксированного размера; генератор блока зависит только от
+# seed, вида сущности и номера блока, поэтому i-я сущность одна и та же при любом размере пачек
+BLOCK_SIZE = 4096
+_KINDS = {"pet": 1, "order": 2, "user": 3}
+_SHIP_DATE_START = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+_SHIP_DATE_SPAN = 365 * 24 * 3600
+
+Payload = Dict[str, Any]
+
+
+def _weights(distribution: Optional[Mapping[str, float]], values: Sequence[str]) -> Tuple[Tuple[str, ...], np.ndarray]:
+    if distribution is None:
+        distribution = {value: 1.0 for value in values}
+    names = tuple(distribution)
+    weights = np.array([distribution[name] for name in names], dtype=float)
+    if (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError("distribution weights must be non-negative with a positive sum")
+    return names, weights / weights.sum()
+
+
+class DataFactory:
+    """Воспроизводимый генератор тестовых данных Pet, Order и User.
+
+    Одинаковые ``seed`` и параметры дают одинаковые данные. ID сущностей идут
+    подряд от ``id_start`` (см. ``ids.id_start`` воркера), имена пользователей
+    ``{username_prefix}{номер}`` - поэтому уникальны без проверок. Доли статусов
+    задаются словарями весов. Генерация ленивая: ``pets()``/``orders()``/``users()``
+    отдают словари по одному, ``*_batches()`` - списками; случайные поля каждого
+    блока тянутся из numpy разом, так что миллионы сущностей идут потоком без
+    накопления в памяти.
+    """
+
+    def __init__(self, seed: int = 0, id_start: int = 1, username_prefix: str = "user",
+                 pet_statuses: Optional[Mapping[str, float]] = None,
+                 order_statuses: Optional[Mapping[str, float]] = None,
+                 pet_id_range: Optional[Tuple[int, int]] = None, max_tags: int = 3, max_photos: int = 2):
+        self.seed = seed
+        self.id_start = id_start
+        self.username_prefix = username_prefix
+        self.pet_statuses, self._pet_weights = _weights(pet_statuses, PET_STATUSES)
+        self.order_statuses, self._order_weights = _weights(order_statuses, ORDER_STATUSES)
+        # Заказы ссылаются на питомцев из этого диапазона [start, stop); по умолчанию - на первый миллион
+        self.pet_id_range = pet_id_range or (id_start, id_start + 1_000_000)
+        self.max_tags = max_tags
+        self.max_photos = max_photos
+
+    def categories(self) -> List[Payload]:
+        return [{"id": i, "name": name} for i, name in enumerate(CATEGORIES, 1)]
+
+    def tags(self) -> List[Payload]:
+        return [{"id": i, "name": name} for i, name in enumerate(TAGS, 1)]
+
+    # Поштучная генерация
+    def pets(self, count: Optional[int] = None, start: int = 0) -> Iterator[Payload]:
+        """Питомцы с номерами ``start, start + 1, ...``; ``count=None`` - бесконечно"""
+        return self._stream(self._pet_block, count, start)
+
+    def orders(self, count: Optional[int] = None, start: int = 0) -> Iterator[Payload]:
+        return self._stream(self._order_block, count, start)
+
+    def users(self, count: Optional[int] = None, start: int = 0) -> Iterator[Payload]:
+        return self._stream(self._user_block, count, start)
+
+    # Пачки
+    def pet_batches(self, count: int, batch_size: int = 1000, start: int = 0) -> Iterator[List[Payload]]:
+        return _batched(self.pets(count, start), batch_size)
+
+    def order_batches(self, count: int, batch_size: int = 1000, start: int = 0) -> Iterator[List[Payload]]:
+        return _batched(self.orders(count, start), batch_size)
+
+    def user_batches(self, count: int, batch_size: int = 1000, start: int = 0) -> Iterator[List[Payload]]:
+        return _batched(self.users(count, start), batch_size)
+
+    def _stream(self, make_block, count: Optional[int], start: int) -> Iterator[Payload]:
+        if start < 0 or count is not None and count < 0:
+            raise ValueError("start and count must not be negative")
+        block, offset = divmod(start, BLOCK_SIZE)
+        remaining = count
+        while remaining is None or remaining > 0:
+            items = make_block(block)
+            if offset or remaining is not None and remaining < len(items):
+                stop = None if remaining is None else offset + remaining
+                items = items[offset:stop]
+            yield from items
+            if remaining is not None:
+                remaining -= len(items)
+            block, offset = block + 1, 0
+
+    def _rng(self, kind: str, block: int) -> np.random.Generator:
+        return np.random.default_rng([self.seed, _KINDS[kind], block])
+
+    def _pet_block(self, block: int) -> List[Payload]:
+        rng = self._rng("pet", block)
+        first = self.id_start + block * BLOCK_SIZE
+        ids = range(first, first + BLOCK_SIZE)
+        names = rng.integers(len(PET_NAMES), size=BLOCK_SIZE).tolist()
+        categories = rng.integers(len(CATEGORIES), size=BLOCK_SIZE).tolist()
+        statuses = rng.choice(len(self.pet_statuses), size=BLOCK_SIZE, p=self._pet_weights).tolist()
+        photo_counts = rng.integers(self.max_photos + 1, size=BLOCK_SIZE).tolist()
+        tag_counts = rng.integers(self.max_tags + 1, size=BLOCK_SIZE).tolist()
+        # Теги без повторов внутри питомца: первые tag_count позиций случайной перестановки
+        tag_orders = rng.random((BLOCK_SIZE, len(TAGS))).argsort(axis=1)[:, :self.max_tags].tolist()
+        pets = []
+        for pet_id, name, category, status, photos, tag_count, tag_order in zip(
+                ids, names, categories, statuses, photo_counts, tag_counts, tag_orders):
+            pets.append({
+                "id": pet_id,
+                "category": {"id": category + 1, "name": CATEGORIES[category]},
+                "name": f"{PET_NAMES[name]}-{pet_id}",
+                "photoUrls": [f"https://example.com/pets/{pet_id}/{n}.jpg" for n in range(photos)],
+                "tags": [{"id": tag + 1, "name": TAGS[tag]} for tag in tag_order[:tag_count]],
+                "status": self.pet_statuses[status],
+            })
+        return pets
+
+    def _order_block(self, block: int) -> List[Payload]:
+        rng = self._rng("order", block)
+        first = self.id_start + block * BLOCK_SIZE
+        pet_ids = rng.integers(*self.pet_id_range, size=BLOCK_SIZE).tolist()
+        quantities = rng.integers(1, 6, size=BLOCK_SIZE).tolist()
+        seconds = rng.integers(_SHIP_DATE_SPAN, size=BLOCK_SIZE).tolist()
+        statuses = rng.choice(len(self.order_statuses), size=BLOCK_SIZE, p=self._order_weights).tolist()
+        orders = []
+        for order_id, pet_id, quantity, second, status in zip(
+                range(first, first + BLOCK_SIZE), pet_ids, quantities, seconds, statuses):
+            ship_date = _SHIP_DATE_START + datetime.timedelta(seconds=second)
+            status = self.order_statuses[status]
+            orders.append({
+                "id": order_id,
+                "petId": pet_id,
+                "quantity": quantity,
+                "shipDate": ship_date.strftime("%Y-%m-%dT%H:%M:%S.000+0000"),
+                "status": status,
+                "complete": status == "delivered",
+            })
+        return orders
+
+    def _user_block(self, block: int) -> List[Payload]:
+        rng = self._rng("user", block)
+        first = block * BLOCK_SIZE
+        first_names = rng.integers(len(FIRST_NAMES), size=BLOCK_SIZE).tolist()
+        last_names = rng.integers(len(LAST_NAMES), size=BLOCK_SIZE).tolist()
+        phones = rng.integers(10 ** 9, 10 ** 10, size=BLOCK_SIZE).tolist()
+        passwords = rng.integers(2 ** 63, size=BLOCK_SIZE).tolist()
+        statuses = (rng.random(BLOCK_SIZE) < 0.9).tolist()
+        users = []
+        for number, first_name, last_name, phone, password, active in zip(
+                range(first, first + BLOCK_SIZE), first_names, last_names, phones, passwords, statuses):
+            username = f"{self.username_prefix}{number}"
+            users.append({
+                "id": self.id_start + number,
+                "username": username,
+                "firstName": FIRST_NAMES[first_name],
+                "lastName": LAST_NAMES[last_name],
+                "email": f"{username}@example.com",
+                "password": f"{password:016x}",
+                "phone": f"+7{phone}",
+                "userStatus": 1 if active else 0,
+            })
+        return users
+
+
+def _batched(items: Iterator[Payload], size: int) -> Iterator[List[Payload]]:
+    if size <= 0:
+        raise ValueError("batch size must be positive")
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+def to_models(payloads: Sequence[Payload], model: Type[BaseModel]) -> List[BaseModel]:
+    """Пачка словарей -> список моделей (Pet, Order, User, Category, Tag) одной валидацией"""
+    return type_adapter(List[model]).validate_python(payloads)
@@ -0,0 +1,127 @@
+import math
+import threading
+from typing import Dict, Any, Iterable
+
+
+class LatencyHistogram:
+    """Гистограмма задержек в стиле HDR Histogram.
+
+    Значения хранятся в микросекундах в лог-линейных корзинах: до ``2 ** sub_bucket_bits``
+    микросекунд корзины точные, дальше каждая степень двойки делится на одинаковое число
+    корзин. Относительная ошибка не превышает ``10 ** -significant_digits``, а память
+    зависит только от диапазона значений, а не от количества измерений.
+    """
+
+    def __init__(self, significant_digits: int = 2):
+        if not 1 <= significant_digits <= 5:
+            raise ValueError("significant_digits must be between 1 and 5")
+        self.significant_digits = significant_digits
+        self._bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self._sub_buckets = 1 << self._bits
+        self._half = self._sub_buckets >> 1
+        self._counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, seconds: float, count: int = 1):
+        """Записать задержку в секундах"""
+        self.record_us(int(seconds * 1_000_000), count)
+
+    def record_us(self, value: int, count: int = 1):
+        if value < 0:
+            value = 0
+        index = self._index(value)
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + count
+            self.count += count
+            self.total += value * count
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def _index(self, value: int) -> int:
+        if value < self._sub_buckets:
+            return value
+        shift = value.bit_length() - self._bits
+        return self._sub_buckets + (shift - 1) * self._half + ((value >> shift) - self._half)
+
+    def _highest_equivalent(self, index: int) -> int:
+        if index < self._sub_buckets:
+            return index
+        level, offset = divmod(index - self._sub_buckets, self._half)
+        shift = level + 1
+        return ((offset + self._half + 1) << shift) - 1
+
+    def percentile(self, percent: float) -> int:
+        """Значение перцентиля в микросекундах"""
+        if not self.count:
+            return 0
+        with self._lock:
+            items = sorted(self._counts.items())
+        target = max(1, math.ceil(self.count * percent / 100.0))
+        seen = 0
+        for index, count in items:
+            seen += count
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def percentiles(self, percents: Iterable[float] = (50, 90, 99, 99.9)) -> Dict[float, int]:
+        return {p: self.percentile(p) for p in percents}
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other: "LatencyHistogram"):
+        if other.significant_digits != self.significant_digits:
+            raise ValueError("Cannot merge histograms with different precision")
+        with other._lock:
+            counts = dict(other._counts)
+        with self._lock:
+            for index, count in counts.items():
+                self._counts[index] = self._counts.get(index, 0) + count
+            self.count += other.count
+            self.total += other.total
+            if other.min is not None and (self.min is None or other.min < self.min):
+                self.min = other.min
+            if other.max is not None and (self.max is None or other.max > self.max):
+                self.max = other.max
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+            self.count = 0
+            self.total = 0
+            self.min = None
+            self.max = None
+
+    def count_at_most(self, value: int) -> int:
+        """Число значений не больше ``value`` микросекунд.
+
+        Считается по корзинам, нижняя граница которых не больше ``value``: ни одно
+        значение ``<= value`` не теряется, лишними могут оказаться только значения из
+        корзины самого ``value`` (в пределах точности гистограммы).
+        """
+        last = self._index(value)
+        with self._lock:
+            return sum(count for index, count in self._counts.items() if index <= last)
+
+    def buckets(self) -> Dict[int, int]:
+        """Накопленные количества по верхним границам корзин (в микросекундах)"""
+        with self._lock:
+            items = sorted(self._counts.items())
+        return {self._highest_equivalent(index): count for index, count in items}
+
+    def to_dict(self, percents: Iterable[float] = (50, 90, 99, 99.9)) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "min_us": self.min or 0,
+            "mean_us": round(self.mean, 1),
+            "max_us": self.max or 0,
+            "percentiles_us": {str(p): v for p, v in self.percentiles(percents).items()},
+        }
@@ -0,0 +1,127 @@
+import json
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+from src.utils.histogram import LatencyHistogram
+
+# Границы корзин для экспорта в Prometheus, секунды
+PROMETHEUS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class EndpointMetrics:
+    """Метрики одного маршрута: гистограмма задержек, статусы, байты"""
+
+    __slots__ = ("latency", "statuses", "request_bytes", "response_bytes")
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.statuses: Dict[str, int] = {}
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.latency.count,
+            "statuses": dict(self.statuses),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "latency": self.latency.to_dict(),
+        }
+
+
+class RequestMetrics:
+    """Метрики запросов PetStoreClient по маршрутам.
+
+    Ключ - метод и шаблон маршрута (``GET /pet/{petId}``), а не сырой URL,
+    поэтому число серий не растет с количеством разных ID. Экспорт - JSON
+    и текстовый формат Prometheus.
+    """
+
+    def __init__(self, prefix: str = "petstore_client"):
+        self.prefix = prefix
+        self._endpoints: Dict[Tuple[str, str], EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def series_count(self) -> int:
+        """Число серий (метод + маршрут)"""
+        return len(self._endpoints)
+
+    def _endpoint(self, method: str, route: str) -> EndpointMetrics:
+        key = (method, route)
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            with self._lock:
+                endpoint = self._endpoints.setdefault(key, EndpointMetrics())
+        return endpoint
+
+    def record(self, method: str, route: str, status: str, seconds: float,
+               request_bytes: int = 0, response_bytes: int = 0):
+        """Записать один запрос; ``status`` - код ответа или имя исключения"""
+        endpoint = self._endpoint(method, route)
+        endpoint.latency.record(seconds)
+        with self._lock:
+            endpoint.statuses[status] = endpoint.statuses.get(status, 0) + 1
+            endpoint.request_bytes += request_bytes
+            endpoint.response_bytes += response_bytes
+
+    def get(self, method: str, route: str) -> Optional[EndpointMetrics]:
+        return self._endpoints.get((method, route))
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            items = sorted(self._endpoints.items())
+        return {f"{method} {route}": endpoint.to_dict() for (method, route), endpoint in items}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        p = self.prefix
+        with self._lock:
+            items = sorted(self._endpoints.items())
+        lines = [
+            f"# HELP {p}_requests_total Requests by method, route and status.",
+            f"# TYPE {p}_requests_total counter",
+        ]
+        for (method, route), endpoint in items:
+            for status, count in sorted(endpoint.statuses.items()):
+                lines.append(f'{p}_requests_total{{{_labels(method, route)},status="{status}"}} {count}')
+
+        for name, attr, help_text in (
+            ("request_bytes_total", "request_bytes", "Request body bytes sent."),
+            ("response_bytes_total", "response_bytes", "Response body bytes received."),
+        ):
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} counter")
+            for (method, route), endpoint in items:
+                lines.append(f"{p}_{name}{{{_labels(method, route)}}} {getattr(endpoint, attr)}")
+
+        lines.append(f"# HELP {p}_request_duration_seconds Request latency.")
+        lines.append(f"# TYPE {p}_request_duration_seconds histogram")
+        for (method, route), endpoint in items:
+            labels = _labels(method, route)
+            histogram = endpoint.latency
+            for bound in PROMETHEUS_BUCKETS:
+                cumulative = histogram.count_at_most(int(bound * 1_000_000))
+                lines.append(f'{p}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{p}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{p}_request_duration_seconds_sum{{{labels}}} {histogram.total / 1_000_000}")
+            lines.append(f"{p}_request_duration_seconds_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+    def write_prometheus(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+
+
+def _labels(method: str, route: str) -> str:
+    route = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",route="{route}"'
@@ -0,0 +1,428 @@
+"""
+Мок PetStore API в памяти
+Используется мок-тестами и локальным HTTP-сервером
+"""
+import json
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+
+PET_STATUSES = ("available", "pending", "sold")
+
+_NO_ELAPSED = timedelta(0)
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError("mock store data is read-only; copy it (copy.deepcopy) before changing")
+
+
+class ReadOnlyDict(dict):
+    """dict, который нельзя изменить: хранилище отдает его в ответах без копирования"""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return _thaw(self)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class ReadOnlyList(list):
+    """list, который нельзя изменить"""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return _thaw(self)
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _freeze(value):
+    """Неизменяемая копия JSON-подобного значения - делается один раз при записи"""
+    if isinstance(value, dict):
+        return ReadOnlyDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return ReadOnlyList(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    """Изменяемая глубокая копия значения из хранилища"""
+    if isinstance(value, dict):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class MockResponse:
+    """Легкий ответ мок-API с интерфейсом requests.Response, который нужен тестам и ValidationSteps"""
+    
+    __slots__ = ("status_code", "_json_data", "_text", "_headers", "elapsed")
+    
+    def __init__(self, status_code, json_data):
+        self.status_code = status_code
+        self._json_data = json_data
+        self._text = None
+        self._headers = None
+        self.elapsed = _NO_ELAPSED
+    
+    def json(self):
+        return self._json_data
+    
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = json.dumps(self._json_data)
+        return self._text
+    
+    @property
+    def content(self):
+        return self.text.encode("utf-8")
+    
+    @property
+    def headers(self):
+        if self._headers is None:
+            self._headers = {"Content-Type": "application/json"}
+        return self._headers
+    
+    @property
+    def ok(self):
+        return self.status_code < 400
+    
+    def __repr__(self):
+        return f"<MockResponse [{self.status_code}]>"
+
+
+class MockPetStoreAPI:
+    """Мок-класс для имитации PetStore API
+
+    Кроме основных словарей хранит вторичные индексы: статус -> id питомцев и
+    petId -> id заказов. Инвентарь пересчитывается инкрементально при каждом
+    изменении питомца, поэтому выборки работают за O(размер результата).
+    Все изменения проходят через методы ``_put_*``/``_remove_*``: после ``checkpoint()``
+    они пишут журнал отмены, и ``rollback()`` возвращает состояние за O(числа изменений).
+    Данные копируются только при записи - в ``ReadOnlyDict``/``ReadOnlyList``; чтения
+    отдают сохраненные объекты без копий. Правка ``response.json()`` в тесте падает
+    с TypeError, а не меняет хранилище в обход журнала; для изменений нужна
+    ``copy.deepcopy``.
+    """
+    
+    def __init__(self):
+        self.pets = {}
+        self.users = {}
+        self.orders = {}
+        self.inventory = {status: 0 for status in PET_STATUSES}
+        self.next_id = 1
+        self._pets_by_status = {}
+        self._orders_by_pet = {}
+        self._journal = None
+        self._checkpoint_next_id = None
+    
+    @classmethod
+    def seeded(cls, pets=1000, users=1000, orders=1000, id_base=100000):
+        """Мок-API, заполненный тестовыми данными в отдельном диапазоне ID"""
+        api = cls()
+        api.load_pets(
+            {"id": id_base + i, "name": f"SeedPet{i}", "photoUrls": [],
+             "status": PET_STATUSES[i % len(PET_STATUSES)]}
+            for i in range(pets)
+        )
+        api.load_users(
+            {"id": id_base + i, "username": f"seeduser{i}", "firstName": "Seed",
+             "email": f"seeduser{i}@example.com", "userStatus": 1}
+            for i in range(users)
+        )
+        api.load_orders(
+            {"id": id_base + i, "petId": id_base + (i % pets if pets else i), "quantity": 1,
+             "status": "placed", "complete": False}
+            for i in range(orders)
+        )
+        return api
+    
+    # Снимки состояния
+    def checkpoint(self):
+        """Зафиксировать текущее состояние и начать журналировать изменения"""
+        self._journal = []
+        self._checkpoint_next_id = self.next_id
+    
+    def rollback(self):
+        """Вернуть состояние на момент checkpoint(); журнал продолжает писаться"""
+        if self._journal is None:
+            raise RuntimeError("rollback() called without checkpoint()")
+        journal, self._journal = self._journal, None
+        for kind, key, old in reversed(journal):
+            if kind == "pet":
+                store, put, remove = self.pets, self._put_pet, self._remove_pet
+            elif kind == "order":
+                store, put, remove = self.orders, self._put_order, self._remove_order
+            else:
+                store, put, remove = self.users, self._put_user, self._remove_user
+            if old is not None:
+                put(key, old)
+            elif key in store:
+                remove(key)
+        self.next_id = self._checkpoint_next_id
+        self._journal = []
+    
+    def release(self):
+        """Перестать журналировать изменения"""
+        self._journal = None
+        self._checkpoint_next_id = None
+    
+    @contextmanager
+    def fork(self):
+        """Дешевая копия состояния на время блока: все изменения откатываются на выходе"""
+        self.checkpoint()
+        try:
+            yield self
+        finally:
+            self.rollback()
+            self.release()
+    
+    @property
+    def pending_changes(self):
+        return len(self._journal) if self._journal else 0
+    
+    def _put_pet(self, pet_id, pet_data):
+        old = self.pets.get(pet_id)
+        if self._journal is not None:
+            self._journal.append(("pet", pet_id, old))
+        if old is not None:
+            self._unindex_pet(pet_id, old)
+        self.pets[pet_id] = pet_data
+        status = pet_data.get("status")
+        if status is not None:
+            self._pets_by_status.setdefault(status, {})[pet_id] = None
+            self.inventory[status] = self.inventory.get(status, 0) + 1
+    
+    def _remove_pet(self, pet_id):
+        if self._journal is not None:
+            self._journal.append(("pet", pet_id, self.pets[pet_id]))
+        self._unindex_pet(pet_id, self.pets.pop(pet_id))
+    
+    def _unindex_pet(self, pet_id, pet_data):
+        status = pet_data.get("status")
+        if status is not None:
+            ids = self._pets_by_status[status]
+            del ids[pet_id]
+            if not ids:
+                del self._pets_by_status[status]
+            self.inventory[status] -= 1
+            if not self.inventory[status] and status not in PET_STATUSES:
+                del self.inventory[status]
+    
+    def _put_order(self, order_id, order_data):
+        old = self.orders.get(order_id)
+        if self._journal is not None:
+            self._journal.append(("order", order_id, old))
+        if old is not None:
+            self._unindex_order(order_id, old)
+        self.orders[order_id] = order_data
+        pet_id = order_data.get("petId")
+        if pet_id is not None:
+            self._orders_by_pet.setdefault(pet_id, {})[order_id] = None
+    
+    def _remove_order(self, order_id):
+        if self._journal is not None:
+            self._journal.append(("order", order_id, self.orders[order_id]))
+        self._unindex_order(order_id, self.orders.pop(order_id))
+    
+    def _unindex_order(self, order_id, order_data):
+        pet_id = order_data.get("petId")
+        if pet_id is not None:
+            ids = self._orders_by_pet[pet_id]
+            del ids[order_id]
+            if not ids:
+                del self._orders_by_pet[pet_id]
+    
+    def _put_user(self, username, user_data):
+        if self._journal is not None:
+            self._journal.append(("user", username, self.users.get(username)))
+        self.users[username] = user_data
+    
+    def _remove_user(self, username):
+        if self._journal is not None:
+            self._journal.append(("user", username, self.users[username]))
+        del self.users[username]
+    
+    def load_pets(self, pets):
+        """Массовая загрузка питомцев без создания ответов (для масштабных тестов)"""
+        for pet_data in pets:
+            pet_id = pet_data.get("id", self.next_id)
+            self.next_id += 1
+            self._put_pet(pet_id, _freeze(pet_data))
+    
+    def load_orders(self, orders):
+        """Массовая загрузка заказов без создания ответов"""
+        for order_data in orders:
+            order_id = order_data.get("id", self.next_id)
+            self.next_id += 1
+            self._put_order(order_id, _freeze(order_data))
+    
+    def load_users(self, users):
+        """Массовая загрузка пользователей без создания ответов"""
+        for user_data in users:
+            username = user_data.get("username", f"user{self.next_id}")
+            self.next_id += 1
+            self._put_user(username, _freeze(user_data))
+    
+    def add_pet(self, pet_data):
+        """Добавление питомца"""
+        pet_id = pet_data.get("id", self.next_id)
+        self.next_id += 1
+        pet_data = _freeze(pet_data)
+        self._put_pet(pet_id, pet_data)
+        return self._create_response(200, pet_data)
+    
+    def get_pet_by_id(self, pet_id):
+        """Получение питомца по ID"""
+        if pet_id in self.pets:
+            return self._create_response(200, self.pets[pet_id])
+        else:
+            return self._create_response(404, {"code": 1, "type": "error", "message": "Pet not found"})
+    
+    def update_pet(self, pet_data):
+        """Обновление питомца"""
+        pet_id = pet_data["id"]
+        if pet_id in self.pets:
+            pet_data = _freeze(pet_data)
+            self._put_pet(pet_id, pet_data)
+            return self._create_response(200, pet_data)
+        else:
+            return self._create_response(404, {"code": 1, "type": "error", "message": "Pet not found"})
+    
+    def delete_pet(self, pet_id):
+        """Удаление питомца"""
+        if pet_id in self.pets:
+            self._remove_pet(pet_id)
+            return self._create_response(200, {"code": 200, "type": "unknown", "message": str(pet_id)})
+        else:
+            return self._create_response(404, {"code": 1, "type": "error", "message": "Pet not found"})
+    
+    def find_pets_by_status(self, status):
+        """Поиск питомцев по статусу"""
+        pets = self.pets
+        pets_with_status = [pets[pet_id] for pet_id in self._pets_by_status.get(status, ())]
+        return self._create_response(200, pets_with_status)
+    
+    def update_pet_with_form(self, pet_id, name=None, status=None):
+        """Обновление питомца через форму"""
+        if pet_id in self.pets:
+            pet_data = dict(self.pets[pet_id])
+            if name:
+                pet_data["name"] = name
+            if status:
+                pet_data["status"] = status
+            self._put_pet(pet_id, ReadOnlyDict(pet_data))
+            return self._create_response(200, {"code": 200, "message": "success"})
+        else:
+            return self._create_response(404, {"code": 1, "type": "error", "message": "Pet not found"})
+    
+    def get_inventory(self):
+        """Получение инвентаря"""
+        return self._create_response(200, dict(self.inventory))
+    
+    def place_order(self, order_data):
+        """Размещение заказа"""
+        order_id = order_data.get("id", self.next_id)
+        self.next_id += 1
+        order_data = _freeze(order_data)
+        self._put_order(order_id, order_data)
+        return self._create_response(200, order_data)
+    
+    def get_order_by_id(self, order_id):
+        """Получение заказа по ID"""
+        if order_id in self.orders:
+            return self._create_response(200, self.orders[order_id])
+        else:
+            return self._create_response(404, {"code": 1, "type": "error", "message": "Order not found"})
+    
+    def find_orders_by_pet_id(self, pet_id):
+        """Поиск заказов по ID питомца"""
+        orders = self.orders
+        return self._create_response(200, [orders[order_id] for order_id in self._orders_by_pet.get(pet_id, ())])
+    
+    def delete_order(self, order_id):
+        """Удаление заказа"""
+        if order_id in self.orders:
+            self._remove_order(order_id)
+            return self._create_response(200, {"code": 200, "type": "unknown", "message": str(order_id)})
+        else:
+            return self._create_response(404, {"code": 1, "type": "error", "message": "Order not found"})
+    
+    def create_user(self, user_data):
+        """Создание пользователя"""
+        username = user_data.get("username", f"user{self.next_id}")
+        self.next_id += 1
+        self._put_user(username, _freeze(user_data))
+        return self._create_response(200, {"code": 200, "type": "unknown", "message": str(user_data.get("id", ""))})
+    
+    def get_user_by_username(self, username):
+        """Получение пользователя"""
+        if username in self.users:
+            return self._create_response(200, self.users[username])
+        else:
+            return self._create_response(404, {"code": 1, "type": "error", "message": "User not found"})
+    
+    def update_user(self, username, user_data):
+        """Обновление пользователя"""
+        if username in self.users:
+            self._put_user(username, _freeze(user_data))
+            return self._create_response(200, {"code": 200, "type": "unknown", "message": str(user_data.get("id", ""))})
+        else:
+            return self._create_response(404, {"code": 1, "type": "error", "message": "User not found"})
+    
+    def delete_user(self, username):
+        """Удаление пользователя"""
+        if username in self.users:
+            self._remove_user(username)
+            return self._create_response(200, {"code": 200, "type": "unknown", "message": username})
+        else:
+            return self._create_response(404, {"code": 1, "type": "error", "message": "User not found"})
+    
+    def create_users_with_list(self, users_data):
+        """Создание пользователей из списка"""
+        for user in users_data:
+            username = user.get("username")
+            if username:
+                self._put_user(username, _freeze(user))
+        return self._create_response(200, {"code": 200, "type": "unknown", "message": "ok"})
+    
+    def create_users_with_array(self, users_data):
+        """Создание пользователей из массива"""
+        for user in users_data:
+            username = user.get("username")
+            if username:
+                self._put_user(username, _freeze(user))
+        return self._create_response(200, {"code": 200, "type": "unknown", "message": "ok"})
+    
+    def user_login(self, username, password):
+        """Логин пользователя"""
+        return self._create_response(200, {
+            "code": 200, 
+            "type": "unknown", 
+            "message": f"logged in session: {random.randint(1000000, 9999999)}"
+        })
+    
+    def user_logout(self):
+        """Логаут пользователя"""
+        return self._create_response(200, {"code": 200, "type": "unknown", "message": "ok"})
+    
+    def _create_response(self, status_code, json_data):
+        """Создание мок-ответа"""
+        return MockResponse(status_code, json_data)
@@ -0,0 +1,266 @@
+"""
+Локальный HTTP-сервер PetStore API поверх MockPetStoreAPI
+Реализует маршруты /v2 для pet, store и user, чтобы PetStoreClient можно было
+гонять по настоящему HTTP без доступа к сети
+"""
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Optional
+from urllib.parse import parse_qs
+
+from aiohttp import web
+
+from src.utils.compression import CorruptBodyError, decompress
+from src.utils.mock_api import MockPetStoreAPI
+
+
+def _error(status: int, message: str) -> web.Response:
+    return web.json_response({"code": status, "type": "unknown", "message": message}, status=status)
+
+
+def _to_http(response) -> web.Response:
+    return web.json_response(response.json(), status=response.status_code)
+
+
+def _int_param(request: web.Request, name: str) -> Optional[int]:
+    try:
+        return int(request.match_info[name])
+    except ValueError:
+        return None
+
+
+async def _body(request: web.Request) -> bytes:
+    """Тело запроса, распакованное по Content-Encoding (в том числе zstd)"""
+    try:
+        return decompress(await request.read(), request.headers.get("Content-Encoding", "").strip().lower())
+    except CorruptBodyError:
+        raise web.HTTPBadRequest(
+            text=json.dumps({"code": 400, "type": "unknown", "message": "bad input"}),
+            content_type="application/json",
+        )
+    except ValueError:
+        raise web.HTTPUnsupportedMediaType(
+            text=json.dumps({"code": 415, "type": "unknown", "message": "unsupported content encoding"}),
+            content_type="application/json",
+        )
+
+
+async def _json_body(request: web.Request):
+    body = await _body(request)
+    try:
+        return json.loads(body)
+    except ValueError:
+        raise web.HTTPBadRequest(
+            text=json.dumps({"code": 400, "type": "unknown", "message": "bad input"}),
+            content_type="application/json",
+        )
+
+
+@web.middleware
+async def _etag_middleware(request: web.Request, handler):
+    """ETag для успешных GET и ответ 304 на совпадающий If-None-Match"""
+    response = await handler(request)
+    if request.method == "GET" and response.status == 200 and isinstance(response.body, bytes):
+        etag = f'"{hashlib.sha1(response.body).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+    return response
+
+
+class MockPetStoreServer:
+    """HTTP-сервер на aiohttp с семантикой MockPetStoreAPI.
+
+    Сервер запускается в отдельном потоке со своим event loop и слушает
+    эфемерный порт, поэтому его можно поднимать прямо из pytest-фикстуры.
+    Сжатые тела запросов распаковываются; ответы не меньше ``compress_min_size``
+    байт сжимаются по Accept-Encoding клиента (``None`` - не сжимать).
+    """
+
+    def __init__(self, api: Optional[MockPetStoreAPI] = None, host: str = "127.0.0.1", port: int = 0,
+                 compress_min_size: Optional[int] = None):
+        self.api = api or MockPetStoreAPI()
+        self.host = host
+        self.port = port
+        self.compress_min_size = compress_min_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v2"
+
+    def reset(self, api: Optional[MockPetStoreAPI] = None):
+        """Заменить состояние сервера новым (по умолчанию пустым) мок-API"""
+        self.api = api or MockPetStoreAPI()
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._compression_middleware, _etag_middleware])
+        r = app.router
+        r.add_post("/v2/pet", self.add_pet)
+        r.add_put("/v2/pet", self.update_pet)
+        r.add_get("/v2/pet/findByStatus", self.find_pets_by_status)
+        r.add_get("/v2/pet/{petId}", self.get_pet)
+        r.add_post("/v2/pet/{petId}", self.update_pet_with_form)
+        r.add_delete("/v2/pet/{petId}", self.delete_pet)
+        r.add_get("/v2/store/inventory", self.get_inventory)
+        r.add_post("/v2/store/order", self.place_order)
+        r.add_get("/v2/store/order/{orderId}", self.get_order)
+        r.add_delete("/v2/store/order/{orderId}", self.delete_order)
+        r.add_post("/v2/user", self.create_user)
+        r.add_post("/v2/user/createWithList", self.create_users_with_list)
+        r.add_post("/v2/user/createWithArray", self.create_users_with_array)
+        r.add_get("/v2/user/login", self.user_login)
+        r.add_get("/v2/user/logout", self.user_logout)
+        r.add_get("/v2/user/{username}", self.get_user)
+        r.add_put("/v2/user/{username}", self.update_user)
+        r.add_delete("/v2/user/{username}", self.delete_user)
+        return app
+
+    @web.middleware
+    async def _compression_middleware(self, request: web.Request, handler):
+        response = await handler(request)
+        threshold = self.compress_min_size
+        if (threshold is not None and isinstance(response, web.Response)
+                and isinstance(response.body, bytes) and len(response.body) >= threshold):
+            response.enable_compression()
+        return response
+
+    # Pet
+    async def add_pet(self, request):
+        return _to_http(self.api.add_pet(await _json_body(request)))
+
+    async def update_pet(self, request):
+        pet_data = await _json_body(request)
+        if not isinstance(pet_data, dict) or "id" not in pet_data:
+            return _error(400, "Invalid ID supplied")
+        return _to_http(self.api.update_pet(pet_data))
+
+    async def find_pets_by_status(self, request):
+        pets = []
+        for value in request.query.getall("status", []):
+            for status in value.split(","):
+                pets.extend(self.api.find_pets_by_status(status).json())
+        return web.json_response(pets)
+
+    async def get_pet(self, request):
+        pet_id = _int_param(request, "petId")
+        if pet_id is None:
+            return _error(404, "Pet not found")
+        return _to_http(self.api.get_pet_by_id(pet_id))
+
+    async def update_pet_with_form(self, request):
+        pet_id = _int_param(request, "petId")
+        if pet_id is None:
+            return _error(404, "Pet not found")
+        # Клиент шлет форму с заголовком Content-Type сессии, поэтому тело разбирается вручную
+        form = parse_qs((await _body(request)).decode())
+        name = form.get("name", [None])[0]
+        status = form.get("status", [None])[0]
+        return _to_http(self.api.update_pet_with_form(pet_id, name=name, status=status))
+
+    async def delete_pet(self, request):
+        pet_id = _int_param(request, "petId")
+        if pet_id is None:
+            return _error(404, "Pet not found")
+        return _to_http(self.api.delete_pet(pet_id))
+
+    # Store
+    async def get_inventory(self, request):
+        return _to_http(self.api.get_inventory())
+
+    async def place_order(self, request):
+        return _to_http(self.api.place_order(await _json_body(request)))
+
+    async def get_order(self, request):
+        order_id = _int_param(request, "orderId")
+        if order_id is None:
+            return _error(404, "Order not found")
+        return _to_http(self.api.get_order_by_id(order_id))
+
+    async def delete_order(self, request):
+        order_id = _int_param(request, "orderId")
+        if order_id is None:
+            return _error(404, "Order not found")
+        return _to_http(self.api.delete_order(order_id))
+
+    # User
+    async def create_user(self, request):
+        return _to_http(self.api.create_user(await _json_body(request)))
+
+    async def create_users_with_list(self, request):
+        return _to_http(self.api.create_users_with_list(await _json_body(request)))
+
+    async def create_users_with_array(self, request):
+        return _to_http(self.api.create_users_with_array(await _json_body(request)))
+
+    async def user_login(self, request):
+        return _to_http(self.api.user_login(request.query.get("username"), request.query.get("password")))
+
+    async def user_logout(self, request):
+        return _to_http(self.api.user_logout())
+
+    async def get_user(self, request):
+        return _to_http(self.api.get_user_by_username(request.match_info["username"]))
+
+    async def update_user(self, request):
+        return _to_http(self.api.update_user(request.match_info["username"], await _json_body(request)))
+
+    async def delete_user(self, request):
+        return _to_http(self.api.delete_user(request.match_info["username"]))
+
+    # Жизненный цикл
+    async def _start(self):
+        # Тела запросов распаковывает _body, чтобы поддержать zstd независимо от сборки aiohttp
+        self._runner = web.AppRunner(self.build_app(), access_log=None, auto_decompress=False)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    def start(self) -> "MockPetStoreServer":
+        """Запустить сервер в фоновом потоке и дождаться готовности"""
+        if self._thread is not None:
+            return self
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+        errors = []
+
+        def serve():
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self._start())
+            except Exception as exc:
+                errors.append(exc)
+                started.set()
+                return
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=serve, name="mock-petstore-server", daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            self._thread = None
+            raise errors[0]
+        return self
+
+    def stop(self):
+        if self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._thread = None
+        self._loop = None
+        self._runner = None
+
+    def __enter__(self) -> "MockPetStoreServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,133 @@
+import socket
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from src.utils.histogram import LatencyHistogram
+
+
+class PoolConfig:
+    """Настройки пула соединений PetStoreClient.
+
+    ``pool_connections`` - сколько пулов (хостов) держать, ``pool_maxsize`` - сколько
+    соединений хранить в пуле одного хоста. При ``pool_block=True`` запрос ждет
+    свободное соединение (не дольше ``pool_timeout``), иначе открывается лишнее
+    соединение, которое потом закрывается. ``keep_alive=False`` закрывает соединение
+    после каждого ответа, ``tcp_keepalive`` включает SO_KEEPALIVE на сокетах.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False,
+                 pool_timeout: Optional[float] = None, keep_alive: bool = True, tcp_keepalive: bool = False,
+                 max_retries: int = 0):
+        if pool_maxsize <= 0 or pool_connections <= 0:
+            raise ValueError("Pool sizes must be positive")
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.pool_timeout = pool_timeout
+        self.keep_alive = keep_alive
+        self.tcp_keepalive = tcp_keepalive
+        self.max_retries = max_retries
+
+
+class PoolMetrics:
+    """Метрики пула: открытые и переиспользованные соединения, ожидание свободного соединения"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.wait_time = LatencyHistogram()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.opened = 0
+            self.reused = 0
+            self.discarded = 0
+            self.in_use = 0
+            self.wait_seconds = 0.0
+            self.max_wait_seconds = 0.0
+        self.wait_time.reset()
+
+    def checkout(self, reused: bool, waited: float):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            if reused:
+                self.reused += 1
+            else:
+                self.opened += 1
+            self.wait_seconds += waited
+            if waited > self.max_wait_seconds:
+                self.max_wait_seconds = waited
+        self.wait_time.record(waited)
+
+    def checkin(self, discarded: bool):
+        with self._lock:
+            self.in_use -= 1
+            if discarded:
+                self.discarded += 1
+
+    @property
+    def reuse_ratio(self) -> float:
+        return self.reused / self.checkouts if self.checkouts else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "opened": self.opened,
+            "reused": self.reused,
+            "discarded": self.discarded,
+            "in_use": self.in_use,
+            "reuse_ratio": round(self.reuse_ratio, 4),
+            "wait_seconds_total": round(self.wait_seconds, 6),
+            "wait_seconds_max": round(self.max_wait_seconds, 6),
+            "wait_us_p99": self.wait_time.percentile(99),
+        }
+
+
+class _InstrumentedPoolMixin:
+    metrics: PoolMetrics = None
+    pool_timeout: Optional[float] = None
+
+    def _get_conn(self, timeout=None):
+        started = time.perf_counter()
+        conn = super()._get_conn(self.pool_timeout if timeout is None else timeout)
+        # Соединение без сокета будет открыто заново при отправке запроса
+        self.metrics.checkout(getattr(conn, "sock", None) is not None, time.perf_counter() - started)
+        return conn
+
+    def _put_conn(self, conn):
+        pool = self.pool
+        discarded = pool is None or pool.full()
+        super()._put_conn(conn)
+        self.metrics.checkin(discarded)
+
+
+class InstrumentedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter с настройками из PoolConfig и метриками пула"""
+
+    def __init__(self, pool_config: Optional[PoolConfig] = None, metrics: Optional[PoolMetrics] = None):
+        self.pool_config = pool_config or PoolConfig()
+        self.metrics = metrics or PoolMetrics()
+        super().__init__(pool_connections=self.pool_config.pool_connections,
+                         pool_maxsize=self.pool_config.pool_maxsize,
+                         pool_block=self.pool_config.pool_block,
+                         max_retries=self.pool_config.max_retries)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_config = getattr(self, "pool_config", None) or PoolConfig()
+        if pool_config.tcp_keepalive:
+            pool_kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+            ]
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        attrs = {"metrics": getattr(self, "metrics", None) or PoolMetrics(), "pool_timeout": pool_config.pool_timeout}
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type("InstrumentedHTTPConnectionPool", (_InstrumentedPoolMixin, HTTPConnectionPool), attrs),
+            "https": type("InstrumentedHTTPSConnectionPool", (_InstrumentedPoolMixin, HTTPSConnectionPool), attrs),
+        }
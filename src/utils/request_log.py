@@ -0,0 +1,93 @@
+import logging
+import random
+import re
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Optional, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (время, метод, эндпоинт, статус, длительность в секундах, байт отправлено, байт получено)
+Record = Tuple[float, str, str, str, float, int, int]
+
+# Значения этих параметров строки запроса не попадают ни в буфер, ни в лог
+SECRET_PARAMS = ("password", "api_key", "token")
+_SECRET_QUERY = re.compile(r"([?&](?:%s)=)[^&#]*" % "|".join(SECRET_PARAMS), re.IGNORECASE)
+
+_active_logs: "weakref.WeakSet[RequestLog]" = weakref.WeakSet()
+_registry_lock = threading.Lock()
+
+
+class RequestLog:
+    """Кольцевой буфер последних запросов клиента и выборочное логирование.
+
+    Каждый запрос кладется в буфер готовым кортежем без форматирования строк.
+    В logger уходит только доля ``sample_rate`` записей, и только если уровень
+    ``level`` включен - форматирование ленивое, через аргументы logging.
+    Содержимое буфера выводится в отчет pytest, когда тест падает.
+    """
+
+    def __init__(self, capacity: int = 100, sample_rate: float = 1.0, level: int = logging.INFO,
+                 log: logging.Logger = logger, seed: Optional[int] = None):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.sample_rate = sample_rate
+        self.level = level
+        self.log = log
+        self._random = random.Random(seed)
+        self._records = deque(maxlen=capacity)
+        with _registry_lock:
+            _active_logs.add(self)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def record(self, method: str, url: str, status: str, elapsed: float,
+               request_bytes: int = 0, response_bytes: int = 0):
+        url = redact_url(url)
+        self._records.append((time.time(), method, url, status, elapsed, request_bytes, response_bytes))
+        if self.sample_rate and self.log.isEnabledFor(self.level) and (
+                self.sample_rate >= 1.0 or self._random.random() < self.sample_rate):
+            self.log.log(self.level, "%s %s -> %s in %.1f ms (sent %d B, received %d B)",
+                         method, url, status, elapsed * 1000, request_bytes, response_bytes)
+
+    def records(self) -> List[Record]:
+        return list(self._records)
+
+    def clear(self):
+        self._records.clear()
+
+    def dump(self) -> str:
+        lines = []
+        for ts, method, url, status, elapsed, sent, received in list(self._records):
+            stamp = time.strftime("%H:%M:%S", time.localtime(ts)) + f".{int(ts % 1 * 1000):03d}"
+            lines.append(f"{stamp} {method} {url} -> {status} {elapsed * 1000:.1f} ms "
+                         f"(sent {sent} B, received {received} B)")
+        return "\n".join(lines)
+
+
+def redact_url(url: str) -> str:
+    """Заменить значения секретных параметров строки запроса на ``***``"""
+    if isinstance(url, str) and "?" in url:
+        return _SECRET_QUERY.sub(r"\1***", url)
+    return url
+
+
+def clear_all():
+    """Очистить буферы всех живых клиентов (перед очередным тестом)"""
+    with _registry_lock:
+        logs = list(_active_logs)
+    for request_log in logs:
+        request_log.clear()
+
+
+def dump_all() -> str:
+    """Содержимое буферов всех живых клиентов"""
+    with _registry_lock:
+        logs = list(_active_logs)
+    return "\n".join(text for text in (request_log.dump() for request_log in logs) if text)
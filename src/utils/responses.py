@@ -0,0 +1,43 @@
+from typing import Any, Optional
+
+import requests
+
+from src.models.decoding import decode
+from src.models.models import ApiResponse
+
+_UNSET = object()
+
+
+class PetStoreResponse(requests.Response):
+    """requests.Response с типизированным результатом.
+
+    ``parsed`` разбирает тело в модель метода клиента (``Pet``, ``List[Pet]``, ``Order``...),
+    для ответов с ошибкой - в ``ApiResponse``. Результат вычисляется один раз.
+    """
+
+    _model: Any = None
+    _validate: bool = True
+
+    @classmethod
+    def from_response(cls, response: requests.Response, model: Any = None, validate: bool = True) -> "PetStoreResponse":
+        typed = cls.__new__(cls)
+        typed.__dict__.update(response.__dict__)
+        typed._model = model
+        typed._validate = validate
+        typed._parsed = _UNSET
+        return typed
+
+    @property
+    def parsed(self) -> Any:
+        if self._parsed is _UNSET:
+            self._parsed = self.parse(self._validate)
+        return self._parsed
+
+    def parse(self, validate: bool = True) -> Optional[Any]:
+        """Разобрать тело; ``validate=False`` собирает модели без валидации"""
+        if not self.content:
+            return None
+        model = self._model if self.ok else ApiResponse
+        if model is None:
+            return self.json()
+        return decode(self.content, model, validate)
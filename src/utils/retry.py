@@ -0,0 +1,201 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, Dict, Any, Callable, Iterable, Union, Tuple
+
+import requests
+
+from src.utils.histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class PolicyStats:
+    """Счетчики срабатываний политики запросов"""
+
+    FIELDS = ("requests", "attempts", "retries", "retries_exhausted", "timeouts", "hedges", "hedge_wins")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class RequestPolicy:
+    """Таймауты, повторы и хеджирование запросов PetStoreClient.
+
+    - Таймаут ищется по ``"METHOD /route"``, затем по ``"/route"`` в ``timeouts``,
+      иначе берется ``timeout``. Маршрут - шаблон вида ``/pet/{petId}``.
+    - Повторы делаются только для идемпотентных методов: при ошибке соединения,
+      таймауте или статусе из ``retry_statuses``. Пауза - экспоненциальная
+      с полным джиттером, ``Retry-After`` сервера учитывается.
+    - Хеджирование GET: если ответа нет дольше p95 (``hedge_percentile``)
+      по маршруту, отправляется второй такой же запрос, берется первый ответ.
+      До набора ``hedge_min_samples`` измерений используется ``hedge_delay``.
+    """
+
+    def __init__(self, timeout: Optional[Timeout] = 10.0, timeouts: Optional[Dict[str, Timeout]] = None,
+                 max_retries: int = 2, backoff_base: float = 0.1, backoff_max: float = 2.0,
+                 retry_statuses: Iterable[int] = (502, 503, 504),
+                 retry_methods: Iterable[str] = IDEMPOTENT_METHODS,
+                 hedge: bool = False, hedge_percentile: float = 95.0, hedge_min_samples: int = 20,
+                 hedge_delay: Optional[float] = None, hedge_min_delay: float = 0.005,
+                 hedge_methods: Iterable[str] = ("GET",), max_workers: int = 32,
+                 seed: Optional[int] = None, sleep: Callable[[float], None] = time.sleep):
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_methods = frozenset(m.upper() for m in retry_methods)
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_delay = hedge_delay
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_methods = frozenset(m.upper() for m in hedge_methods)
+        self.max_workers = max_workers
+        self.random = random.Random(seed)
+        self.sleep = sleep
+        self.stats = PolicyStats()
+        self._latencies: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def timeout_for(self, method: str, route: str) -> Optional[Timeout]:
+        key = f"{method} {route}"
+        if key in self.timeouts:
+            return self.timeouts[key]
+        return self.timeouts.get(route, self.timeout)
+
+    def backoff(self, attempt: int) -> float:
+        """Пауза перед повтором номер ``attempt`` (с 1): full jitter"""
+        cap = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return self.random.uniform(0, cap)
+
+    def observe(self, route: str, seconds: float):
+        histogram = self._latencies.get(route)
+        if histogram is None:
+            with self._lock:
+                histogram = self._latencies.setdefault(route, LatencyHistogram())
+        histogram.record(seconds)
+
+    def hedge_delay_for(self, route: str) -> Optional[float]:
+        histogram = self._latencies.get(route)
+        if histogram is not None and histogram.count >= self.hedge_min_samples:
+            return max(self.hedge_min_delay, histogram.percentile(self.hedge_percentile) / 1_000_000)
+        return self.hedge_delay
+
+    def execute(self, send: Callable[..., requests.Response], method: str, route: str, **kwargs) -> requests.Response:
+        """Выполнить запрос ``send(**kwargs)`` по политике"""
+        method = method.upper()
+        kwargs.setdefault("timeout", self.timeout_for(method, route))
+        retryable = method in self.retry_methods
+        hedgeable = self.hedge and method in self.hedge_methods
+        self.stats.increment("requests")
+        attempt = 0
+        while True:
+            try:
+                if hedgeable:
+                    response = self._hedged(send, route, kwargs)
+                else:
+                    response = self._timed(send, route, kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if isinstance(exc, requests.Timeout):
+                    self.stats.increment("timeouts")
+                if not retryable or attempt >= self.max_retries:
+                    if retryable and self.max_retries:
+                        self.stats.increment("retries_exhausted")
+                    raise
+                attempt += 1
+                delay = self.backoff(attempt)
+                logger.debug("Retrying %s %s after %r (attempt %d, %.3fs)", method, route, exc, attempt, delay)
+            else:
+                if response.status_code not in self.retry_statuses or not retryable:
+                    return response
+                if attempt >= self.max_retries:
+                    self.stats.increment("retries_exhausted")
+                    return response
+                attempt += 1
+                delay = max(self.backoff(attempt), self._retry_after(response))
+                response.close()
+                logger.debug("Retrying %s %s after status %d (attempt %d, %.3fs)",
+                             method, route, response.status_code, attempt, delay)
+            self.stats.increment("retries")
+            self.sleep(delay)
+
+    def _timed(self, send, route: str, kwargs: Dict[str, Any]) -> requests.Response:
+        self.stats.increment("attempts")
+        started = time.perf_counter()
+        response = send(**kwargs)
+        self.observe(route, time.perf_counter() - started)
+        return response
+
+    def _hedged(self, send, route: str, kwargs: Dict[str, Any]) -> requests.Response:
+        delay = self.hedge_delay_for(route)
+        if delay is None:
+            return self._timed(send, route, kwargs)
+
+        executor = self._get_executor()
+        primary = executor.submit(self._timed, send, route, kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        self.stats.increment("hedges")
+        hedge = executor.submit(self._timed, send, route, kwargs)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self.stats.increment("hedge_wins")
+                    # Ответ проигравшего никто не прочитает: закрыть его, чтобы соединение
+                    # (особенно при stream=True) вернулось в пул
+                    loser = hedge if future is primary else primary
+                    loser.add_done_callback(_close_response)
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> float:
+        value = response.headers.get("Retry-After")
+        try:
+            return float(value) if value is not None else 0.0
+        except ValueError:
+            return 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix="petstore-hedge")
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def _close_response(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
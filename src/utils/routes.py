@@ -0,0 +1,49 @@
+from functools import lru_cache
+from typing import Tuple
+
+# Шаблоны маршрутов PetStore API в нотации Swagger
+ROUTE_TEMPLATES = (
+    "/pet",
+    "/pet/findByStatus",
+    "/pet/{petId}",
+    "/pet/{petId}/uploadImage",
+    "/store/inventory",
+    "/store/order",
+    "/store/order/{orderId}",
+    "/user",
+    "/user/createWithList",
+    "/user/createWithArray",
+    "/user/login",
+    "/user/logout",
+    "/user/{username}",
+)
+
+# Метка для путей вне ROUTE_TEMPLATES: сырой путь дал бы по серии метрик на каждый URL
+OTHER_ROUTE = "other"
+
+
+def _split(template: str) -> Tuple[str, ...]:
+    return tuple(template.strip("/").split("/"))
+
+
+# Сначала шаблоны с большим числом литеральных сегментов: /pet/findByStatus раньше /pet/{petId}
+_COMPILED = sorted(
+    (_split(t) for t in ROUTE_TEMPLATES),
+    key=lambda parts: -sum(not p.startswith("{") for p in parts),
+)
+
+
+@lru_cache(maxsize=4096)
+def route_template(endpoint: str) -> str:
+    """Шаблон маршрута для эндпоинта: ``/pet/42?x=1`` -> ``/pet/{petId}``.
+
+    Неизвестные пути схлопываются в ``OTHER_ROUTE``.
+    """
+    path = endpoint.split("?", 1)[0]
+    parts = _split(path)
+    for template in _COMPILED:
+        if len(template) != len(parts):
+            continue
+        if all(t.startswith("{") or t == p for t, p in zip(template, parts)):
+            return "/" + "/".join(template)
+    return OTHER_ROUTE
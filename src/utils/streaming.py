@@ -0,0 +1,117 @@
+import codecs
+import json
+from typing import Any, Callable, Iterable, Iterator, List
+
+from src.models.decoding import construct, type_adapter
+
+_WHITESPACE = " \t\r\n"
+# Буфер сдвигается, когда разобранная часть становится больше этого порога
+_COMPACT_AT = 64 * 1024
+
+
+class JsonArrayParser:
+    """Инкрементальный разбор JSON-массива верхнего уровня.
+
+    Байты подаются кусками через ``feed``, готовые элементы массива возвращаются
+    сразу, как только элемент целиком пришел. В памяти держится только
+    неразобранный хвост, а не весь ответ.
+    """
+
+    # Состояния: ждем "[", ждем первый элемент или "]", ждем элемент, ждем "," или "]", массив закрыт
+    _START, _FIRST, _VALUE, _SEPARATOR, _DONE = range(5)
+
+    def __init__(self, encoding: str = "utf-8"):
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = self._START
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        self._buffer += self._decoder.decode(chunk)
+        return self._drain(final=False)
+
+    def close(self) -> List[Any]:
+        """Дочитать остаток; ошибка, если массив не закрыт"""
+        self._buffer += self._decoder.decode(b"", final=True)
+        items = self._drain(final=True)
+        if self._state != self._DONE:
+            raise ValueError("Unexpected end of JSON array")
+        return items
+
+    def _drain(self, final: bool) -> List[Any]:
+        items = []
+        buffer = self._buffer
+        while self._state != self._DONE:
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos >= len(buffer):
+                break
+            char = buffer[pos]
+
+            if self._state == self._START:
+                if char != "[":
+                    raise ValueError(f"Expected JSON array, got {char!r}")
+                self._state = self._FIRST
+                self._pos += 1
+            elif char == "]" and self._state in (self._FIRST, self._SEPARATOR):
+                self._state = self._DONE
+                self._pos += 1
+            elif self._state == self._SEPARATOR:
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' at position {pos}, got {char!r}")
+                self._state = self._VALUE
+                self._pos += 1
+            else:
+                try:
+                    item, end = self._json.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break
+                # Число или литерал на границе куска может продолжиться в следующем
+                if end >= len(buffer) and not final:
+                    break
+                items.append(item)
+                self._pos = end
+                self._state = self._SEPARATOR
+
+        if self._pos > _COMPACT_AT:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        return items
+
+
+def iter_json_array(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[Any]:
+    """Элементы JSON-массива из потока байтов по одному"""
+    parser = JsonArrayParser(encoding)
+    for chunk in chunks:
+        if chunk:
+            yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def item_builder(model: Any = None, validate: bool = True) -> Callable[[Any], Any]:
+    """Функция, превращающая разобранный элемент в модель (или оставляющая dict)"""
+    if model is None:
+        return lambda item: item
+    if validate:
+        return type_adapter(model).validate_python
+    return lambda item: construct(model, item)
+
+
+def iter_response_items(response, model: Any = None, validate: bool = True,
+                        chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Элементы JSON-массива из ответа ``stream=True``.
+
+    Ответ закрывается и соединение возвращается в пул, когда итерация
+    закончена или прервана (``break``, исключение, сборка генератора).
+    """
+    build = item_builder(model, validate)
+    try:
+        for item in iter_json_array(response.iter_content(chunk_size), response.encoding or "utf-8"):
+            yield build(item)
+    finally:
+        response.close()